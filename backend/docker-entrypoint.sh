@@ -3,6 +3,8 @@ set -e
 
 # Migrações
 python manage.py migrate --noinput
+# Tabela do cache compartilhado (só tem efeito com POKEMON_CACHE_BACKEND=db)
+python manage.py createcachetable
 
 # Cria admin automático (opcional)
 if [ -n "$ADMIN_LOGIN" ] && [ -n "$ADMIN_EMAIL" ] && [ -n "$ADMIN_PASSWORD" ]; then
@@ -14,4 +16,9 @@ python manage.py collectstatic --noinput || true
 
 # Inicia o Gunicorn na porta informada (Render define $PORT)
 PORT="${PORT:-8000}"
+if [ "$SERVER_MODE" = "asgi" ]; then
+	# Workers Uvicorn + views assíncronas: cada worker mantém várias chamadas à PokéAPI em voo
+	export POKEMON_ASYNC_VIEWS="${POKEMON_ASYNC_VIEWS:-1}"
+	exec gunicorn pokeback.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:${PORT} --workers 3 --timeout 60
+fi
 exec gunicorn pokeback.wsgi:application --bind 0.0.0.0:${PORT} --workers 3 --timeout 60
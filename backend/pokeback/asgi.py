@@ -2,5 +2,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pokeback.settings')
+# estáticos servidos pelo wrapper assíncrono abaixo; as settings tiram o WhiteNoiseMiddleware da cadeia
+os.environ.setdefault('POKEMON_ASGI_STATIC', '1')
 
 application = get_asgi_application()
+
+if os.environ['POKEMON_ASGI_STATIC'] == '1':
+    from .asgi_static import ASGIStaticFiles
+
+    application = ASGIStaticFiles(application)
@@ -0,0 +1,52 @@
+"""Arquivos estáticos no modo ASGI, servidos antes do Django.
+
+O ``WhiteNoiseMiddleware`` só é síncrono: dentro da cadeia ASGI ele faz toda requisição passar por
+``sync_to_async``/``async_to_sync``, prendendo uma thread por requisição em voo. Aqui o mesmo índice
+do WhiteNoise (STATIC_ROOT e WHITENOISE_ROOT, com as variantes comprimidas, ETag e cache) responde
+direto no protocolo ASGI; o resto segue para a aplicação Django, já sem o middleware.
+"""
+import asyncio
+
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+_CHUNK = 64 * 1024
+
+
+class ASGIStaticFiles:
+    def __init__(self, app):
+        self.app = app
+        # só o índice de arquivos e os cabeçalhos; o middleware em si não entra na cadeia
+        self.whitenoise = WhiteNoiseMiddleware()
+
+    def _find(self, path: str):
+        if self.whitenoise.autorefresh:
+            return self.whitenoise.find_file(path)
+        return self.whitenoise.files.get(path)
+
+    async def __call__(self, scope, receive, send):
+        static_file = self._find(scope["path"]) if scope["type"] == "http" else None
+        if static_file is None:
+            return await self.app(scope, receive, send)
+
+        meta = {
+            "HTTP_" + name.decode("latin-1").upper().replace("-", "_"): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        response = static_file.get_response(scope["method"], meta)
+        await send({
+            "type": "http.response.start",
+            "status": int(response.status),
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in response.headers],
+        })
+        if response.file is None:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        try:
+            while True:
+                chunk = await asyncio.to_thread(response.file.read, _CHUNK)
+                more = len(chunk) == _CHUNK
+                await send({"type": "http.response.body", "body": chunk, "more_body": more})
+                if not more:
+                    break
+        finally:
+            response.file.close()
@@ -27,6 +27,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # primeiro da lista: mede a requisição inteira (histograma por rota + Server-Timing)
+    'pokemon.metrics.MetricsMiddleware',
+    # grava o tráfego para replay; só é carregado com TRAFFIC_RECORD_PATH
+    'pokemon.traffic.TrafficRecorderMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -66,6 +70,28 @@ DATABASES = {
     }
 }
 
+# Cache compartilhado (camada 2 dos caches dos serviços). POKEMON_CACHE_BACKEND:
+# locmem (padrão, por processo), file, db (tabela criada com `createcachetable`) ou redis
+# (requer o pacote `redis`; POKEMON_CACHE_LOCATION=redis://host:6379/0)
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'pokeback'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'pokemon_cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/0'),
+}
+_cache_backend, _cache_location = _CACHE_BACKENDS.get(
+    os.getenv('POKEMON_CACHE_BACKEND', 'locmem'), _CACHE_BACKENDS['locmem']
+)
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': os.getenv('POKEMON_CACHE_LOCATION', _cache_location),
+    }
+}
+if not _cache_backend.endswith('RedisCache'):
+    # o Redis cuida da própria política de memória; os demais podam por número de entradas
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('POKEMON_CACHE_MAX_ENTRIES', '10000'))}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -132,3 +158,113 @@ CORS_ALLOW_ALL_ORIGINS = True
 DEFAULT_POKEMON_LIMIT = int(os.getenv('DEFAULT_POKEMON_LIMIT', '20'))
 MAX_POKEMON_LIMIT = int(os.getenv('MAX_POKEMON_LIMIT', '100'))
 POKEAPI_BASE = os.getenv('POKEAPI_BASE', 'https://pokeapi.co/api/v2')
+
+# Pool de conexões HTTP compartilhado (PokéAPI e tradutores)
+POKEAPI_HTTP_POOL_CONNECTIONS = int(os.getenv('POKEAPI_HTTP_POOL_CONNECTIONS', '10'))
+POKEAPI_HTTP_POOL_MAXSIZE = int(os.getenv('POKEAPI_HTTP_POOL_MAXSIZE', '20'))
+
+# Busca concorrente dos itens de uma página (limite de threads e prazo total por requisição)
+POKEAPI_FETCH_CONCURRENCY = int(os.getenv('POKEAPI_FETCH_CONCURRENCY', '8'))
+POKEAPI_FETCH_DEADLINE_SECONDS = float(os.getenv('POKEAPI_FETCH_DEADLINE_SECONDS', '25'))
+
+# Cache do detalhe completo (/pokemon/<id>/full/); expirado é servido enquanto é reconstruído
+POKEMON_FULL_CACHE_TTL_SECONDS = int(os.getenv('POKEMON_FULL_CACHE_TTL_SECONDS', '86400'))
+# ... e montado com textos sem tradução (tradutor fora/sem cota): expira bem antes
+POKEMON_FULL_UNTRANSLATED_TTL_SECONDS = int(os.getenv('POKEMON_FULL_UNTRANSLATED_TTL_SECONDS', '600'))
+
+# Traduções: LRU por processo + tabela TraducaoCache. Com TRANSLATE_ON_REQUEST=0 as requisições
+# nunca esperam o tradutor remoto (use o comando pretranslate_catalog para preencher a tabela)
+TRANSLATE_LRU_SIZE = int(os.getenv('TRANSLATE_LRU_SIZE', '2048'))
+TRANSLATE_ON_REQUEST = os.getenv('TRANSLATE_ON_REQUEST', '1') == '1'
+TRANSLATE_CONCURRENCY = int(os.getenv('TRANSLATE_CONCURRENCY', '4'))
+
+# Caminho assíncrono (ASGI): views async para listagem/detalhe e limite de conexões do cliente httpx
+POKEMON_ASYNC_VIEWS = os.getenv('POKEMON_ASYNC_VIEWS', '0') == '1'
+# Sob ASGI (pokeback/asgi.py) os estáticos saem de um wrapper assíncrono (asgi_static.py) antes do
+# Django: o WhiteNoiseMiddleware é só síncrono e faria cada requisição trocar de thread
+POKEMON_ASGI_STATIC = os.getenv('POKEMON_ASGI_STATIC', '0') == '1'
+if POKEMON_ASGI_STATIC:
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+POKEAPI_ASYNC_MAX_CONNECTIONS = int(os.getenv('POKEAPI_ASYNC_MAX_CONNECTIONS', '200'))
+
+# Single-flight: buscas idênticas simultâneas são coalescidas no processo; com DISTRIBUTED=1 também
+# entre workers, via lock no cache do Django (exige backend de cache compartilhado). LOCK_SECONDS deve
+# passar do tempo de uma busca (timeout upstream + novas tentativas): depois dele outro worker assume
+POKEMON_SINGLEFLIGHT_DISTRIBUTED = os.getenv('POKEMON_SINGLEFLIGHT_DISTRIBUTED', '0') == '1'
+POKEMON_SINGLEFLIGHT_LOCK_SECONDS = float(os.getenv('POKEMON_SINGLEFLIGHT_LOCK_SECONDS', '30'))
+
+# Camadas dos caches dos serviços: memória do processo (LRU) → CACHES['default'] → tabelas
+POKEMON_TIER_MEMORY_SIZE = int(os.getenv('POKEMON_TIER_MEMORY_SIZE', '1024'))
+POKEMON_TIER_MEMORY_TTL_SECONDS = float(os.getenv('POKEMON_TIER_MEMORY_TTL_SECONDS', '60'))
+POKEMON_TIER_SHARED_TTL_SECONDS = float(os.getenv('POKEMON_TIER_SHARED_TTL_SECONDS', '300'))
+POKEMON_SHARED_CACHE = os.getenv('POKEMON_SHARED_CACHE', '1') == '1'
+
+# Cache-Control das rotas públicas de Pokémon (ETag/Last-Modified e 304 são sempre enviados)
+POKEMON_CACHE_CONTROL = {
+    'list': os.getenv('POKEMON_CACHE_CONTROL_LIST', 'public, max-age=300, stale-while-revalidate=3600'),
+    'detail': os.getenv('POKEMON_CACHE_CONTROL_DETAIL', 'public, max-age=3600, stale-while-revalidate=86400'),
+    'full': os.getenv('POKEMON_CACHE_CONTROL_FULL', 'public, max-age=3600, stale-while-revalidate=86400'),
+}
+
+# Índices em memória do catálogo (busca por nome, colunas de stats): intervalo para conferir se o catálogo mudou
+POKEMON_CATALOG_INDEX_REFRESH_SECONDS = float(os.getenv('POKEMON_CATALOG_INDEX_REFRESH_SECONDS', '300'))
+
+# Guarda por host upstream (resilience.py): token bucket, disjuntor e timeout adaptativo.
+# POKEMON_UPSTREAM_HOST_RATES sobrescreve a taxa (req/s) por host: "host=taxa,host=taxa"
+POKEMON_UPSTREAM_GUARD = os.getenv('POKEMON_UPSTREAM_GUARD', '1') == '1'
+POKEMON_UPSTREAM_RATE = float(os.getenv('POKEMON_UPSTREAM_RATE', '20'))
+POKEMON_UPSTREAM_BURST_SECONDS = float(os.getenv('POKEMON_UPSTREAM_BURST_SECONDS', '2'))
+POKEMON_UPSTREAM_HOST_RATES = {
+    host.strip(): float(rate)
+    for host, _, rate in (
+        item.partition('=')
+        for item in os.getenv('POKEMON_UPSTREAM_HOST_RATES', 'api.mymemory.translated.net=5,libretranslate.de=2').split(',')
+        if '=' in item
+    )
+}
+POKEMON_UPSTREAM_MAX_WAIT_SECONDS = float(os.getenv('POKEMON_UPSTREAM_MAX_WAIT_SECONDS', '2'))
+POKEMON_UPSTREAM_TIMEOUT_MIN_SECONDS = float(os.getenv('POKEMON_UPSTREAM_TIMEOUT_MIN_SECONDS', '2'))
+POKEMON_BREAKER_WINDOW = int(os.getenv('POKEMON_BREAKER_WINDOW', '20'))
+POKEMON_BREAKER_MIN_CALLS = int(os.getenv('POKEMON_BREAKER_MIN_CALLS', '10'))
+POKEMON_BREAKER_ERROR_RATE = float(os.getenv('POKEMON_BREAKER_ERROR_RATE', '0.5'))
+POKEMON_BREAKER_COOLDOWN_SECONDS = float(os.getenv('POKEMON_BREAKER_COOLDOWN_SECONDS', '30'))
+
+# Stale-if-error: com a PokéAPI fora (ou o disjuntor aberto) serve o cache expirado, marcado com
+# "stale": true e os cabeçalhos Warning/X-Data-Stale; páginas da listagem sem catálogo ficam guardadas
+POKEMON_STALE_IF_ERROR = os.getenv('POKEMON_STALE_IF_ERROR', '1') == '1'
+POKEMON_STALE_LIST_SECONDS = int(os.getenv('POKEMON_STALE_LIST_SECONDS', str(7 * 86400)))
+POKEMON_CACHE_CONTROL['stale'] = os.getenv('POKEMON_CACHE_CONTROL_STALE', 'no-cache')
+
+# Métricas (GET /metrics, formato Prometheus) e cabeçalho Server-Timing. Com METRICS_TOKEN a rota
+# exige "Authorization: Bearer <token>"; sem ele fica fechada (401/403), exceto em DEBUG ou para
+# staff logado no admin
+POKEMON_SERVER_TIMING = os.getenv('POKEMON_SERVER_TIMING', '1') == '1'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Cache em disco das respostas cruas da PokéAPI (raw_cache.py): gzip por URL, TTL por endpoint
+# (POKEAPI_RAW_CACHE_TTLS sobrescreve os defaults do módulo) e limite de tamanho com despejo LRU
+POKEAPI_RAW_CACHE = os.getenv('POKEAPI_RAW_CACHE', '1') == '1'
+POKEAPI_RAW_CACHE_DIR = os.getenv('POKEAPI_RAW_CACHE_DIR', str(BASE_DIR / '.cache' / 'pokeapi'))
+POKEAPI_RAW_CACHE_MAX_MB = float(os.getenv('POKEAPI_RAW_CACHE_MAX_MB', '512'))
+POKEAPI_RAW_CACHE_TTL_SECONDS = float(os.getenv('POKEAPI_RAW_CACHE_TTL_SECONDS', '86400'))
+POKEAPI_RAW_CACHE_TTLS = {}
+
+# Fonte dos documentos da PokéAPI (datasource.py): "http" (padrão) ou "local", que lê o dump
+# importado com "manage.py import_pokeapi_dataset" e não usa rede
+POKEMON_DATA_SOURCE = os.getenv('POKEMON_DATA_SOURCE', 'http')
+POKEMON_DATA_SOURCE_MEMORY_SIZE = int(os.getenv('POKEMON_DATA_SOURCE_MEMORY_SIZE', '4096'))
+
+# Gravação de tráfego (traffic.py) para "manage.py replay_traffic": desligada sem TRAFFIC_RECORD_PATH.
+# TRAFFIC_RECORD_PREFIXES limita os caminhos gravados (ex.: "/pokemon/,/api/pokemon/")
+TRAFFIC_RECORD_PATH = os.getenv('TRAFFIC_RECORD_PATH', '')
+TRAFFIC_RECORD_SAMPLE = float(os.getenv('TRAFFIC_RECORD_SAMPLE', '1'))
+TRAFFIC_RECORD_PREFIXES = tuple(p for p in os.getenv('TRAFFIC_RECORD_PREFIXES', '').split(',') if p)
+
+# Fila de jobs no banco (jobs.py, executada por "manage.py run_worker"). Com POKEMON_JOBS=1 traduções
+# pendentes e o refresh do detalhe completo viram jobs em vez de rodar na requisição/em threads.
+POKEMON_JOBS = os.getenv('POKEMON_JOBS', '0') == '1'
+POKEMON_JOBS_MAX_ATTEMPTS = int(os.getenv('POKEMON_JOBS_MAX_ATTEMPTS', '5'))
+POKEMON_JOBS_LEASE_SECONDS = int(os.getenv('POKEMON_JOBS_LEASE_SECONDS', '600'))
+POKEMON_JOBS_BACKOFF_SECONDS = float(os.getenv('POKEMON_JOBS_BACKOFF_SECONDS', '10'))
+POKEMON_JOBS_BACKOFF_MAX_SECONDS = float(os.getenv('POKEMON_JOBS_BACKOFF_MAX_SECONDS', '900'))
+POKEMON_JOBS_KEEP_SECONDS = int(os.getenv('POKEMON_JOBS_KEEP_SECONDS', str(7 * 86400)))
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.http import JsonResponse, HttpResponse
 from django.conf import settings
+import hmac
 import os
 from django.urls import path, include
 from rest_framework.decorators import api_view, permission_classes
@@ -15,11 +16,17 @@ from pokemon.views import (
     list_pokemon,
     get_pokemon,
     get_pokemon_completo,
+    list_pokemon_async,
+    get_pokemon_async,
+    get_pokemon_completo_async,
+    pokemon_stats,
+    search_pokemon,
     favorites_view,
     favorites_detail_view,
     team_view,
     team_detail_view,
 )
+from pokemon.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
 
 
 User = get_user_model()
@@ -28,6 +35,19 @@ User = get_user_model()
 def health_view(request):
     return JsonResponse({"status": "ok"})
 
+
+def metrics_view(request):
+    # formato texto do Prometheus; fechado por padrão, como /pokemon/stats/: com METRICS_TOKEN exige
+    # "Authorization: Bearer <token>", sem ele só responde em DEBUG ou a staff logado (sessão do admin)
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse(status=401)
+    elif not (settings.DEBUG or request.user.is_staff):
+        return HttpResponse(status=403 if request.user.is_authenticated else 401)
+    return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+
 def spa_index_view(request):
     # Serve o index.html gerado pelo Angular
     index_path = os.path.join(settings.BASE_DIR, 'public', 'index.html')
@@ -230,6 +250,13 @@ def confirm_password_reset(request):
     return Response({"detail": "Senha redefinida com sucesso"})
 
 
+# Sob ASGI (SERVER_MODE=asgi) as rotas públicas de Pokémon usam as views assíncronas
+if getattr(settings, 'POKEMON_ASYNC_VIEWS', False):
+    _list_view, _detail_view, _full_view = list_pokemon_async, get_pokemon_async, get_pokemon_completo_async
+else:
+    _list_view, _detail_view, _full_view = list_pokemon, get_pokemon, get_pokemon_completo
+
+
 api_urlpatterns = [
     path('health/', health_view, name='health'),
     # auth
@@ -242,9 +269,11 @@ api_urlpatterns = [
 
     # pokemon (dev helper + listagem)
     path('pokemon/sync-types/', sync_tipos, name='pokemon_sync_types'),
-    path('pokemon/', list_pokemon, name='pokemon_list'),
-    path('pokemon/<int:codigo>/', get_pokemon, name='pokemon_detail'),
-    path('pokemon/<int:codigo>/full/', get_pokemon_completo, name='pokemon_detail_full'),
+    path('pokemon/', _list_view, name='pokemon_list'),
+    path('pokemon/<int:codigo>/', _detail_view, name='pokemon_detail'),
+    path('pokemon/<int:codigo>/full/', _full_view, name='pokemon_detail_full'),
+    path('pokemon/search/', search_pokemon, name='pokemon_search'),
+    path('pokemon/stats/', pokemon_stats, name='pokemon_stats'),
 
     # favoritos
     path('pokemon/favorites/', favorites_view, name='pokemon_favorites'),
@@ -265,6 +294,7 @@ api_urlpatterns = [
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     # sem prefixo (retrocompatibilidade)
     path('', include(api_urlpatterns)),
     # com prefixo /api
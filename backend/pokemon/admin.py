@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TipoPokemon, PokemonUsuario, PokemonCache
+from .models import TipoPokemon, EfetividadeTipo, PokemonUsuario, PokemonCache, PokemonCatalogo, PokemonDetalheCache, TraducaoCache, CadeiaEvolutiva, RecursoPokeAPI, Tarefa
 
 
 @admin.register(TipoPokemon)
@@ -8,6 +8,12 @@ class TipoPokemonAdmin(admin.ModelAdmin):
     search_fields = ("descricao",)
 
 
+@admin.register(EfetividadeTipo)
+class EfetividadeTipoAdmin(admin.ModelAdmin):
+    list_display = ("atacante", "defensor", "multiplicador")
+    list_filter = ("atacante", "defensor")
+
+
 @admin.register(PokemonUsuario)
 class PokemonUsuarioAdmin(admin.ModelAdmin):
     list_display = ("idPokemonUsuario", "usuario", "codigo", "nome", "idTipoPokemon", "favorito", "grupoBatalha")
@@ -17,5 +23,46 @@ class PokemonUsuarioAdmin(admin.ModelAdmin):
 
 @admin.register(PokemonCache)
 class PokemonCacheAdmin(admin.ModelAdmin):
-    list_display = ("codigo", "nome", "tipos", "imagemUrl", "dtAtualizado")
+    list_display = ("codigo", "nome", "tipos", "imagemUrl", "versao", "dtAtualizado")
     search_fields = ("nome", "codigo")
+
+
+@admin.register(PokemonCatalogo)
+class PokemonCatalogoAdmin(admin.ModelAdmin):
+    list_display = ("codigo", "nome", "nomeLocalizado", "geracao", "tipos", "dtAtualizado")
+    list_filter = ("geracao",)
+    search_fields = ("nome", "nomeLocalizado", "codigo")
+
+
+@admin.register(PokemonDetalheCache)
+class PokemonDetalheCacheAdmin(admin.ModelAdmin):
+    list_display = ("codigo", "idioma", "dtAtualizado")
+    list_filter = ("idioma",)
+    search_fields = ("codigo",)
+
+
+@admin.register(TraducaoCache)
+class TraducaoCacheAdmin(admin.ModelAdmin):
+    list_display = ("origem", "destino", "textoOriginal", "textoTraduzido", "dtAtualizado")
+    list_filter = ("origem", "destino")
+    search_fields = ("textoOriginal", "textoTraduzido")
+
+
+@admin.register(CadeiaEvolutiva)
+class CadeiaEvolutivaAdmin(admin.ModelAdmin):
+    list_display = ("idCadeia", "dtAtualizado")
+    search_fields = ("idCadeia",)
+
+
+@admin.register(RecursoPokeAPI)
+class RecursoPokeAPIAdmin(admin.ModelAdmin):
+    list_display = ("caminho", "recurso", "nome", "dtAtualizado")
+    list_filter = ("recurso",)
+    search_fields = ("caminho", "nome")
+
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = ("idTarefa", "tipo", "status", "prioridade", "tentativas", "dtDisponivel", "trabalhador", "dtAtualizado")
+    list_filter = ("status", "tipo")
+    search_fields = ("chave", "erro")
@@ -0,0 +1,455 @@
+"""Versão assíncrona (ASGI) da camada de serviços, espelhando services.py.
+
+As chamadas à PokéAPI e aos tradutores usam um ``httpx.AsyncClient`` compartilhado por event
+loop, então um único worker mantém centenas de requisições em voo. Acesso ao banco (caches,
+catálogo) continua síncrono via ``sync_to_async``; a montagem dos dados reaproveita as funções
+puras de services.py, de modo que as respostas são idênticas às das views síncronas.
+"""
+import asyncio
+import contextlib
+import time
+import weakref
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import services, translation
+from .catalog_index import catalog_complete
+from .datasource import data_source
+from .fanout import default_concurrency, default_deadline
+from .jobs import jobs_enabled
+from .metrics import record_upstream
+from .raw_cache import cacheable
+from .resilience import guard_for, is_failure_status
+from .singleflight import group
+from .type_chart import load_type_chart
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# um cliente por (event loop, verify): clientes httpx não podem ser usados entre loops
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+# mesmos grupos de coalescência do caminho síncrono (as métricas ficam juntas)
+_UPSTREAM_FLIGHT = group("upstream")
+_DETAIL_FLIGHT = group("detail")
+_FULL_FLIGHT = group("full")
+_LIST_FLIGHT = group("list")
+
+
+class GuardedTransport(httpx.AsyncBaseTransport):
+    """Transporte httpx que passa cada envio pela guarda do host (ver resilience.py) e
+    registra a chamada nas métricas (ver metrics.py)."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # cache em disco das respostas cruas (ver raw_cache.py); E/S de arquivo fora do event loop
+        url = str(request.url)
+        cache = cacheable(request.method, url)
+        entry = await asyncio.to_thread(cache.lookup, url) if cache is not None else None
+        if entry is not None and entry.fresh:
+            return httpx.Response(entry.status, headers=entry.headers, content=entry.body, request=request)
+        if entry is not None:
+            request.headers.update(entry.validators())
+        resp = await self._send_upstream(request, url)
+        if cache is not None:
+            if resp.status_code == 304 and entry is not None:
+                entry = await asyncio.to_thread(cache.revalidated, url, entry)
+                return httpx.Response(entry.status, headers=entry.headers, content=entry.body, request=request)
+            if resp.status_code == 200:
+                await asyncio.to_thread(cache.store, url, resp.status_code, resp.headers, resp.content)
+        return resp
+
+    async def _send_upstream(self, request: httpx.Request, url: str) -> httpx.Response:
+        guard = guard_for(url)
+        if guard is not None:
+            await guard.abefore()
+            timeouts = dict(request.extensions.get("timeout") or {})
+            if timeouts.get("read") is not None:
+                timeouts["read"] = guard.timeout_for(timeouts["read"])
+                request.extensions["timeout"] = timeouts
+        started = time.monotonic()
+        try:
+            resp = await self._inner.handle_async_request(request)
+            body = await resp.aread()  # duração com o download, como no cliente síncrono
+        except Exception as exc:
+            elapsed = time.monotonic() - started
+            if guard is not None:
+                guard.after(elapsed, ok=False, timed_out=isinstance(exc, httpx.TimeoutException))
+            record_upstream(url, "error", elapsed)
+            raise
+        elapsed = time.monotonic() - started
+        if guard is not None:
+            guard.after(elapsed, ok=not is_failure_status(resp.status_code))
+        record_upstream(url, resp.status_code, elapsed, len(body))
+        return resp
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _client(verify: bool) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    per_loop = _CLIENTS.setdefault(loop, {})
+    client = per_loop.get(verify)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=getattr(settings, "POKEAPI_ASYNC_MAX_CONNECTIONS", 200),
+            max_keepalive_connections=getattr(settings, "POKEAPI_HTTP_POOL_MAXSIZE", 20),
+        )
+        client = httpx.AsyncClient(
+            verify=verify,
+            timeout=20.0,
+            transport=GuardedTransport(httpx.AsyncHTTPTransport(retries=3, verify=verify, limits=limits)),
+        )
+        per_loop[verify] = client
+    return client
+
+
+async def _aget_json(url: str, verify: bool, timeout: float = 20.0) -> Dict:
+    """Documento da PokéAPI pela fonte configurada (POKEMON_DATA_SOURCE, ver datasource.py)."""
+    return await data_source().aget_json(url, verify, timeout)
+
+
+async def _http_aget_json(url: str, verify: bool, timeout: float = 20.0) -> Dict:
+    """GET com as mesmas regras de retry do cliente síncrono (429/5xx com backoff).
+    GETs simultâneos da mesma URL no mesmo event loop viram uma só chamada."""
+    async def _fetch() -> Dict:
+        client = _client(verify)
+        for attempt in range(4):
+            resp = await client.get(url, timeout=timeout)
+            if resp.status_code in _RETRY_STATUS and attempt < 3:
+                await asyncio.sleep(0.5 * (2 ** attempt))
+                continue
+            resp.raise_for_status()
+            return resp.json()
+        return {}
+    return await _UPSTREAM_FLIGHT.ado((url, verify), _fetch)
+
+
+async def gather_bounded(
+    fn: Callable[[T], Awaitable[R]],
+    items: Sequence[T],
+    fallback: Callable[[T], R],
+    limit: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> List[R]:
+    """Equivalente assíncrono de ``fan_out``: concorrência limitada, prazo total, ordem preservada."""
+    if not items:
+        return []
+    sem = asyncio.Semaphore(limit or default_concurrency())
+
+    async def run(it):
+        async with sem:
+            try:
+                return await fn(it)
+            except Exception:
+                return fallback(it)
+
+    tasks = [asyncio.ensure_future(run(it)) for it in items]
+    done, pending = await asyncio.wait(tasks, timeout=default_deadline() if deadline is None else deadline)
+    for t in pending:
+        t.cancel()
+    return [t.result() if t in done else fallback(it) for t, it in zip(tasks, items)]
+
+
+# -------- Traduções --------
+
+async def _aremote_translate(text: str, src: str) -> Optional[str]:
+    client = _client(True)
+    try:
+        r = await client.get(translation.MYMEMORY_URL, params=translation.mymemory_params(text, src), timeout=10)
+        r.raise_for_status()
+        out = translation.mymemory_text(r.json())
+        if out:
+            return out
+    except Exception:
+        pass
+    # Fallback: LibreTranslate (instância pública)
+    try:
+        r = await client.post(translation.LIBRETRANSLATE_URL, json=translation.libretranslate_payload(text, src), timeout=10)
+        r.raise_for_status()
+        return translation.libretranslate_text(r.json())
+    except Exception:
+        return None
+
+
+async def atranslate_many(items: Sequence[Tuple[str, Optional[str]]], followup: Optional[Dict] = None) -> List[str]:
+    if not translation._enabled():
+        return [text for text, _src in items]
+    keys, texts, found, pending = await sync_to_async(translation.prepare_batch)(items)
+    if pending and translation._remote_allowed():
+        outs = await gather_bounded(
+            lambda k: _aremote_translate(texts[k], k[1]),
+            pending,
+            fallback=lambda _k: None,
+            limit=getattr(settings, "TRANSLATE_CONCURRENCY", 4),
+        )
+        translated = {key: out for key, out in zip(pending, outs) if out}
+        await sync_to_async(translation.remember_translations)(texts, translated)
+        found.update(translated)
+    elif pending and jobs_enabled():
+        await sync_to_async(translation.defer_translations)(texts, pending, followup)
+    translation.report_untranslated(pending, found)
+    return translation.resolve_batch(items, keys, found)
+
+
+# -------- Detalhe --------
+
+async def _aspecies_name(codigo: int, verify: bool, fallback: Optional[str]) -> str:
+    try:
+        sp = await _aget_json(f"{services.POKEAPI_BASE}/pokemon-species/{codigo}", verify)
+        return services._localized_name_from_species(sp, fallback)
+    except Exception:
+        return fallback or ""
+
+
+async def _afetch_detail_remote(codigo: int, verify: bool) -> Dict:
+    raw = await _aget_json(f"{services.POKEAPI_BASE}/pokemon/{codigo}", verify)
+    norm = services.normalize_pokemon_detail(raw)
+    loc_name = await _aspecies_name(codigo, verify, norm.get("nome"))
+    if loc_name:
+        norm["nome"] = loc_name
+    return norm
+
+
+async def aget_pokemon_detail(codigo: int, verify_override: Optional[bool] = None) -> Dict:
+    cached = await sync_to_async(services._cached_detail)(codigo)
+    if cached is not None:
+        return cached
+    verify = services._verify_flag(verify_override)
+
+    async def _load() -> Dict:
+        norm = await _afetch_detail_remote(codigo, verify)
+        await sync_to_async(services._store_detail)(norm)
+        return norm
+    try:
+        return await _DETAIL_FLIGHT.ado(codigo, _load)
+    except Exception:
+        stale = (await sync_to_async(services._stale_details)([codigo])).get(codigo)
+        if stale is None:
+            raise
+        return stale
+
+
+# -------- Listagem --------
+
+async def _apage_item(entry: Tuple[int, str], verify: bool) -> Dict:
+    codigo, fallback_name = entry
+    raw, nome = await asyncio.gather(
+        _aget_json(f"{services.POKEAPI_BASE}/pokemon/{codigo}", verify),
+        _aspecies_name(codigo, verify, fallback_name),
+        return_exceptions=True,
+    )
+    nome = fallback_name if isinstance(nome, BaseException) else nome
+    if isinstance(raw, BaseException):
+        return {"codigo": codigo, "nome": nome, "tipos": [], "imagemUrl": services.image_url_for(codigo)}
+    norm = services.normalize_pokemon_detail(raw)
+    return {
+        "codigo": codigo,
+        "nome": nome,
+        "tipos": norm.get("tipos", []),
+        "imagemUrl": norm.get("imagemUrl") or services.image_url_for(codigo),
+        "stats": norm.get("stats", {}),
+    }
+
+
+def _ids_from_results(results: List[Dict]) -> List[Tuple[int, str]]:
+    out: List[Tuple[int, str]] = []
+    for item in results:
+        codigo = services._species_id_from_url(item.get("url"))
+        if codigo:
+            out.append((codigo, item.get("name") or ""))
+    return out
+
+
+async def alist_by_generation_and_name(
+    generation: Optional[int],
+    name: Optional[str],
+    limit: int,
+    offset: int,
+    verify_override: Optional[bool] = None,
+    filters: Optional[Dict] = None,
+) -> Tuple[int, List[Dict]]:
+    """Mesma semântica de ``services.list_by_generation_and_name``."""
+    if await sync_to_async(catalog_complete)():
+        return await sync_to_async(services._list_from_catalog)(generation, name, limit, offset, filters)
+    if services.has_advanced_filters(filters):
+        raise services.CatalogUnavailable("filtros por tipo/stats exigem o catálogo local completo (rode sync_pokemon_catalog)")
+
+    verify = services._verify_flag(verify_override)
+    key = (generation, (name or "").lower(), limit, offset)
+    try:
+        page = await _LIST_FLIGHT.ado(key + (verify,), lambda: _alist_from_pokeapi(generation, name, limit, offset, verify))
+    except Exception:
+        stale = await sync_to_async(services._stale_list)(key, generation, name, limit, offset)
+        if stale is None:
+            raise
+        return stale
+    return await sync_to_async(services._remember_list_page)(key, page)
+
+
+async def _alist_from_pokeapi(
+    generation: Optional[int], name: Optional[str], limit: int, offset: int, verify: bool
+) -> Tuple[int, List[Dict]]:
+    base = services.POKEAPI_BASE
+    if not generation and not name:
+        data = await _aget_json(f"{base}/pokemon?limit={limit}&offset={offset}", verify)
+        page_slice = _ids_from_results(data.get("results", []))
+        total = None
+    else:
+        if generation:
+            data = await _aget_json(f"{base}/generation/{generation}", verify)
+            base_list = _ids_from_results(data.get("pokemon_species", []))
+        else:
+            data = await _aget_json(f"{base}/pokemon?limit=1000&offset=0", verify)
+            base_list = _ids_from_results(data.get("results", []))
+        if name:
+            low = name.lower()
+            base_list = [(c, n) for (c, n) in base_list if low in n.lower()]
+        base_list.sort(key=lambda x: x[0])
+        total = len(base_list)
+        page_slice = base_list[offset: offset + limit]
+
+    page_items = await gather_bounded(
+        lambda entry: _apage_item(entry, verify), page_slice, fallback=services._fallback_page_item
+    )
+    if total is None:
+        page_items.sort(key=lambda x: x.get("codigo") or 0)
+        total = int(data.get("count", len(page_items)))
+    return total, page_items
+
+
+# -------- Detalhe completo --------
+
+async def aget_evolution_chain(evo_url: str, verify: bool) -> Dict[str, List[Dict]]:
+    chain_id = services._species_id_from_url(evo_url)
+    if chain_id is None:
+        raise ValueError(f"URL de cadeia evolutiva inválida: {evo_url}")
+    cached = await sync_to_async(services._cached_chain)(chain_id)
+    if cached is not None:
+        return cached
+
+    try:
+        data = await _aget_json(evo_url, verify)
+    except Exception:
+        stale = await sync_to_async(services._stale_chain)(chain_id)
+        if stale is None:
+            raise
+        return stale
+    nodes = services._chain_nodes(data.get("chain", {}))
+    names = {sid: name for sid, name, _prev, _cond in nodes}
+    info = await sync_to_async(services._catalog_node_info)(list(names))
+
+    async def _node(sid: int) -> Tuple[str, List[str]]:
+        raw, local_name = await asyncio.gather(
+            _aget_json(f"{services.POKEAPI_BASE}/pokemon/{sid}", verify, timeout=10),
+            _aspecies_name(sid, verify, names[sid]),
+            return_exceptions=True,
+        )
+        local_name = names[sid] if isinstance(local_name, BaseException) else local_name
+        child_types = [] if isinstance(raw, BaseException) else [
+            t.get("type", {}).get("name") for t in (raw.get("types", []) or [])
+        ]
+        return local_name, child_types
+
+    missing = [sid for sid in names if sid not in info]
+    fetched = await gather_bounded(_node, missing, fallback=lambda sid: (names[sid], []))
+    info.update(zip(missing, fetched))
+    payload = services._assemble_evolution(nodes, info)
+    await sync_to_async(services._store_chain)(chain_id, payload)
+    return payload
+
+
+async def _atype_multipliers(types: List[str], verify: bool) -> Dict[str, Dict[str, float]]:
+    chart = await sync_to_async(load_type_chart)()
+    if chart is not None:
+        return chart.multipliers(types)
+
+    async def _relations(t: str) -> Dict:
+        return (await _aget_json(f"{services.POKEAPI_BASE}/type/{t}", verify)).get("damage_relations", {})
+
+    relations = await gather_bounded(_relations, types, fallback=lambda _t: None)
+    return services._fold_type_relations([r for r in relations if r is not None])
+
+
+async def _abuild_pokemon_full(codigo: int, verify: bool) -> Dict:
+    base = services.POKEAPI_BASE
+    raw, species = await asyncio.gather(
+        _aget_json(f"{base}/pokemon/{codigo}", verify),
+        _aget_json(f"{base}/pokemon-species/{codigo}", verify),
+    )
+    ab_names = [n for n in (ab.get("ability", {}).get("name") for ab in raw.get("abilities", [])) if n]
+    types = [t["type"]["name"] for t in raw.get("types", [])]
+    evo_url = species.get("evolution_chain", {}).get("url")
+
+    async def _evolution() -> Dict[str, List[Dict]]:
+        if not evo_url:
+            return {}
+        try:
+            return await aget_evolution_chain(evo_url, verify)
+        except Exception:
+            return {}
+
+    docs, mult, evo = await asyncio.gather(
+        gather_bounded(lambda n: _aget_json(f"{base}/ability/{n}", verify), ab_names, fallback=lambda _n: None),
+        _atype_multipliers(types, verify),
+        _evolution(),
+    )
+    abilities = services._full_abilities(raw, dict(zip(ab_names, docs)))
+    translated = await atranslate_many(
+        services._full_translation_items(species, abilities),
+        followup=services._full_refresh_job(codigo, services._full_cache_lang()),
+    )
+    return services._assemble_full(raw, species, abilities, translated, mult, evo)
+
+
+@contextlib.asynccontextmanager
+async def _key_locked(key: Tuple):
+    """``services._key_lock`` sem prender o event loop: tenta sem bloquear, em passos curtos."""
+    lock = services._key_lock(key)
+    delay = 0.01
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.2)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+async def aget_pokemon_full(codigo: int, verify_override: Optional[bool] = None) -> Dict:
+    """Mesma política de cache de ``services.get_pokemon_full`` (TTL + stale-while-revalidate)."""
+    verify = services._verify_flag(verify_override)
+    lang = services._full_cache_lang()
+
+    hit = await sync_to_async(services._full_cache_lookup)(codigo, lang)
+    if hit:
+        payload, expired = hit
+        if expired:
+            await sync_to_async(services._schedule_full_refresh)(codigo, lang, verify)
+        return payload
+
+    async def _load() -> Dict:
+        # não reconstrói junto com um refresh em segundo plano (síncrono) da mesma chave
+        async with _key_locked(("full", codigo, lang)):
+            hit = await sync_to_async(services._full_cache_lookup)(codigo, lang)
+            if hit:
+                return hit[0]
+            with translation.untranslated_scope() as untranslated:
+                result = await _abuild_pokemon_full(codigo, verify)
+            await sync_to_async(services._store_full)(codigo, lang, result, untranslated[0])
+            return result
+    try:
+        return await _FULL_FLIGHT.ado((codigo, lang), _load)
+    except Exception:
+        degraded = await sync_to_async(services._degraded_full)(codigo)
+        if degraded is None:
+            raise
+        return degraded
@@ -0,0 +1,368 @@
+"""Benchmark das rotas públicas contra uma PokéAPI local com latência injetada.
+
+``FakePokeAPI`` é um ThreadingHTTPServer que serve documentos no formato da PokéAPI (fixtures
+sintéticas ou o dump do api-data, ver datasource.py), com latência, jitter e taxa de erro (503)
+configuráveis, e conta as chamadas por modelo de endpoint. ``run_benchmark`` aponta os serviços
+para ele e mede, por cenário (``list``, ``detail``, ``full``) e fase:
+
+- ``cold``: caches e tabelas de cache vazios, cada caminho pedido uma vez;
+- ``warm``: os mesmos caminhos de novo (``warm_rounds`` vezes).
+
+As requisições passam pelo Django inteiro (``django.test.Client``: middlewares, views, serviços,
+cliente HTTP compartilhado), sem servidor web na frente. O resultado é uma lista de dicts
+serializável em JSON; ``compare`` confronta dois resultados (ex.: commits diferentes).
+"""
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import django
+from django.conf import settings
+from django.test import Client, override_settings
+
+from . import services
+from .cache import clear_tiered_caches
+from .catalog_index import invalidate_catalog_indexes
+from .datasource import import_documents, paginate, reset_data_source, resource_path
+from .metrics import endpoint_template
+from .models import CadeiaEvolutiva, PokemonCache, PokemonDetalheCache, TraducaoCache
+from .raw_cache import raw_cache, reset_raw_cache
+from .resilience import reset_upstream_guards
+from .type_chart import ALL_TYPES, invalidate_type_chart
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCENARIOS = ("list", "detail", "full")
+
+
+# -------- Fixtures --------
+
+def synthetic_fixtures(count: int = 151) -> Dict[str, Dict]:
+    """Documentos mínimos (só os campos que os serviços leem) para ``count`` espécies, em famílias
+    de três, com URLs relativas como as do dump."""
+    docs: Dict[str, Dict] = {}
+    abilities = [f"ability-{i}" for i in range(1, 21)]
+    for i, name in enumerate(abilities, start=1):
+        docs[f"ability/{i}"] = {
+            "id": i, "name": name,
+            "effect_entries": [{"language": {"name": "en"}, "short_effect": f"Effect of {name}."}],
+            "names": [{"language": {"name": "en"}, "name": name.title()}],
+        }
+    for i, t in enumerate(ALL_TYPES, start=1):
+        nxt, prev = ALL_TYPES[i % len(ALL_TYPES)], ALL_TYPES[i - 2]
+        docs[f"type/{i}"] = {"id": i, "name": t, "damage_relations": {
+            "double_damage_from": [{"name": nxt}], "half_damage_from": [{"name": prev}], "no_damage_from": [],
+            "double_damage_to": [{"name": prev}], "half_damage_to": [{"name": nxt}], "no_damage_to": [],
+        }}
+    for codigo in range(1, count + 1):
+        name = f"pokemon-{codigo}"
+        types = [ALL_TYPES[codigo % len(ALL_TYPES)]] + ([ALL_TYPES[(codigo * 7) % len(ALL_TYPES)]] if codigo % 2 else [])
+        docs[f"pokemon/{codigo}"] = {
+            "id": codigo, "name": name, "height": 5 + codigo % 20, "weight": 50 + codigo % 900,
+            "types": [{"slot": n + 1, "type": {"name": t, "url": f"/api/v2/type/{ALL_TYPES.index(t) + 1}/"}}
+                      for n, t in enumerate(dict.fromkeys(types))],
+            "sprites": {"front_default": f"/sprites/{codigo}.png"},
+            "stats": [{"stat": {"name": s}, "base_stat": 40 + (codigo * (k + 3)) % 80} for k, s in
+                      enumerate(("hp", "attack", "defense", "special-attack", "special-defense", "speed"))],
+            "abilities": [{"ability": {"name": abilities[(codigo + k) % len(abilities)],
+                                       "url": f"/api/v2/ability/{(codigo + k) % len(abilities) + 1}/"},
+                           "is_hidden": k == 1} for k in range(2)],
+            "species": {"name": name, "url": f"/api/v2/pokemon-species/{codigo}/"},
+        }
+        chain = (codigo - 1) // 3 + 1
+        docs[f"pokemon-species/{codigo}"] = {
+            "id": codigo, "name": name, "gender_rate": codigo % 9 - 1,
+            "names": [{"language": {"name": "en"}, "name": name.title()}],
+            "genera": [{"language": {"name": "en"}, "genus": "Benchmark Pokémon"}],
+            "flavor_text_entries": [{"language": {"name": "en"}, "version": {"name": "red"},
+                                     "flavor_text": f"Flavor text of {name}."}],
+            "evolution_chain": {"url": f"/api/v2/evolution-chain/{chain}/"},
+            "generation": {"name": "generation-i", "url": "/api/v2/generation/1/"},
+        }
+    for chain in range(1, (count - 1) // 3 + 2):
+        members = [c for c in range(chain * 3 - 2, chain * 3 + 1) if c <= count]
+        node: Dict = {}
+        for c in reversed(members):
+            node = {
+                "species": {"name": f"pokemon-{c}", "url": f"/api/v2/pokemon-species/{c}/"},
+                "evolution_details": [{"min_level": 16, "trigger": {"name": "level-up"}}] if c != members[0] else [],
+                "evolves_to": [node] if node else [],
+            }
+        docs[f"evolution-chain/{chain}"] = {"id": chain, "chain": node}
+    species = [{"name": f"pokemon-{c}", "url": f"/api/v2/pokemon-species/{c}/"} for c in range(1, count + 1)]
+    docs["generation/1"] = {"id": 1, "name": "generation-i", "pokemon_species": species}
+    for recurso in ("pokemon", "pokemon-species", "ability", "type", "evolution-chain", "generation"):
+        items = sorted(
+            (int(p.split("/")[1]), d.get("name") or "") for p, d in docs.items()
+            if p.startswith(recurso + "/") and p.count("/") == 1
+        )
+        docs[recurso] = {"count": len(items), "next": None, "previous": None,
+                         "results": [{"name": n, "url": f"/api/v2/{recurso}/{i}/"} for i, n in items]}
+    return docs
+
+
+# -------- PokéAPI falsa --------
+
+class FakePokeAPI:
+    """PokéAPI local: ``base_url`` termina em ``/api/v2``; ``calls`` conta por modelo de endpoint."""
+
+    def __init__(self, documents: Dict[str, Dict], latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency, self.jitter, self.error_rate = latency, jitter, error_rate
+        self._random = random.Random(seed)
+        self._documents = documents
+        self._names: Dict[str, str] = {}
+        for path, doc in documents.items():
+            recurso, _, ident = path.partition("/")
+            if ident and "/" not in ident and isinstance(doc, dict) and doc.get("name"):
+                self._names[f"{recurso}/{str(doc['name']).lower()}"] = path
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.base_url = ""
+
+    def _count(self, url: str) -> None:
+        endpoint = endpoint_template(url)[1]
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.calls)
+
+    def _respond(self, url: str) -> Tuple[int, bytes]:
+        self._count(url)
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return 503, b'{"detail": "injected error"}'
+        path, query = resource_path(url)
+        doc = self._documents.get(self._names.get(path, path))
+        if doc is None:
+            return 404, b'{"detail": "Not found."}'
+        body = json.dumps(paginate(doc, query))
+        # URLs relativas do dump/fixtures viram absolutas, como na PokéAPI de verdade
+        return 200, body.replace('"/api/v2/', f'"{self.base_url}/').encode("utf-8")
+
+    def start(self) -> "FakePokeAPI":
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como o pool do cliente espera
+            disable_nagle_algorithm = True  # cabeçalho e corpo saem em escritas separadas
+
+            def do_GET(self):
+                status, body = api._respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/api/v2"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-pokeapi", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakePokeAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# -------- Execução --------
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Percentil por posição mais próxima (``values`` ordenados)."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def reset_caches() -> None:
+    """Volta ao estado frio: camadas em memória, tabelas de cache, cache em disco e índices.
+    O catálogo (``PokemonCatalogo``) é dado de base e fica."""
+    clear_tiered_caches()
+    for model in (PokemonCache, PokemonDetalheCache, CadeiaEvolutiva, TraducaoCache):
+        model.objects.all().delete()
+    cache = raw_cache()
+    if cache is not None:
+        cache.clear()
+    invalidate_type_chart()
+    invalidate_catalog_indexes()
+    reset_data_source()
+    reset_upstream_guards()
+
+
+@contextmanager
+def pointed_at(api: FakePokeAPI, raw_cache_dir: str, source: str = "http", guard: bool = False) -> Iterator[None]:
+    """Serviços, cache em disco e guarda apontados para a PokéAPI falsa; tradução remota desligada
+    e CACHES['default'] trocado por um locmem próprio (o reset não limpa o Redis de ninguém)."""
+    previous_base = services.POKEAPI_BASE
+    previous_translate = os.environ.get("ENABLE_AUTO_TRANSLATE_PT")
+    overrides = override_settings(
+        POKEAPI_BASE=api.base_url,
+        POKEAPI_RAW_CACHE_DIR=raw_cache_dir,
+        POKEMON_DATA_SOURCE=source,
+        POKEMON_UPSTREAM_GUARD=guard,
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "pokemon-bench"}},
+    )
+    services.POKEAPI_BASE = api.base_url
+    os.environ["ENABLE_AUTO_TRANSLATE_PT"] = "0"
+    overrides.enable()
+    reset_raw_cache()
+    try:
+        yield
+    finally:
+        overrides.disable()
+        services.POKEAPI_BASE = previous_base
+        if previous_translate is None:
+            os.environ.pop("ENABLE_AUTO_TRANSLATE_PT", None)
+        else:
+            os.environ["ENABLE_AUTO_TRANSLATE_PT"] = previous_translate
+        reset_raw_cache()
+        reset_data_source()
+        reset_upstream_guards()
+
+
+def scenario_paths(scenario: str, codigos: Sequence[int], list_pages: int, list_limit: int) -> List[str]:
+    if scenario == "list":
+        return [f"/pokemon/?limit={list_limit}&offset={page * list_limit}" for page in range(list_pages)]
+    if scenario == "detail":
+        return [f"/pokemon/{c}/" for c in codigos]
+    if scenario == "full":
+        return [f"/pokemon/{c}/full/" for c in codigos]
+    raise ValueError(f"cenário desconhecido: {scenario}")
+
+
+def _measure(client: Client, api: FakePokeAPI, paths: List[str], memory: bool) -> Dict:
+    latencies: List[float] = []
+    errors = stale = 0
+    calls_before = api.snapshot()
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    for path in paths:
+        t0 = time.perf_counter()
+        resp = client.get(path)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        if resp.status_code >= 400:
+            errors += 1
+        elif resp.get("X-Data-Stale") == "1":
+            stale += 1
+    elapsed = time.perf_counter() - started
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    calls_after = api.snapshot()
+    upstream = {k: v - calls_before.get(k, 0) for k, v in calls_after.items() if v - calls_before.get(k, 0)}
+    latencies.sort()
+    total_upstream = sum(upstream.values())
+    return {
+        "requests": len(paths),
+        "errors": errors,
+        "stale": stale,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "throughput_rps": round(len(paths) / elapsed, 2) if elapsed else 0.0,
+        "upstream_calls": total_upstream,
+        "upstream_per_request": round(total_upstream / len(paths), 3) if paths else 0.0,
+        "upstream_by_endpoint": dict(sorted(upstream.items())),
+        "tracemalloc_peak_kb": round(peak / 1024.0, 1) if peak is not None else None,
+        "rss_max_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else None,
+    }
+
+
+def run_benchmark(
+    api: FakePokeAPI,
+    codigos: Sequence[int],
+    scenarios: Sequence[str] = SCENARIOS,
+    list_pages: int = 5,
+    list_limit: int = 20,
+    warm_rounds: int = 3,
+    memory: bool = False,
+    before_each=None,
+) -> List[Dict]:
+    """Mede cada cenário frio e quente; ``before_each`` roda após o reset (ex.: montar o catálogo)."""
+    client = Client()
+    results = []
+    for scenario in scenarios:
+        paths = scenario_paths(scenario, codigos, list_pages, list_limit)
+        reset_caches()
+        if before_each is not None:
+            before_each()
+        results.append({"scenario": scenario, "phase": "cold", **_measure(client, api, paths, memory)})
+        results.append({"scenario": scenario, "phase": "warm", **_measure(client, api, paths * max(1, warm_rounds), memory)})
+    return results
+
+
+def load_local_source(documents: Dict[str, Dict]) -> Dict[str, int]:
+    """Importa as fixtures na tabela da fonte local (``source="local"``)."""
+    return import_documents((path, json.loads(json.dumps(doc))) for path, doc in documents.items())
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(settings.BASE_DIR),
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "django": django.get_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(current: List[Dict], baseline: List[Dict], metric: str = "p95_ms") -> List[Dict]:
+    """Razão ``atual / base`` de ``metric`` por (cenário, fase) presentes nos dois resultados."""
+    base = {(r["scenario"], r["phase"]): r for r in baseline}
+    out = []
+    for r in current:
+        b = base.get((r["scenario"], r["phase"]))
+        if b is None:
+            continue
+        ratio = (r[metric] / b[metric]) if b[metric] else None
+        out.append({
+            "scenario": r["scenario"], "phase": r["phase"], "metric": metric,
+            "baseline": b[metric], "current": r[metric],
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "upstream_delta": r["upstream_calls"] - b["upstream_calls"],
+        })
+    return out
@@ -0,0 +1,260 @@
+"""Estruturas de cache usadas pelos serviços: LRU em memória e cache em camadas."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+_MISSING = object()
+
+
+class LRUCache:
+    """LRU limitado e thread-safe, com TTL opcional por entrada (segundos)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            value, expires = item
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class _TierCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+def _memory_ttl() -> float:
+    return float(getattr(settings, "POKEMON_TIER_MEMORY_TTL_SECONDS", 60))
+
+
+def _shared_ttl() -> float:
+    return float(getattr(settings, "POKEMON_TIER_SHARED_TTL_SECONDS", 300))
+
+
+def _shared_enabled() -> bool:
+    return bool(getattr(settings, "POKEMON_SHARED_CACHE", True))
+
+
+class TieredCache:
+    """Leitura em camadas: memória do processo → cache do Django → tabela do modelo.
+
+    1. ``LRUCache`` por processo, com TTL curto (POKEMON_TIER_MEMORY_TTL_SECONDS);
+    2. backend ``default`` de CACHES (locmem, arquivo, tabela do banco ou Redis), compartilhado
+       entre workers quando o backend é (POKEMON_TIER_SHARED_TTL_SECONDS);
+    3. ``loader`` informado na leitura, que consulta a tabela persistente.
+
+    Um acerto numa camada mais lenta preenche as mais rápidas na volta. A gravação na tabela
+    continua a cargo dos serviços; ``set`` atualiza só as camadas 1 e 2. Falhas do backend
+    compartilhado (ex.: Redis fora do ar) contam como ausência e não interrompem a leitura.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: Optional[int] = None,
+        memory_ttl: Optional[float] = None,
+        shared_ttl: Optional[float] = None,
+    ):
+        self.name = name
+        self.memory = LRUCache(
+            maxsize=maxsize or getattr(settings, "POKEMON_TIER_MEMORY_SIZE", 1024),
+            ttl=_memory_ttl() if memory_ttl is None else memory_ttl,
+        )
+        self.shared_ttl = _shared_ttl() if shared_ttl is None else shared_ttl
+        self._shared = _TierCounter()
+        self._table = _TierCounter()
+
+    def _shared_key(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return "pokemon:%s:%s" % (self.name, ":".join(str(p) for p in parts))
+
+    def get(self, key: Hashable, loader: Optional[Callable[[Hashable], Any]] = None) -> Any:
+        """Valor de ``key`` ou None; ``loader(key)`` consulta a tabela (None se ausente)."""
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if _shared_enabled():
+            try:
+                value = cache.get(self._shared_key(key), _MISSING)
+            except Exception:
+                value = _MISSING
+            self._shared.record(hits=value is not _MISSING, misses=value is _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                return value
+        if loader is None:
+            return None
+        value = loader(key)
+        self._table.record(hits=value is not None, misses=value is None)
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def get_many(self, keys: Iterable[Hashable], loader: Optional[Callable[[List[Hashable]], Dict]] = None) -> Dict:
+        """Como ``get`` para vários: uma ida ao backend compartilhado e uma ao ``loader``
+        (que recebe as chaves restantes e devolve ``{chave: valor}``)."""
+        found: Dict = {}
+        pending: List[Hashable] = []
+        for key in dict.fromkeys(keys):
+            value = self.memory.get(key, _MISSING)
+            if value is _MISSING:
+                pending.append(key)
+            else:
+                found[key] = value
+        if pending and _shared_enabled():
+            names = {self._shared_key(k): k for k in pending}
+            try:
+                shared = cache.get_many(list(names))
+            except Exception:
+                shared = {}
+            for name, value in shared.items():
+                key = names[name]
+                found[key] = value
+                self.memory.set(key, value)
+            self._shared.record(hits=len(shared), misses=len(pending) - len(shared))
+            pending = [k for k in pending if k not in found]
+        if pending and loader is not None:
+            loaded = {k: v for k, v in (loader(pending) or {}).items() if v is not None}
+            self._table.record(hits=len(loaded), misses=len(pending) - len(loaded))
+            if loaded:
+                self.set_many(loaded)
+                found.update(loaded)
+        return found
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.memory.set(key, value)
+        if _shared_enabled():
+            try:
+                cache.set(self._shared_key(key), value, timeout=self.shared_ttl)
+            except Exception:
+                pass
+
+    def set_many(self, mapping: Dict) -> None:
+        for key, value in mapping.items():
+            self.memory.set(key, value)
+        if _shared_enabled() and mapping:
+            try:
+                cache.set_many({self._shared_key(k): v for k, v in mapping.items()}, timeout=self.shared_ttl)
+            except Exception:
+                pass
+
+    def delete(self, key: Hashable) -> None:
+        self.memory.delete(key)
+        if _shared_enabled():
+            try:
+                cache.delete(self._shared_key(key))
+            except Exception:
+                pass
+
+    def clear_local(self) -> None:
+        """Esvazia a camada em memória e zera os contadores (a compartilhada expira sozinha)."""
+        self.memory.clear()
+        self._shared.reset()
+        self._table.reset()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {"memory": self.memory.stats(), "shared": self._shared.stats(), "table": self._table.stats()}
+
+
+_TIERED: Dict[str, TieredCache] = {}
+_TIERED_LOCK = threading.Lock()
+
+
+def tiered_cache(name: str, **kwargs) -> TieredCache:
+    """Devolve (criando se preciso) o cache em camadas ``name`` (kwargs de ``TieredCache``)."""
+    with _TIERED_LOCK:
+        tc = _TIERED.get(name)
+        if tc is None:
+            tc = _TIERED[name] = TieredCache(name, **kwargs)
+        return tc
+
+
+def tiered_cache_stats() -> Dict[str, Dict[str, Dict[str, float]]]:
+    with _TIERED_LOCK:
+        caches = list(_TIERED.values())
+    return {tc.name: tc.stats() for tc in caches}
+
+
+def clear_tiered_caches() -> None:
+    """Esvazia as camadas em memória de todos os caches e, se houver, o backend compartilhado."""
+    with _TIERED_LOCK:
+        caches = list(_TIERED.values())
+    for tc in caches:
+        tc.clear_local()
+    try:
+        cache.clear()
+    except Exception:
+        pass
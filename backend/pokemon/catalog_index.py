@@ -0,0 +1,83 @@
+"""Estruturas em memória derivadas de PokemonCatalogo (índice de busca, colunas de stats).
+
+Cada estrutura é montada na primeira leitura do processo e remontada quando o catálogo muda:
+a versão (nº de linhas + última atualização) é conferida no máximo a cada
+POKEMON_CATALOG_INDEX_REFRESH_SECONDS; ``sync_catalog_from_pokeapi`` invalida tudo na hora.
+"""
+import threading
+import time
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .models import PokemonCatalogo, SincronizacaoCatalogo
+
+T = TypeVar("T")
+
+
+def _refresh_seconds() -> float:
+    return float(getattr(settings, "POKEMON_CATALOG_INDEX_REFRESH_SECONDS", 300))
+
+
+def catalog_version() -> Tuple:
+    agg = PokemonCatalogo.objects.aggregate(total=Count("codigo"), ultimo=Max("dtAtualizado"))
+    return agg["total"], agg["ultimo"]
+
+
+def record_catalog_total(total: int) -> None:
+    """Grava quantas espécies a PokéAPI listou na sincronização (ver ``catalog_complete``)."""
+    SincronizacaoCatalogo.objects.update_or_create(idSincronizacao=1, defaults={"totalEspecies": total})
+
+
+def catalog_complete() -> bool:
+    """True se o catálogo tem todas as espécies da última sincronização. Uma sincronização
+    parcial (buscas que falharam) deixaria espécies de fora das listagens."""
+    esperado = SincronizacaoCatalogo.objects.values_list("totalEspecies", flat=True).first()
+    return bool(esperado) and PokemonCatalogo.objects.count() >= esperado
+
+
+class CatalogDerived(Generic[T]):
+    """Valor calculado a partir das linhas do catálogo (``build(rows)``), com recarga por versão."""
+
+    def __init__(self, build: Callable[[List[PokemonCatalogo]], T]):
+        self._build = build
+        self._value: Optional[T] = None
+        self._version: Optional[Tuple] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[T]:
+        """Valor atual, ou None se o catálogo estiver vazio."""
+        now = time.monotonic()
+        if self._value is not None and now - self._checked < _refresh_seconds():
+            return self._value
+        with self._lock:
+            if self._value is not None and now - self._checked < _refresh_seconds():
+                return self._value
+            version = catalog_version()
+            if self._value is None or version != self._version:
+                rows = list(PokemonCatalogo.objects.order_by("codigo")) if version[0] else []
+                self._value = self._build(rows) if rows else None
+                self._version = version
+            self._checked = now
+            return self._value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
+            self._version = None
+
+
+_DERIVED: List[CatalogDerived] = []
+
+
+def catalog_derived(build: Callable[[List[PokemonCatalogo]], T]) -> CatalogDerived[T]:
+    derived = CatalogDerived(build)
+    _DERIVED.append(derived)
+    return derived
+
+
+def invalidate_catalog_indexes() -> None:
+    for derived in _DERIVED:
+        derived.invalidate()
@@ -0,0 +1,298 @@
+"""Fonte dos documentos da PokéAPI lidos pelos serviços.
+
+- ``HttpDataSource`` (padrão): GET em POKEAPI_BASE pela sessão compartilhada (pool, guarda por
+  host, cache em disco), com GETs simultâneos da mesma URL coalescidos;
+- ``LocalDataSource``: lê a tabela ``RecursoPokeAPI``, preenchida pelo comando
+  ``import_pokeapi_dataset`` a partir do dump oficial (repositório PokeAPI/api-data,
+  ``data/api/v2/<recurso>/<id>/index.json``). Não usa rede: serve listagem, detalhe e detalhe
+  completo em produção, testes e benchmarks com o mesmo código de services.py.
+
+A escolha é feita por POKEMON_DATA_SOURCE (``http`` | ``local``). Os serviços continuam montando
+URLs completas; a fonte local usa só o caminho após ``/api/v2/`` e, nas listagens, ``limit`` e
+``offset`` da query.
+"""
+import json
+import os
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .cache import LRUCache
+from .http_client import get_session
+from .models import RecursoPokeAPI
+from .singleflight import group
+
+DEFAULT_RESOURCES = ("pokemon", "pokemon-species", "ability", "type", "evolution-chain", "generation")
+
+# campos volumosos que nenhum serviço lê; ficam fora da tabela para manter os documentos pequenos
+_PRUNED_FIELDS = {"pokemon": ("moves", "game_indices")}
+
+_UPSTREAM_FLIGHT = group("upstream")
+
+
+class ResourceNotFound(LookupError):
+    """Caminho ausente do dataset importado (equivale a um 404 da PokéAPI)."""
+
+
+def resource_path(url: str) -> Tuple[str, Dict[str, str]]:
+    """``(caminho, query)``: ``https://pokeapi.co/api/v2/pokemon/25/`` → ``("pokemon/25", {})``.
+    Aceita também os caminhos relativos do dump (``/api/v2/pokemon/25/``)."""
+    parts = urlsplit(str(url))
+    path = parts.path
+    if "/api/v2/" in path:
+        path = path.split("/api/v2/", 1)[1]
+    query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+    return path.strip("/").lower(), query
+
+
+def paginate(doc: Dict, query: Dict[str, str]) -> Dict:
+    """Aplica ``limit``/``offset`` a um documento de listagem (o do dump traz todos os itens)."""
+    if "results" not in doc or not ({"limit", "offset"} & set(query)):
+        return doc
+    results = doc.get("results") or []
+    try:
+        offset = max(0, int(query.get("offset", 0)))
+        limit = max(0, int(query.get("limit", 20)))
+    except ValueError:
+        offset, limit = 0, 20
+    return {"count": len(results), "next": None, "previous": None, "results": results[offset: offset + limit]}
+
+
+class DataSource(ABC):
+    """Base das fontes: basta ``get_json``; ``aget_json`` roda a versão síncrona numa thread."""
+
+    name = ""
+    remote = True
+
+    @abstractmethod
+    def get_json(self, url: str, verify: bool = True, timeout: float = 20, session=None) -> Dict:
+        """Documento JSON de ``url``; ``ResourceNotFound`` quando não existe."""
+
+    async def aget_json(self, url: str, verify: bool = True, timeout: float = 20.0) -> Dict:
+        return await sync_to_async(self.get_json)(url, verify, timeout)
+
+    def stats(self) -> Dict:
+        return {"backend": self.name}
+
+
+class HttpDataSource(DataSource):
+    name = "http"
+    remote = True
+
+    def get_json(self, url: str, verify: bool = True, timeout: float = 20, session=None) -> Dict:
+        """GET na PokéAPI devolvendo o JSON; GETs simultâneos da mesma URL viram uma só chamada."""
+        s = session or get_session()
+
+        def _fetch() -> Dict:
+            resp = s.get(url, timeout=timeout, verify=verify)
+            resp.raise_for_status()
+            return resp.json()
+        return _UPSTREAM_FLIGHT.do((url, verify), _fetch)
+
+    async def aget_json(self, url: str, verify: bool = True, timeout: float = 20.0) -> Dict:
+        from .async_services import _http_aget_json  # evita import circular
+        return await _http_aget_json(url, verify, timeout)
+
+
+class LocalDataSource(DataSource):
+    """Documentos do dataset importado, com um LRU do processo na frente da tabela.
+
+    Os documentos devolvidos são compartilhados (como os do single-flight): não devem ser alterados.
+    """
+    name = "local"
+    remote = False
+
+    def __init__(self, maxsize: int = 4096):
+        self.memory = LRUCache(maxsize=maxsize)
+
+    def _load(self, path: str) -> Dict:
+        segments = path.split("/")
+        if len(segments) == 2 and not segments[1].isdigit():
+            # /type/fire, /ability/overgrow...: o dump só tem caminhos numéricos, o nome fica indexado
+            row = RecursoPokeAPI.objects.filter(recurso=segments[0], nome=segments[1]).only("payload").first()
+        else:
+            row = RecursoPokeAPI.objects.filter(caminho=path).only("payload").first()
+        if row is None:
+            raise ResourceNotFound(f"{path} não está no dataset local")
+        return row.payload
+
+    def _document(self, path: str) -> Dict:
+        doc = self.memory.get(path)
+        if doc is None:
+            doc = self._load(path)
+            self.memory.set(path, doc)
+        return doc
+
+    def get_json(self, url: str, verify: bool = True, timeout: float = 20, session=None) -> Dict:
+        path, query = resource_path(url)
+        return paginate(self._document(path), query)
+
+    async def aget_json(self, url: str, verify: bool = True, timeout: float = 20.0) -> Dict:
+        path, query = resource_path(url)
+        doc = self.memory.get(path)
+        if doc is None:
+            doc = await sync_to_async(self._document)(path)
+        return paginate(doc, query)
+
+    def stats(self) -> Dict:
+        return {
+            "backend": self.name,
+            "memory": {"size": len(self.memory), "hits": self.memory.hits, "misses": self.memory.misses},
+        }
+
+
+_SOURCES: Dict[str, DataSource] = {}
+_SOURCES_LOCK = threading.Lock()
+
+
+def data_source() -> DataSource:
+    """Fonte configurada em POKEMON_DATA_SOURCE (uma instância por tipo no processo)."""
+    name = str(getattr(settings, "POKEMON_DATA_SOURCE", "http") or "http").lower()
+    source = _SOURCES.get(name)
+    if source is None:
+        with _SOURCES_LOCK:
+            source = _SOURCES.get(name)
+            if source is None:
+                if name == "local":
+                    source = LocalDataSource(getattr(settings, "POKEMON_DATA_SOURCE_MEMORY_SIZE", 4096))
+                elif name == "http":
+                    source = HttpDataSource()
+                else:
+                    raise ValueError(f"POKEMON_DATA_SOURCE inválido: {name!r} (use 'http' ou 'local')")
+                _SOURCES[name] = source
+    return source
+
+
+def reset_data_source() -> None:
+    """Descarta as instâncias (e o LRU da fonte local), ex.: após uma importação."""
+    with _SOURCES_LOCK:
+        _SOURCES.clear()
+
+
+def data_source_stats() -> Dict:
+    return data_source().stats()
+
+
+# -------- Importação do dump (PokeAPI/api-data) --------
+
+def _dataset_files(path: str) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """``(caminho após api/v2, leitor do conteúdo)`` de cada ``index.json`` do diretório ou .zip."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.filename.endswith("/index.json") and "api/v2/" in info.filename:
+                    rel = info.filename.split("api/v2/", 1)[1]
+                    yield rel[: -len("index.json")].strip("/"), (lambda info=info: zf.read(info))
+        return
+    for root, _dirs, names in os.walk(path):
+        if "index.json" in names:
+            full = os.path.join(root, "index.json")
+            rel = "/" + os.path.relpath(root, path).replace(os.sep, "/")
+            if "api/v2/" in rel + "/":
+                rel = (rel + "/").split("api/v2/", 1)[1]
+
+            def _read(full=full) -> bytes:
+                with open(full, "rb") as fh:
+                    return fh.read()
+            yield rel.strip("/"), _read
+
+
+def dataset_documents(path: str, resources: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, Dict]]:
+    """``(caminho, documento)`` do dump; só listagens (``<recurso>``) e itens (``<recurso>/<id>``)
+    dos recursos pedidos. Sub-recursos (``pokemon/1/encounters``) ficam de fora."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    resources = tuple(resources or DEFAULT_RESOURCES)
+    for rel, read in _dataset_files(path):
+        segments = rel.split("/")
+        if segments[0] in resources and len(segments) <= 2:
+            yield rel.lower(), json.loads(read())
+
+
+def _row(path: str, payload: Dict) -> RecursoPokeAPI:
+    segments = path.split("/")
+    recurso = segments[0]
+    nome = ""
+    if len(segments) == 2:
+        for field in _PRUNED_FIELDS.get(recurso, ()):
+            payload.pop(field, None)
+        nome = str(payload.get("name") or "").lower()[:100]
+    return RecursoPokeAPI(caminho=path, recurso=recurso, nome=nome, payload=payload)
+
+
+def _upsert(rows: List[RecursoPokeAPI]) -> None:
+    RecursoPokeAPI.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["caminho"],
+        update_fields=["recurso", "nome", "payload", "dtAtualizado"],
+    )
+
+
+def _missing_list_documents(resources: Iterable[str]) -> List[RecursoPokeAPI]:
+    """Listagens ausentes do dump são montadas a partir dos itens importados."""
+    out = []
+    for recurso in resources:
+        if RecursoPokeAPI.objects.filter(caminho=recurso).exists():
+            continue
+        items = []
+        for caminho, nome in RecursoPokeAPI.objects.filter(recurso=recurso).exclude(caminho=recurso).values_list("caminho", "nome"):
+            ident = caminho.split("/")[-1]
+            if ident.isdigit():
+                items.append((int(ident), nome))
+        if items:
+            items.sort()
+            results = [{"name": nome, "url": f"/api/v2/{recurso}/{ident}/"} for ident, nome in items]
+            out.append(RecursoPokeAPI(
+                caminho=recurso, recurso=recurso,
+                payload={"count": len(results), "next": None, "previous": None, "results": results},
+            ))
+    return out
+
+
+def import_documents(
+    documents: Iterable[Tuple[str, Dict]],
+    batch_size: int = 500,
+    clear: Optional[Sequence[str]] = None,
+) -> Dict[str, int]:
+    """Grava (upsert idempotente) ``(caminho, documento)`` em ``RecursoPokeAPI``; ``clear`` apaga
+    antes os recursos indicados."""
+    counts: Dict[str, int] = {}
+    batch: List[RecursoPokeAPI] = []
+    with transaction.atomic():
+        if clear:
+            RecursoPokeAPI.objects.filter(recurso__in=clear).delete()
+        for path, payload in documents:
+            row = _row(path, payload)
+            batch.append(row)
+            counts[row.recurso] = counts.get(row.recurso, 0) + 1
+            if len(batch) >= batch_size:
+                _upsert(batch)
+                batch = []
+        if batch:
+            _upsert(batch)
+        generated = _missing_list_documents(counts)
+        if generated:
+            _upsert(generated)
+    reset_data_source()
+    return {"imported": sum(counts.values()), "lists_generated": len(generated), **counts}
+
+
+def import_dataset(
+    path: str,
+    resources: Optional[Sequence[str]] = None,
+    batch_size: int = 500,
+    clear: bool = False,
+) -> Dict[str, int]:
+    """Importa o dump da PokéAPI em ``RecursoPokeAPI``.
+
+    ``path`` é a raiz do api-data (ou qualquer diretório acima de ``api/v2``) ou um .zip dele.
+    """
+    resources = tuple(resources or DEFAULT_RESOURCES)
+    return import_documents(dataset_documents(path, resources), batch_size=batch_size, clear=resources if clear else None)
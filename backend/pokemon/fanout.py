@@ -0,0 +1,87 @@
+"""Execução concorrente e limitada de buscas independentes (ex.: itens de uma página)."""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from django.conf import settings
+from django.db import connection
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def default_concurrency() -> int:
+    return max(1, int(getattr(settings, "POKEAPI_FETCH_CONCURRENCY", 8)))
+
+
+def default_deadline() -> float:
+    return float(getattr(settings, "POKEAPI_FETCH_DEADLINE_SECONDS", 25))
+
+
+def fan_out(
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    fallback: Callable[[T], R],
+    max_workers: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> List[R]:
+    """Aplica ``fn`` a cada item em paralelo, preservando a ordem de ``items``.
+
+    - ``max_workers`` limita a concorrência (default: POKEAPI_FETCH_CONCURRENCY).
+    - ``deadline`` (segundos) limita o tempo total; itens que falham ou não
+      terminam a tempo recebem ``fallback(item)``.
+    """
+    if not items:
+        return []
+    workers = min(max_workers or default_concurrency(), len(items))
+    budget = default_deadline() if deadline is None else deadline
+    if workers <= 1:
+        return _run_serial(fn, items, fallback, budget)
+
+    missing = object()
+    results: List = [missing] * len(items)
+    ex = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pokeapi-fetch")
+    try:
+        # cada tarefa roda numa cópia do contexto da requisição (métricas, marcação de stale)
+        futures = {ex.submit(_task, contextvars.copy_context(), fn, it): i for i, it in enumerate(items)}
+        pending = set(futures)
+        end = time.monotonic() + budget
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            finished, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                i = futures[fut]
+                try:
+                    results[i] = fut.result()
+                except Exception:
+                    results[i] = fallback(items[i])
+    finally:
+        # não espera buscas atrasadas: elas terminam em segundo plano e são descartadas
+        ex.shutdown(wait=False, cancel_futures=True)
+
+    return [fallback(items[i]) if r is missing else r for i, r in enumerate(results)]
+
+
+def _task(ctx: contextvars.Context, fn, item):
+    try:
+        return ctx.run(fn, item)
+    finally:
+        # a thread morre com o executor: fecha a conexão que a tarefa abriu (fonte local, catálogo, caches)
+        connection.close()
+
+
+def _run_serial(fn, items, fallback, budget):
+    out = []
+    end = time.monotonic() + budget
+    for it in items:
+        if time.monotonic() >= end:
+            out.append(fallback(it))
+            continue
+        try:
+            out.append(fn(it))
+        except Exception:
+            out.append(fallback(it))
+    return out
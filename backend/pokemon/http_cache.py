@@ -0,0 +1,147 @@
+"""Validadores HTTP (ETag/Last-Modified), GET condicional e Cache-Control das rotas de Pokémon.
+
+Os validadores saem das linhas de cache (versão + data de atualização), consultadas antes de
+montar a resposta: se o cliente já tem a versão atual, o 304 é devolvido sem executar a view
+nem serializar nada. Quando ainda não há linha de cache, o ETag é o hash do corpo gerado.
+Respostas montadas com cache expirado (PokéAPI fora do ar, ver staleness.py) saem com
+``Warning: 110``, ``X-Data-Stale: 1`` e o Cache-Control de ``stale``.
+"""
+import asyncio
+import hashlib
+from functools import wraps
+from typing import Callable, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .catalog_index import catalog_complete, catalog_version
+from .models import PokemonCache, PokemonDetalheCache
+from .staleness import stale_scope
+
+Validators = Tuple[Optional[str], Optional[float]]  # (etag sem aspas, last-modified em epoch)
+
+_DEFAULT_CACHE_CONTROL = {
+    "list": "public, max-age=300, stale-while-revalidate=3600",
+    "detail": "public, max-age=3600, stale-while-revalidate=86400",
+    "full": "public, max-age=3600, stale-while-revalidate=86400",
+    "stale": "no-cache",
+}
+
+
+def cache_control_for(endpoint: str) -> str:
+    return getattr(settings, "POKEMON_CACHE_CONTROL", {}).get(endpoint) or _DEFAULT_CACHE_CONTROL.get(endpoint, "")
+
+
+def detail_validators(request, codigo: int) -> Validators:
+    from .services import CACHE_SCHEMA_VERSION, _cache_is_fresh
+
+    row = PokemonCache.objects.filter(codigo=codigo).values_list("versao", "dtAtualizado").first()
+    # linha expirada/antiga será regravada pela view: o validador sairia desatualizado
+    if not row or row[0] < CACHE_SCHEMA_VERSION or not _cache_is_fresh(row[1]):
+        return None, None
+    ts = row[1].timestamp()
+    return f"d{codigo}-v{row[0]}-{int(ts * 1000)}", ts
+
+
+def full_validators(request, codigo: int) -> Validators:
+    from .services import _full_cache_lang, full_expired
+
+    lang = _full_cache_lang()
+    row = (
+        PokemonDetalheCache.objects.filter(codigo=codigo, idioma=lang)
+        .values_list("dtAtualizado", "textosPendentes")
+        .first()
+    )
+    # entrada expirada: a view precisa rodar para agendar o refresh (um 304 aqui o adiaria para sempre)
+    if not row or full_expired(row[0].timestamp(), row[1]):
+        return None, None
+    ts = row[0].timestamp()
+    return f"f{codigo}-{lang}-{int(ts * 1000)}", ts
+
+
+def list_validators(request) -> Validators:
+    # só com o catálogo local a listagem é função do banco; sem ele, fica o hash do corpo
+    total, ultimo = catalog_version()
+    if not total or not catalog_complete():
+        return None, None
+    ts = ultimo.timestamp()
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.GET.items()) if k != "verify")
+    digest = hashlib.sha1(f"{total}:{ts}:{query}".encode("utf-8")).hexdigest()[:20]
+    return f"l{digest}", ts
+
+
+def _not_modified(request, endpoint: str, etag: Optional[str], last_modified: Optional[float]):
+    if request.method not in ("GET", "HEAD") or not (etag or last_modified):
+        return None
+    response = get_conditional_response(
+        request,
+        etag=quote_etag(etag) if etag else None,
+        last_modified=int(last_modified) if last_modified else None,
+    )
+    if response is not None:
+        _apply_headers(response, endpoint, etag, last_modified)
+    return response
+
+
+def _apply_headers(response, endpoint: str, etag: Optional[str], last_modified: Optional[float]) -> None:
+    if etag:
+        response["ETag"] = quote_etag(etag)
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    cache_control = cache_control_for(endpoint)
+    if cache_control and not response.has_header("Cache-Control"):
+        response["Cache-Control"] = cache_control
+
+
+def _finish(request, response, endpoint: str, etag: Optional[str], last_modified: Optional[float], stale: bool = False):
+    if response.status_code != 200:
+        return response
+    if stale:
+        # dado expirado servido por falha do upstream: o cliente deve revalidar logo
+        response["Warning"] = '110 - "Response is Stale"'
+        response["X-Data-Stale"] = "1"
+        response["Cache-Control"] = cache_control_for("stale")
+    if not etag:
+        if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+            response.render()  # Response do DRF: renderiza para obter o corpo
+        etag = "h" + hashlib.sha1(response.content).hexdigest()[:20]
+        # sem validador prévio: ainda poupa a transferência do corpo
+        not_modified = _not_modified(request, endpoint, etag, None)
+        if not_modified is not None:
+            return not_modified
+    _apply_headers(response, endpoint, etag, last_modified)
+    return response
+
+
+def conditional_get(endpoint: str, validators: Callable[..., Validators]):
+    """Decorator (mais externo, acima de ``@api_view``) de GET condicional para uma rota.
+
+    ``validators(request, *args, **kwargs)`` devolve ``(etag, last_modified)`` a partir das
+    linhas de cache; ``endpoint`` escolhe o Cache-Control (POKEMON_CACHE_CONTROL).
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapped(request, *args, **kwargs):
+                etag, last_modified = await sync_to_async(validators)(request, *args, **kwargs)
+                not_modified = _not_modified(request, endpoint, etag, last_modified)
+                if not_modified is not None:
+                    return not_modified
+                with stale_scope() as stale:
+                    response = await view(request, *args, **kwargs)
+                return _finish(request, response, endpoint, etag, last_modified, stale[0])
+            return async_wrapped
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            etag, last_modified = validators(request, *args, **kwargs)
+            not_modified = _not_modified(request, endpoint, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            with stale_scope() as stale:
+                response = view(request, *args, **kwargs)
+            return _finish(request, response, endpoint, etag, last_modified, stale[0])
+        return wrapped
+    return decorator
@@ -0,0 +1,197 @@
+"""Cliente HTTP compartilhado (por processo) para chamadas à PokéAPI e tradutores.
+
+Uma única ``requests.Session`` com pool de conexões e keep-alive é criada sob demanda e
+reaproveitada por todas as chamadas (inclusive entre threads), evitando novos handshakes
+TLS a cada requisição. Cada envio passa pela guarda do host (limitador, disjuntor e
+timeout adaptativo; ver resilience.py) e é registrado nas métricas (ver metrics.py). As
+novas tentativas (429/5xx e falhas de conexão) ficam acima da guarda: cada uma consome
+uma ficha e conta no disjuntor, como no caminho assíncrono. GETs na PokéAPI passam antes
+pelo cache em disco das respostas cruas (ver raw_cache.py).
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .metrics import record_upstream
+from .raw_cache import RawEntry, cacheable
+from .resilience import UpstreamUnavailable, guard_for, is_failure_status
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_RETRIES = 3
+_BACKOFF_FACTOR = 0.5
+
+
+class _PoolStats:
+    """Contadores thread-safe de uso do pool de conexões."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.new_connections = 0
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.checkouts,
+                "new_connections": self.new_connections,
+                "pool_hits": max(0, self.checkouts - self.new_connections),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.new_connections = 0
+
+
+_STATS = _PoolStats()
+
+
+class _CountingMixin:
+    # _get_conn devolve uma conexão ociosa do pool ou chama _new_conn quando não há
+    def _get_conn(self, timeout=None):
+        _STATS.incr("checkouts")
+        return super()._get_conn(timeout=timeout)
+
+    def _new_conn(self):
+        _STATS.incr("new_connections")
+        return super()._new_conn()
+
+
+class _CountingHTTPConnectionPool(_CountingMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingMixin, HTTPSConnectionPool):
+    pass
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter cujos pools contabilizam reaproveitamento de conexões."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, timeout=None, stream=False, **kwargs):
+        cache = None if stream else cacheable(request.method, request.url)
+        entry = cache.lookup(request.url) if cache is not None else None
+        if entry is not None and entry.fresh:
+            return self._from_cache(request, entry)
+        if entry is not None:
+            request.headers.update(entry.validators())
+        resp = self._send_with_retries(request, timeout, stream, **kwargs)
+        if cache is not None:
+            if resp.status_code == 304 and entry is not None:
+                return self._from_cache(request, cache.revalidated(request.url, entry))
+            if resp.status_code == 200:
+                cache.store(request.url, resp.status_code, resp.headers, resp.content)
+        return resp
+
+    def _from_cache(self, request, entry: RawEntry) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = entry.status
+        resp.reason = "OK"
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp._content = entry.body
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        return resp
+
+    def _send_with_retries(self, request, timeout, stream, **kwargs):
+        retries = _RETRIES if request.method in _RETRY_METHODS else 0
+        for attempt in range(retries + 1):
+            last = attempt == retries
+            try:
+                resp = self._send_upstream(request, timeout, stream, **kwargs)
+            except UpstreamUnavailable:
+                raise  # recusada pela guarda: insistir só pioraria
+            except requests.ConnectionError:
+                if last:
+                    raise
+            else:
+                if last or resp.status_code not in _RETRY_STATUS:
+                    return resp
+                resp.close()
+            time.sleep(_BACKOFF_FACTOR * (2 ** attempt))
+
+    def _send_upstream(self, request, timeout, stream, **kwargs):
+        guard = guard_for(request.url)
+        if guard is not None:
+            guard.before()  # UpstreamUnavailable com o circuito aberto ou sem fichas
+            timeout = guard.timeout_for(timeout)
+        started = time.monotonic()
+        try:
+            resp = super().send(request, timeout=timeout, stream=stream, **kwargs)
+            # lê o corpo aqui (a Session leria logo em seguida) para a duração incluir o download
+            nbytes = 0 if stream else len(resp.content or b"")
+        except Exception as exc:
+            elapsed = time.monotonic() - started
+            if guard is not None:
+                guard.after(elapsed, ok=False, timed_out=isinstance(exc, requests.Timeout))
+            record_upstream(request.url, "error", elapsed)
+            raise
+        elapsed = time.monotonic() - started
+        if guard is not None:
+            guard.after(elapsed, ok=not is_failure_status(resp.status_code))
+        record_upstream(request.url, resp.status_code, elapsed, nbytes)
+        return resp
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    # sem Retry do urllib3: as tentativas ficam em PooledHTTPAdapter._send_with_retries
+    adapter = PooledHTTPAdapter(
+        pool_connections=getattr(settings, "POKEAPI_HTTP_POOL_CONNECTIONS", 10),
+        pool_maxsize=getattr(settings, "POKEAPI_HTTP_POOL_MAXSIZE", 20),
+    )
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def get_session() -> requests.Session:
+    """Devolve a sessão compartilhada do processo, criando-a na primeira chamada."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+    return _SESSION
+
+
+def reset_session() -> None:
+    """Fecha a sessão atual (ex.: após mudar settings); a próxima chamada cria outra."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+        _SESSION = None
+
+
+def client_stats() -> Dict[str, int]:
+    """Contadores do pool: requisições, conexões novas e reaproveitadas (pool_hits)."""
+    return _STATS.snapshot()
+
+
+def reset_client_stats() -> None:
+    _STATS.reset()
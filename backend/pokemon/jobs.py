@@ -0,0 +1,243 @@
+"""Fila de jobs em banco (modelo ``Tarefa``), sem broker externo.
+
+- ``enqueue``: grava o job; com ``chave`` reaproveita o job ativo de mesma chave (índice único
+  parcial), elevando a prioridade se a nova for maior;
+- ``claim``: pega o próximo job disponível (maior prioridade, mais antigo) com um UPDATE
+  condicional, então dois trabalhadores nunca executam o mesmo job; jobs ``executando`` há mais
+  de POKEMON_JOBS_LEASE_SECONDS (trabalhador que morreu) voltam a ser elegíveis, ou vão para
+  ``falhou`` se já estavam na última tentativa;
+- falhas voltam para a fila com backoff exponencial (com jitter) até ``maxTentativas``.
+
+Os tipos de job são registrados com ``@job("tipo")`` em tasks.py e executados pelo comando
+``run_worker``. Com POKEMON_JOBS=0 (padrão) nada é enfileirado e tudo segue síncrono.
+"""
+import importlib
+import os
+import random
+import socket
+import threading
+import time
+from contextvars import ContextVar
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Tarefa
+
+PRIORIDADE_ALTA = 10
+PRIORIDADE_NORMAL = 0
+PRIORIDADE_BAIXA = -10
+
+_ATIVOS = (Tarefa.PENDENTE, Tarefa.EXECUTANDO)
+_PURGE_INTERVAL = 3600.0
+
+_REGISTRY: Dict[str, Callable] = {}
+_LOADED = False
+_LOAD_LOCK = threading.Lock()
+
+# job em execução na thread atual (None no caminho da requisição)
+_CURRENT: ContextVar[Optional[Tarefa]] = ContextVar("pokemon_job", default=None)
+
+
+def jobs_enabled() -> bool:
+    return bool(getattr(settings, "POKEMON_JOBS", False))
+
+
+def in_job() -> bool:
+    """True dentro de um job: o trabalho lento pode ser feito ali mesmo, sem reenfileirar."""
+    return _CURRENT.get() is not None
+
+
+def job(tipo: str):
+    """Registra ``fn(**parametros)`` como executor do tipo ``tipo``."""
+    def decorator(fn: Callable) -> Callable:
+        _REGISTRY[tipo] = fn
+        return fn
+    return decorator
+
+
+def handler_for(tipo: str) -> Optional[Callable]:
+    global _LOADED
+    if not _LOADED:
+        with _LOAD_LOCK:
+            if not _LOADED:
+                importlib.import_module("pokemon.tasks")
+                _LOADED = True
+    return _REGISTRY.get(tipo)
+
+
+def enqueue(
+    tipo: str,
+    parametros: Optional[Dict] = None,
+    chave: str = "",
+    prioridade: int = PRIORIDADE_NORMAL,
+    atraso: float = 0.0,
+    max_tentativas: Optional[int] = None,
+) -> Tarefa:
+    """Enfileira um job (ou devolve o job ativo de mesma ``chave``)."""
+    chave = chave[:200]
+    if chave:
+        existing = Tarefa.objects.filter(chave=chave, status__in=_ATIVOS).first()
+        if existing is not None:
+            if prioridade > existing.prioridade:
+                Tarefa.objects.filter(pk=existing.pk).update(prioridade=prioridade, dtAtualizado=timezone.now())
+                existing.prioridade = prioridade
+            return existing
+    try:
+        with transaction.atomic():
+            return Tarefa.objects.create(
+                tipo=tipo,
+                parametros=parametros or {},
+                chave=chave,
+                prioridade=prioridade,
+                dtDisponivel=timezone.now() + timedelta(seconds=atraso),
+                maxTentativas=max_tentativas or getattr(settings, "POKEMON_JOBS_MAX_ATTEMPTS", 5),
+            )
+    except IntegrityError:
+        # outro processo enfileirou a mesma chave entre a consulta e o INSERT
+        existing = Tarefa.objects.filter(chave=chave, status__in=_ATIVOS).first()
+        if existing is None:
+            raise
+        return existing
+
+
+def claim(trabalhador: str, tipos: Optional[Iterable[str]] = None) -> Optional[Tarefa]:
+    """Reserva o próximo job disponível para ``trabalhador`` (ou None se a fila estiver vazia)."""
+    now = timezone.now()
+    lease = now - timedelta(seconds=float(getattr(settings, "POKEMON_JOBS_LEASE_SECONDS", 600)))
+    qs = Tarefa.objects.filter(
+        Q(status=Tarefa.PENDENTE, dtDisponivel__lte=now) | Q(status=Tarefa.EXECUTANDO, dtInicio__lt=lease)
+    )
+    if tipos:
+        qs = qs.filter(tipo__in=list(tipos))
+    candidates = qs.order_by("-prioridade", "dtDisponivel", "idTarefa").values_list(
+        "idTarefa", "status", "dtInicio", "tentativas", "maxTentativas"
+    )[:10]
+    for pk, status, started, tentativas, max_tentativas in candidates:
+        if status == Tarefa.EXECUTANDO and tentativas >= max_tentativas:
+            # lease expirado na última tentativa (ex.: o job derruba o trabalhador): não roda de novo
+            Tarefa.objects.filter(pk=pk, status=status, dtInicio=started).update(
+                status=Tarefa.FALHOU, erro="lease expirado", dtAtualizado=now
+            )
+            continue
+        # UPDATE condicional: só um trabalhador consegue mudar o estado que leu
+        won = Tarefa.objects.filter(pk=pk, status=status, dtInicio=started).update(
+            status=Tarefa.EXECUTANDO,
+            dtInicio=now,
+            trabalhador=trabalhador[:100],
+            tentativas=F("tentativas") + 1,
+            dtAtualizado=now,
+        )
+        if won:
+            return Tarefa.objects.get(pk=pk)
+    return None
+
+
+def backoff_seconds(tentativas: int) -> float:
+    """Espera antes da próxima tentativa: exponencial, limitada, com metade aleatória."""
+    base = float(getattr(settings, "POKEMON_JOBS_BACKOFF_SECONDS", 10))
+    cap = float(getattr(settings, "POKEMON_JOBS_BACKOFF_MAX_SECONDS", 900))
+    delay = min(cap, base * (2 ** max(0, tentativas - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def run_tarefa(tarefa: Tarefa) -> bool:
+    """Executa um job reservado por ``claim``; devolve True se concluiu."""
+    handler = handler_for(tarefa.tipo)
+    token = _CURRENT.set(tarefa)
+    try:
+        if handler is None:
+            raise LookupError(f"tipo de job desconhecido: {tarefa.tipo}")
+        handler(**(tarefa.parametros or {}))
+    except Exception as exc:
+        _failed(tarefa, exc, retry=handler is not None)
+        return False
+    finally:
+        _CURRENT.reset(token)
+    Tarefa.objects.filter(pk=tarefa.pk, trabalhador=tarefa.trabalhador).update(
+        status=Tarefa.CONCLUIDA, erro="", dtAtualizado=timezone.now()
+    )
+    return True
+
+
+def _failed(tarefa: Tarefa, exc: Exception, retry: bool) -> None:
+    now = timezone.now()
+    erro = f"{type(exc).__name__}: {exc}"[:2000]
+    if retry and tarefa.tentativas < tarefa.maxTentativas:
+        changes = {"status": Tarefa.PENDENTE, "dtDisponivel": now + timedelta(seconds=backoff_seconds(tarefa.tentativas))}
+    else:
+        changes = {"status": Tarefa.FALHOU}
+    Tarefa.objects.filter(pk=tarefa.pk, trabalhador=tarefa.trabalhador).update(erro=erro, dtAtualizado=now, **changes)
+
+
+def purge_finished(older_than: Optional[float] = None) -> int:
+    """Apaga jobs concluídos mais antigos que POKEMON_JOBS_KEEP_SECONDS (os que falharam ficam)."""
+    keep = float(getattr(settings, "POKEMON_JOBS_KEEP_SECONDS", 7 * 86400) if older_than is None else older_than)
+    cutoff = timezone.now() - timedelta(seconds=keep)
+    deleted, _ = Tarefa.objects.filter(status=Tarefa.CONCLUIDA, dtAtualizado__lt=cutoff).delete()
+    return deleted
+
+
+def queue_stats() -> Dict[str, int]:
+    counts = {status: 0 for status, _label in Tarefa.STATUS_CHOICES}
+    for row in Tarefa.objects.values("status").annotate(n=Count("idTarefa")):
+        counts[row["status"]] = row["n"]
+    return counts
+
+
+class Worker:
+    """Threads que reservam e executam jobs até ``stop()`` (ou a fila esvaziar, com ``once``)."""
+
+    def __init__(self, concurrency: int = 2, tipos: Optional[Iterable[str]] = None, poll_interval: float = 1.0):
+        self.concurrency = max(1, concurrency)
+        self.tipos = list(tipos) if tipos else None
+        self.poll_interval = poll_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.counts = {"ok": 0, "failed": 0}
+        self._next_purge = 0.0
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self, index: int, once: bool, max_jobs: Optional[int]) -> None:
+        trabalhador = f"{self.name}:{index}"
+        try:
+            while not self._stop.is_set():
+                try:
+                    tarefa = claim(trabalhador, self.tipos)
+                except DatabaseError:
+                    tarefa = None  # banco ocupado (ex.: SQLite travado): tenta na próxima volta
+                if tarefa is None:
+                    if once:
+                        return
+                    if index == 0 and time.monotonic() >= self._next_purge:
+                        # fila ociosa: aproveita para limpar os concluídos antigos
+                        self._next_purge = time.monotonic() + _PURGE_INTERVAL
+                        purge_finished()
+                    self._stop.wait(self.poll_interval)
+                    continue
+                ok = run_tarefa(tarefa)
+                with self._lock:
+                    self.counts["ok" if ok else "failed"] += 1
+                    if max_jobs and self.counts["ok"] + self.counts["failed"] >= max_jobs:
+                        self._stop.set()
+        finally:
+            connection.close()
+
+    def run(self, once: bool = False, max_jobs: Optional[int] = None) -> Dict[str, int]:
+        threads = [
+            threading.Thread(target=self._loop, args=(i, once, max_jobs), name=f"pokemon-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            while t.is_alive():
+                t.join(timeout=0.5)  # join com timeout: o sinal de parada chega à thread principal
+        return dict(self.counts)
@@ -0,0 +1,115 @@
+import json
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from pokemon import bench
+from pokemon.datasource import DEFAULT_RESOURCES, dataset_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede p50/p95/p99, chamadas upstream e memória de /pokemon/, /pokemon/<id>/ e /pokemon/<id>/full/ "
+        "com caches frios e quentes, contra uma PokéAPI local com latência injetada. Usa um banco descartável."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenarios", nargs="+", choices=bench.SCENARIOS, default=list(bench.SCENARIOS))
+        parser.add_argument("--species", type=int, default=151, help="Espécies nas fixtures sintéticas (default 151).")
+        parser.add_argument("--fixtures", help="Dump do api-data (diretório ou .zip) no lugar das fixtures sintéticas.")
+        parser.add_argument("--ids", help="Códigos medidos, separados por vírgula. Se omitido, 1..--sample.")
+        parser.add_argument("--sample", type=int, default=30, help="Quantos pokémon medir (default 30).")
+        parser.add_argument("--list-pages", type=int, default=5, help="Páginas da listagem medidas (default 5).")
+        parser.add_argument("--list-limit", type=int, default=20, help="Itens por página da listagem (default 20).")
+        parser.add_argument("--warm-rounds", type=int, default=3, help="Repetições da fase quente (default 3).")
+        parser.add_argument("--latency-ms", type=float, default=50.0, help="Latência por chamada upstream (default 50).")
+        parser.add_argument("--jitter-ms", type=float, default=20.0, help="Jitter uniforme somado à latência (default 20).")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de chamadas respondidas com 503.")
+        parser.add_argument("--seed", type=int, default=42, help="Semente do jitter/erros.")
+        parser.add_argument("--with-catalog", action="store_true",
+                            help="Monta o catálogo (sync_pokemon_catalog) antes de cada cenário.")
+        parser.add_argument("--source", choices=["http", "local"], default="http",
+                            help="Fonte de dados dos serviços; 'local' importa as fixtures em RecursoPokeAPI.")
+        parser.add_argument("--guard", action="store_true", help="Mantém a guarda por host (rate limit/disjuntor).")
+        parser.add_argument("--memory", action="store_true",
+                            help="Mede o pico de alocação com tracemalloc (deixa as latências mais altas).")
+        parser.add_argument("--output", default="benchmark.json", help="Arquivo JSON com os resultados.")
+        parser.add_argument("--baseline", help="Resultado anterior para comparar (p95 por cenário/fase).")
+        parser.add_argument("--max-regression", type=float,
+                            help="Falha se algum p95 passar de N vezes o da baseline (ex.: 1.2).")
+
+    def handle(self, *args, **options):
+        if options["fixtures"]:
+            documents = dict(dataset_documents(options["fixtures"], DEFAULT_RESOURCES))
+        else:
+            documents = bench.synthetic_fixtures(options["species"])
+        if options["ids"]:
+            codigos = [int(x) for x in options["ids"].split(",") if x.strip()]
+        else:
+            codigos = list(range(1, options["sample"] + 1))
+
+        api = bench.FakePokeAPI(
+            documents,
+            latency=options["latency_ms"] / 1000.0,
+            jitter=options["jitter_ms"] / 1000.0,
+            error_rate=options["error_rate"],
+            seed=options["seed"],
+        )
+        # banco descartável, como o do test runner: o reset dos caches apaga tabelas
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with api, tempfile.TemporaryDirectory() as raw_dir, \
+                    bench.pointed_at(api, raw_dir, source=options["source"], guard=options["guard"]):
+                if options["source"] == "local":
+                    bench.load_local_source(documents)
+                before_each = None
+                if options["with_catalog"]:
+                    from pokemon.services import sync_catalog_from_pokeapi
+                    before_each = sync_catalog_from_pokeapi
+                results = bench.run_benchmark(
+                    api, codigos,
+                    scenarios=options["scenarios"],
+                    list_pages=options["list_pages"],
+                    list_limit=options["list_limit"],
+                    warm_rounds=options["warm_rounds"],
+                    memory=options["memory"],
+                    before_each=before_each,
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        config = {k: options[k] for k in (
+            "scenarios", "species", "fixtures", "sample", "list_pages", "list_limit", "warm_rounds", "latency_ms",
+            "jitter_ms", "error_rate", "seed", "with_catalog", "source", "guard", "memory",
+        )}
+        config["ids"] = codigos
+        report = {"environment": bench.environment(), "config": config, "results": results}
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+        self.stdout.write(f"{'cenário':<8} {'fase':<5} {'req':>5} {'err':>4} {'p50':>9} {'p95':>9} {'p99':>9} {'upstream/req':>13}")
+        for r in results:
+            self.stdout.write(
+                f"{r['scenario']:<8} {r['phase']:<5} {r['requests']:>5} {r['errors']:>4} {r['p50_ms']:>7.1f}ms "
+                f"{r['p95_ms']:>7.1f}ms {r['p99_ms']:>7.1f}ms {r['upstream_per_request']:>13.2f}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Resultados em {options['output']}"))
+
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as fh:
+                baseline = json.load(fh)["results"]
+            worst = []
+            for row in bench.compare(results, baseline):
+                self.stdout.write(
+                    f"{row['scenario']:<8} {row['phase']:<5} p95 {row['baseline']:.1f} → {row['current']:.1f}ms "
+                    f"(x{row['ratio']}) upstream {row['upstream_delta']:+d}"
+                )
+                if options["max_regression"] and row["ratio"] and row["ratio"] > options["max_regression"]:
+                    worst.append(f"{row['scenario']}/{row['phase']} x{row['ratio']}")
+            if worst:
+                raise CommandError(f"Regressão acima de x{options['max_regression']}: {', '.join(worst)}")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from pokemon.datasource import DEFAULT_RESOURCES, import_dataset
+
+
+class Command(BaseCommand):
+    help = "Importa o dump da PokéAPI (repositório PokeAPI/api-data, diretório ou .zip) para a fonte local (idempotente)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Raiz do api-data (ou diretório acima de api/v2) ou um .zip dele.")
+        parser.add_argument(
+            "--only", nargs="+", metavar="RECURSO",
+            help=f"Recursos a importar. Padrão: {' '.join(DEFAULT_RESOURCES)}.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Linhas por upsert.")
+        parser.add_argument("--clear", action="store_true", help="Apaga os recursos escolhidos antes de importar.")
+
+    def handle(self, *args, **options):
+        try:
+            result = import_dataset(
+                options["path"],
+                resources=options.get("only"),
+                batch_size=options["batch_size"],
+                clear=options["clear"],
+            )
+        except FileNotFoundError as exc:
+            raise CommandError(f"Dataset não encontrado: {exc}")
+        details = " ".join(f"{k}={v}" for k, v in result.items())
+        self.stdout.write(self.style.SUCCESS(f"Dataset: {details}"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from pokemon.services import pretranslate_catalog
+
+
+class Command(BaseCommand):
+    help = "Pré-traduz para pt-BR descrições, categorias e habilidades do catálogo local (grava em TraducaoCache)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", help="Lista de códigos separados por vírgula. Se omitido, usa todo o PokemonCatalogo.")
+        parser.add_argument("--concurrency", type=int, help="Buscas simultâneas. Se omitido, usa POKEAPI_FETCH_CONCURRENCY.")
+        parser.add_argument("--verify", choices=["0", "1"], help="Força verificação SSL (0/1). Se omitido, usa env POKEAPI_VERIFY_SSL.")
+
+    def handle(self, *args, **options):
+        verify_opt = options.get("verify")
+        verify = None
+        if verify_opt in ("0", "1"):
+            verify = verify_opt == "1"
+        codigos = None
+        if options.get("ids"):
+            codigos = [int(x) for x in options["ids"].split(",") if x.strip()]
+        result = pretranslate_catalog(codigos, verify_override=verify, concurrency=options.get("concurrency"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Traduções: pokemon={result['pokemon']} abilities={result['abilities']} texts={result['texts']} "
+            f"failed={result['failed']} expired={result['expired']}"
+        ))
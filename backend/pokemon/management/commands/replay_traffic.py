@@ -0,0 +1,84 @@
+import json
+import tempfile
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from pokemon import bench
+from pokemon.traffic import load_traffic, local_server, replay
+
+
+class Command(BaseCommand):
+    help = (
+        "Reenvia um arquivo gravado pelo TrafficRecorderMiddleware (TRAFFIC_RECORD_PATH) contra a aplicação, "
+        "N vezes mais rápido e com concorrência limitada, e mostra vazão, erros, latência e chamadas upstream."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Arquivo JSON lines gravado pelo middleware.")
+        parser.add_argument("--url", help="Servidor já em execução (ex.: http://127.0.0.1:8000). "
+                                          "Se omitido, sobe a aplicação numa porta local.")
+        parser.add_argument("--speed", type=float, default=1.0, help="Aceleração dos intervalos gravados (0 = sem pausa).")
+        parser.add_argument("--concurrency", type=int, default=8, help="Requisições simultâneas (default 8).")
+        parser.add_argument("--limit", type=int, help="Reenvia só os N primeiros registros.")
+        parser.add_argument("--token", help="Token JWT para os registros autenticados (sem ele são pulados).")
+        parser.add_argument("--fake-pokeapi", action="store_true",
+                            help="Servidor local contra uma PokéAPI falsa (ver benchmark), com banco descartável.")
+        parser.add_argument("--latency-ms", type=float, default=50.0, help="Latência da PokéAPI falsa (default 50).")
+        parser.add_argument("--jitter-ms", type=float, default=20.0, help="Jitter da PokéAPI falsa (default 20).")
+        parser.add_argument("--species", type=int, default=1025, help="Espécies nas fixtures da PokéAPI falsa.")
+        parser.add_argument("--output", help="Grava o relatório completo (JSON).")
+
+    def handle(self, *args, **options):
+        try:
+            records = load_traffic(options["path"], limit=options.get("limit"))
+        except OSError as exc:
+            raise CommandError(f"Não foi possível ler {options['path']}: {exc}")
+        if not records:
+            raise CommandError("Nenhum registro para reenviar.")
+        if options["url"] and options["fake_pokeapi"]:
+            raise CommandError("--fake-pokeapi sobe o próprio servidor; não use junto com --url.")
+
+        with ExitStack() as stack:
+            base_url = options["url"]
+            if options["fake_pokeapi"]:
+                # banco descartável: as tabelas de cache recebem dados das fixtures
+                old_name = connection.settings_dict["NAME"]
+                connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                stack.callback(connection.creation.destroy_test_db, old_name, verbosity=0)
+                api = stack.enter_context(bench.FakePokeAPI(
+                    bench.synthetic_fixtures(options["species"]),
+                    latency=options["latency_ms"] / 1000.0,
+                    jitter=options["jitter_ms"] / 1000.0,
+                ))
+                stack.enter_context(bench.pointed_at(api, stack.enter_context(tempfile.TemporaryDirectory())))
+            if not base_url:
+                base_url = stack.enter_context(local_server())
+            self.stdout.write(f"Reenviando {len(records)} registros para {base_url} (x{options['speed']}, "
+                              f"concorrência {options['concurrency']})...")
+            report = replay(
+                records, base_url,
+                speed=options["speed"],
+                concurrency=options["concurrency"],
+                token=options.get("token"),
+            )
+
+        self.stdout.write(
+            f"{report['requests']} requisições em {report['duration_s']}s ({report['throughput_rps']} req/s), "
+            f"erros {report['errors']} ({report['error_rate'] * 100:.1f}%), 4xx {report['client_errors']}, "
+            f"pulados {report['skipped']}, atraso máx. {report['max_lag_ms']}ms"
+        )
+        self.stdout.write(
+            f"latência p50 {report['p50_ms']}ms p95 {report['p95_ms']}ms p99 {report['p99_ms']}ms "
+            f"máx. {report['max_ms']}ms; upstream/req {report['upstream_per_request']}"
+        )
+        for route, stats in report["by_route"].items():
+            self.stdout.write(
+                f"  {route:<32} {stats['requests']:>6} req  p95 {stats['p95_ms']:>8}ms  "
+                f"erros {stats['errors']:>4}  upstream/req {stats['upstream_per_request']}"
+            )
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS("Replay concluído."))
@@ -0,0 +1,37 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from pokemon.jobs import Worker, queue_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa os jobs da fila no banco (Tarefa): traduções pendentes, refresh do detalhe completo, "
+        "sincronizações. Para com Ctrl+C/SIGTERM depois de terminar os jobs em andamento."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2, help="Jobs simultâneos (default 2).")
+        parser.add_argument("--tipos", help="Só estes tipos de job, separados por vírgula (ex.: traduzir).")
+        parser.add_argument("--once", action="store_true", help="Sai quando a fila esvaziar.")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Espera entre consultas com a fila vazia, em segundos (default 1).")
+        parser.add_argument("--max-jobs", type=int, help="Sai depois de N jobs.")
+
+    def handle(self, *args, **options):
+        tipos = [t.strip() for t in (options.get("tipos") or "").split(",") if t.strip()]
+        worker = Worker(concurrency=options["concurrency"], tipos=tipos, poll_interval=options["poll_interval"])
+
+        def _stop(signum, _frame):
+            self.stdout.write(f"Sinal {signum} recebido; terminando os jobs em andamento...")
+            worker.stop()
+        signal.signal(signal.SIGINT, _stop)
+        signal.signal(signal.SIGTERM, _stop)
+
+        self.stdout.write(
+            f"Worker {worker.name}: concorrência {worker.concurrency}, tipos {', '.join(tipos) or 'todos'}; "
+            f"fila {queue_stats()}"
+        )
+        counts = worker.run(once=options["once"], max_jobs=options.get("max_jobs"))
+        self.stdout.write(self.style.SUCCESS(f"Jobs: ok={counts['ok']} failed={counts['failed']}"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from pokemon.services import sync_catalog_from_pokeapi
+
+
+class Command(BaseCommand):
+    help = "Constrói/atualiza o catálogo local de espécies (PokemonCatalogo) a partir da PokéAPI (idempotente)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--refresh", action="store_true", help="Rebusca todas as espécies, não só as ausentes.")
+        parser.add_argument("--concurrency", type=int, help="Buscas simultâneas. Se omitido, usa POKEAPI_FETCH_CONCURRENCY.")
+        parser.add_argument("--verify", choices=["0", "1"], help="Força verificação SSL (0/1). Se omitido, usa env POKEAPI_VERIFY_SSL.")
+
+    def handle(self, *args, **options):
+        verify_opt = options.get("verify")
+        verify = None
+        if verify_opt in ("0", "1"):
+            verify = verify_opt == "1"
+        result = sync_catalog_from_pokeapi(
+            refresh=options["refresh"],
+            verify_override=verify,
+            concurrency=options.get("concurrency"),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Catálogo: species={result['species']} updated={result['updated']} failed={result['failed']} count={result['count']}"
+        ))
@@ -14,4 +14,4 @@ class Command(BaseCommand):
         if verify_opt in ("0", "1"):
             verify = verify_opt == "1"
         result = sync_types_from_pokeapi(verify_override=verify)
-        self.stdout.write(self.style.SUCCESS(f"Tipos: created={result['created']} existing={result['existing']} count={result['count']}"))
+        self.stdout.write(self.style.SUCCESS(f"Tipos: created={result['created']} existing={result['existing']} count={result['count']} matrix={result['matrix']}"))
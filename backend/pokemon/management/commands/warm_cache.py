@@ -0,0 +1,115 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from pokemon.services import all_species_ids, warm_pokemon
+
+
+class Command(BaseCommand):
+    help = (
+        "Pré-aquece os caches (detalhe, detalhe completo, traduções e cadeias evolutivas) de toda a Pokédex. "
+        "Retomável via checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", help="Lista de códigos separados por vírgula. Se omitido, usa todas as espécies.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Pokémon processados em paralelo (default 4).")
+        parser.add_argument("--rate", type=float, default=0.0, help="Máximo de pokémon iniciados por segundo (0 = sem limite).")
+        parser.add_argument("--checkpoint", default=str(settings.BASE_DIR / "warm_cache.checkpoint.json"),
+                            help="Arquivo de checkpoint com os códigos já concluídos.")
+        parser.add_argument("--resume", action="store_true", help="Pula os códigos registrados no checkpoint.")
+        parser.add_argument("--checkpoint-every", type=int, default=25, help="Grava o checkpoint a cada N concluídos.")
+        parser.add_argument("--progress-every", type=int, default=50, help="Mostra o progresso a cada N concluídos.")
+        parser.add_argument("--verify", choices=["0", "1"], help="Força verificação SSL (0/1). Se omitido, usa env POKEAPI_VERIFY_SSL.")
+
+    def handle(self, *args, **options):
+        verify_opt = options.get("verify")
+        verify = None
+        if verify_opt in ("0", "1"):
+            verify = verify_opt == "1"
+
+        if options.get("ids"):
+            codigos = [int(x) for x in options["ids"].split(",") if x.strip()]
+        else:
+            codigos = all_species_ids(verify_override=verify)
+
+        checkpoint = options["checkpoint"]
+        done = self._load_checkpoint(checkpoint) if options["resume"] else set()
+        todo = [c for c in codigos if c not in done]
+        self.stdout.write(f"Aquecendo {len(todo)} pokémon ({len(done)} já concluídos no checkpoint).")
+
+        def _work(codigo):
+            try:
+                warm_pokemon(codigo, verify_override=verify)
+            finally:
+                connection.close()
+
+        concurrency = max(1, options["concurrency"])
+        interval = 1.0 / options["rate"] if options["rate"] > 0 else 0.0
+        ok = errors = 0
+        started = time.monotonic()
+        next_slot = started
+        pending = {}
+        queue = iter(todo)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="warm-cache") as ex:
+            while True:
+                # mantém no máximo 2× concurrency em voo, respeitando --rate
+                while len(pending) < concurrency * 2:
+                    codigo = next(queue, None)
+                    if codigo is None:
+                        break
+                    if interval:
+                        now = time.monotonic()
+                        if next_slot > now:
+                            time.sleep(next_slot - now)
+                        next_slot = max(next_slot, now) + interval
+                    pending[ex.submit(_work, codigo)] = codigo
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    codigo = pending.pop(fut)
+                    try:
+                        fut.result()
+                        ok += 1
+                        done.add(codigo)
+                    except Exception as exc:
+                        errors += 1
+                        self.stderr.write(f"#{codigo}: {exc}")
+                    processed = ok + errors
+                    if processed % options["checkpoint_every"] == 0:
+                        self._save_checkpoint(checkpoint, done)
+                    if processed % options["progress_every"] == 0:
+                        self._progress(processed, len(todo), ok, errors, started)
+
+        self._save_checkpoint(checkpoint, done)
+        self._progress(ok + errors, len(todo), ok, errors, started)
+        self.stdout.write(self.style.SUCCESS(f"Cache aquecido: ok={ok} errors={errors}"))
+
+    def _progress(self, processed, total, ok, errors, started):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        pct = (100.0 * processed / total) if total else 100.0
+        self.stdout.write(
+            f"{processed}/{total} ({pct:.1f}%) ok={ok} errors={errors} "
+            f"{processed / elapsed:.2f} pokémon/s em {elapsed:.1f}s"
+        )
+
+    @staticmethod
+    def _load_checkpoint(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return set(json.load(f).get("done", []))
+        except (OSError, ValueError):
+            return set()
+
+    @staticmethod
+    def _save_checkpoint(path, done):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"done": sorted(done)}, f)
+        os.replace(tmp, path)
@@ -0,0 +1,293 @@
+"""Métricas do processo no formato texto do Prometheus e tempos por requisição (Server-Timing).
+
+- Chamadas upstream (PokéAPI, tradutores): contagem por status, histograma de latência e bytes,
+  agrupados por host e modelo de endpoint (``/pokemon/{id}``, ``/ability/{name}``...). O registro
+  é feito no adapter da sessão compartilhada e no transporte do httpx (``record_upstream``).
+- Caches em camadas, single-flight e guardas por host: lidos dos contadores que já existem no
+  momento da coleta.
+- Latência das views por rota (``MetricsMiddleware``), que também escreve o Server-Timing da
+  resposta: tempo upstream (soma das chamadas, inclusive as paralelas), banco e total.
+
+Os valores são por processo; com vários workers, cada um expõe os seus em GET /metrics.
+"""
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...]):
+        self.name, self.help, self.labelnames = name, help_text, labelnames
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...], buckets=_LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames, self.buckets = name, help_text, labelnames, tuple(buckets)
+        self._values: Dict[Labels, List[float]] = {}  # contagem por faixa..., soma, total
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for labels, data in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                le = _labels(self.labelnames, labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {int(data[-1])}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {round(data[-2], 6)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {int(data[-1])}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+UPSTREAM_REQUESTS = Counter(
+    "pokemon_upstream_requests_total", "Chamadas upstream por host, endpoint e status.", ("host", "endpoint", "status")
+)
+UPSTREAM_LATENCY = Histogram(
+    "pokemon_upstream_request_duration_seconds", "Duração das chamadas upstream (com download do corpo).",
+    ("host", "endpoint"),
+)
+UPSTREAM_BYTES = Counter(
+    "pokemon_upstream_response_bytes_total", "Bytes recebidos do upstream.", ("host", "endpoint")
+)
+VIEW_LATENCY = Histogram(
+    "pokemon_http_request_duration_seconds", "Duração das requisições por rota.", ("route", "method", "status")
+)
+
+_METRICS = [UPSTREAM_REQUESTS, UPSTREAM_LATENCY, UPSTREAM_BYTES, VIEW_LATENCY]
+
+
+def register(metric):
+    """Inclui na exposição uma métrica definida em outro módulo."""
+    _METRICS.append(metric)
+    return metric
+
+
+_NUMERIC = re.compile(r"^\d+$")
+
+
+def endpoint_template(url: str) -> Tuple[str, str]:
+    """``(host, modelo)``: ``https://pokeapi.co/api/v2/pokemon/25/`` → ``("pokeapi.co", "/pokemon/{id}")``."""
+    parts = urlsplit(str(url))
+    path = parts.path.split("/api/v2", 1)[-1]
+    segments = [s for s in path.split("/") if s]
+    templated = [segments[0]] if segments else []
+    for seg in segments[1:]:
+        templated.append("{id}" if _NUMERIC.match(seg) else "{name}")
+    return parts.hostname or "", "/" + "/".join(templated)
+
+
+# -------- Tempos da requisição atual (Server-Timing) --------
+
+class RequestTiming:
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.upstream = 0.0
+        self.upstream_calls = 0
+        self.db = 0.0
+        self.db_queries = 0
+        self._lock = threading.Lock()
+
+    def add_upstream(self, seconds: float) -> None:
+        with self._lock:
+            self.upstream += seconds
+            self.upstream_calls += 1
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.monotonic() - started
+            self.db_queries += 1
+
+    def header(self) -> str:
+        total = time.monotonic() - self.started
+        parts = [f'upstream;dur={self.upstream * 1000:.1f};desc="{self.upstream_calls} chamadas"']
+        if self.db_queries:
+            parts.append(f'db;dur={self.db * 1000:.1f};desc="{self.db_queries} consultas"')
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+# objeto mutável: threads de fan_out e sync_to_async recebem cópias do contexto com a mesma instância
+_TIMING: ContextVar[Optional[RequestTiming]] = ContextVar("pokemon_request_timing", default=None)
+
+
+def record_upstream(url: str, status, seconds: float, nbytes: int = 0) -> None:
+    """Registra uma chamada upstream (``status`` é o código HTTP ou ``"error"``)."""
+    host, endpoint = endpoint_template(url)
+    UPSTREAM_REQUESTS.inc((host, endpoint, str(status)))
+    UPSTREAM_LATENCY.observe((host, endpoint), seconds)
+    if nbytes:
+        UPSTREAM_BYTES.inc((host, endpoint), nbytes)
+    timing = _TIMING.get()
+    if timing is not None:
+        timing.add_upstream(seconds)
+
+
+def _route(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    # só o padrão da rota: caminhos sem rota (estáticos, 404) não viram séries novas
+    return match.route if match is not None and match.route else "unmatched"
+
+
+class MetricsMiddleware:
+    """Mede cada requisição (histograma por rota) e escreve o cabeçalho Server-Timing."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _TIMING.set(timing)
+        try:
+            with connection.execute_wrapper(timing.db_wrapper):
+                response = self.get_response(request)
+        finally:
+            _TIMING.reset(token)
+        return self._finish(request, response, timing)
+
+    async def __acall__(self, request):
+        # no caminho assíncrono o banco roda em threads do sync_to_async: só upstream e total
+        timing = RequestTiming()
+        token = _TIMING.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _TIMING.reset(token)
+        return self._finish(request, response, timing)
+
+    def _finish(self, request, response, timing: RequestTiming):
+        VIEW_LATENCY.observe((_route(request), request.method, str(response.status_code)), time.monotonic() - timing.started)
+        if getattr(settings, "POKEMON_SERVER_TIMING", True):
+            response["Server-Timing"] = timing.header()
+        return response
+
+
+# -------- Exposição --------
+
+def _family(name: str, kind: str, help_text: str, lines: List[str]) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *lines] if lines else []
+
+
+def _collected() -> List[str]:
+    """Séries lidas dos contadores existentes (caches, single-flight, guardas por host)."""
+    from .cache import tiered_cache_stats
+    from .resilience import upstream_stats
+    from .singleflight import singleflight_stats
+
+    out: List[str] = []
+    hits, misses = [], []
+    for cache_name, layers in sorted(tiered_cache_stats().items()):
+        for layer, stats in layers.items():
+            labels = _labels(("cache", "layer"), (cache_name, layer))
+            hits.append(f"pokemon_cache_hits_total{labels} {stats['hits']}")
+            misses.append(f"pokemon_cache_misses_total{labels} {stats['misses']}")
+    out += _family("pokemon_cache_hits_total", "counter", "Acertos por cache e camada.", hits)
+    out += _family("pokemon_cache_misses_total", "counter", "Ausências por cache e camada.", misses)
+
+    coalesced = [
+        f"pokemon_singleflight_coalesced_total{_labels(('group',), (g,))} {s['coalesced']}"
+        for g, s in sorted(singleflight_stats().items())
+    ]
+    out += _family("pokemon_singleflight_coalesced_total", "counter", "Chamadas atendidas por outra em andamento.", coalesced)
+
+    states = {"closed": 0, "half_open": 1, "open": 2}
+    circuit, rejected = [], []
+    for host, s in upstream_stats().items():
+        circuit.append(f"pokemon_upstream_circuit_state{_labels(('host',), (host,))} {states[s['breaker']['state']]}")
+        for reason in ("open", "rate"):
+            rejected.append(
+                f"pokemon_upstream_rejected_total{_labels(('host', 'reason'), (host, reason))} {s['rejected_' + reason]}"
+            )
+    out += _family("pokemon_upstream_circuit_state", "gauge", "Disjuntor por host (0 fechado, 1 em teste, 2 aberto).", circuit)
+    out += _family("pokemon_upstream_rejected_total", "counter", "Chamadas recusadas localmente pela guarda do host.", rejected)
+    return out
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines += _family(metric.name, metric.kind, metric.help, metric.samples())
+    lines += _collected()
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    for metric in _METRICS:
+        metric.reset()
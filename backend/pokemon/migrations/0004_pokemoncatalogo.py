@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0003_alter_pokemonusuario_idtipopokemon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PokemonCatalogo',
+            fields=[
+                ('codigo', models.IntegerField(primary_key=True, serialize=False)),
+                ('nome', models.CharField(db_index=True, max_length=100)),
+                ('nomeLocalizado', models.CharField(blank=True, default='', max_length=100)),
+                ('geracao', models.PositiveSmallIntegerField(db_index=True)),
+                ('tipos', models.JSONField(default=list)),
+                ('imagemUrl', models.URLField(max_length=400)),
+                ('stats', models.JSONField(default=dict)),
+                ('dtAtualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Catálogo de Pokémon',
+                'verbose_name_plural': 'Catálogo de Pokémon',
+                'ordering': ('codigo',),
+            },
+        ),
+    ]
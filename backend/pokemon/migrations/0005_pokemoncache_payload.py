@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0004_pokemoncatalogo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pokemoncache',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='pokemoncache',
+            name='versao',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0005_pokemoncache_payload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PokemonDetalheCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.IntegerField()),
+                ('idioma', models.CharField(max_length=10)),
+                ('payload', models.JSONField(default=dict)),
+                ('dtAtualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Cache de detalhe completo',
+                'verbose_name_plural': 'Cache de detalhes completos',
+                'unique_together': {('codigo', 'idioma')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0006_pokemondetalhecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EfetividadeTipo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('multiplicador', models.FloatField(default=1.0)),
+                ('atacante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='efetividadesAtaque', to='pokemon.tipopokemon')),
+                ('defensor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='efetividadesDefesa', to='pokemon.tipopokemon')),
+            ],
+            options={
+                'verbose_name': 'Efetividade de tipo',
+                'verbose_name_plural': 'Efetividades de tipo',
+                'unique_together': {('atacante', 'defensor')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0007_efetividadetipo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TraducaoCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=64)),
+                ('origem', models.CharField(max_length=10)),
+                ('destino', models.CharField(max_length=10)),
+                ('textoOriginal', models.TextField()),
+                ('textoTraduzido', models.TextField()),
+                ('dtAtualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tradução em cache',
+                'verbose_name_plural': 'Traduções em cache',
+                'unique_together': {('chave', 'origem', 'destino')},
+            },
+        ),
+    ]
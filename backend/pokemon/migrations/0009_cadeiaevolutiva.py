@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0008_traducaocache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CadeiaEvolutiva',
+            fields=[
+                ('idCadeia', models.IntegerField(primary_key=True, serialize=False)),
+                ('payload', models.JSONField(default=dict)),
+                ('dtAtualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Cadeia evolutiva',
+                'verbose_name_plural': 'Cadeias evolutivas',
+            },
+        ),
+    ]
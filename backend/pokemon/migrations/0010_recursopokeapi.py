@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0009_cadeiaevolutiva'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecursoPokeAPI',
+            fields=[
+                ('caminho', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('recurso', models.CharField(max_length=50)),
+                ('nome', models.CharField(blank=True, default='', max_length=100)),
+                ('payload', models.JSONField(default=dict)),
+                ('dtAtualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Recurso da PokéAPI',
+                'verbose_name_plural': 'Recursos da PokéAPI',
+                'indexes': [models.Index(fields=['recurso', 'nome'], name='pokemon_rec_recurso_b0714d_idx')],
+            },
+        ),
+    ]
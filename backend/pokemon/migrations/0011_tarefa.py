@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-18 03:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0010_recursopokeapi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('idTarefa', models.AutoField(primary_key=True, serialize=False)),
+                ('tipo', models.CharField(max_length=50)),
+                ('parametros', models.JSONField(blank=True, default=dict)),
+                ('chave', models.CharField(blank=True, default='', max_length=200)),
+                ('prioridade', models.IntegerField(default=0)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('executando', 'Executando'), ('concluida', 'Concluída'), ('falhou', 'Falhou')], default='pendente', max_length=12)),
+                ('tentativas', models.IntegerField(default=0)),
+                ('maxTentativas', models.IntegerField(default=5)),
+                ('dtDisponivel', models.DateTimeField(default=django.utils.timezone.now)),
+                ('dtInicio', models.DateTimeField(blank=True, null=True)),
+                ('trabalhador', models.CharField(blank=True, default='', max_length=100)),
+                ('erro', models.TextField(blank=True, default='')),
+                ('dtCriacao', models.DateTimeField(auto_now_add=True)),
+                ('dtAtualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'indexes': [models.Index(fields=['status', 'prioridade', 'dtDisponivel'], name='pokemon_tar_status_8a20a3_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tarefa',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pendente', 'executando']), models.Q(('chave', ''), _negated=True)), fields=('chave',), name='tarefa_chave_ativa_unica'),
+        ),
+    ]
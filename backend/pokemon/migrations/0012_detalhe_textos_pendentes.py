@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0011_tarefa'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pokemondetalhecache',
+            name='textosPendentes',
+            field=models.IntegerField(default=0),
+        ),
+    ]
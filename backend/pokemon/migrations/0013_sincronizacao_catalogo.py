@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon', '0012_detalhe_textos_pendentes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SincronizacaoCatalogo',
+            fields=[
+                ('idSincronizacao', models.AutoField(primary_key=True, serialize=False)),
+                ('totalEspecies', models.IntegerField(default=0)),
+                ('dtAtualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Sincronização do catálogo',
+                'verbose_name_plural': 'Sincronizações do catálogo',
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
 
 
 class TipoPokemon(models.Model):
@@ -14,6 +16,23 @@ class TipoPokemon(models.Model):
         return self.descricao
 
 
+class EfetividadeTipo(models.Model):
+    """Multiplicador de dano do tipo atacante contra o tipo defensor (tabela 18×18).
+    Preenchido por sync_pokemon_types; lido em memória por type_chart.py.
+    """
+    atacante = models.ForeignKey(TipoPokemon, on_delete=models.CASCADE, related_name="efetividadesAtaque")
+    defensor = models.ForeignKey(TipoPokemon, on_delete=models.CASCADE, related_name="efetividadesDefesa")
+    multiplicador = models.FloatField(default=1.0)
+
+    class Meta:
+        verbose_name = "Efetividade de tipo"
+        verbose_name_plural = "Efetividades de tipo"
+        unique_together = ("atacante", "defensor")
+
+    def __str__(self):
+        return f"{self.atacante} → {self.defensor}: {self.multiplicador}"
+
+
 class PokemonUsuario(models.Model):
     idPokemonUsuario = models.AutoField(primary_key=True)
     usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -39,11 +58,16 @@ class PokemonUsuario(models.Model):
 class PokemonCache(models.Model):
     """Cache simples para dados normalizados de Pokémon.
     Usado para reduzir chamadas à PokéAPI em listagens e buscas.
+
+    ``payload`` guarda o detalhe normalizado completo (nome localizado, tipos, imagem, stats);
+    linhas com ``versao`` menor que a atual são tratadas como ausentes e regravadas na leitura.
     """
     codigo = models.IntegerField(primary_key=True)
     nome = models.CharField(max_length=100)
     tipos = models.JSONField(default=list)
     imagemUrl = models.URLField(max_length=400)
+    payload = models.JSONField(default=dict, blank=True)
+    versao = models.PositiveSmallIntegerField(default=0)
     dtAtualizado = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -52,3 +76,159 @@ class PokemonCache(models.Model):
 
     def __str__(self):
         return f"{self.nome} (#{self.codigo})"
+
+
+class PokemonCatalogo(models.Model):
+    """Índice local das espécies (código, nomes, geração, tipos e stats).
+    Alimentado pelo comando sync_pokemon_catalog; permite listar/filtrar/paginar sem chamar a PokéAPI.
+    """
+    codigo = models.IntegerField(primary_key=True)
+    nome = models.CharField(max_length=100, db_index=True)  # nome da PokéAPI (inglês)
+    nomeLocalizado = models.CharField(max_length=100, blank=True, default="")
+    geracao = models.PositiveSmallIntegerField(db_index=True)
+    tipos = models.JSONField(default=list)
+    imagemUrl = models.URLField(max_length=400)
+    stats = models.JSONField(default=dict)
+    dtAtualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Catálogo de Pokémon"
+        verbose_name_plural = "Catálogo de Pokémon"
+        ordering = ("codigo",)
+
+    def __str__(self):
+        return f"{self.nomeLocalizado or self.nome} (#{self.codigo})"
+
+
+class SincronizacaoCatalogo(models.Model):
+    """Última sincronização do catálogo (linha única): quantas espécies a PokéAPI listou.
+    O catálogo só substitui a PokéAPI nas listagens quando tem todas elas.
+    """
+    idSincronizacao = models.AutoField(primary_key=True)
+    totalEspecies = models.IntegerField(default=0)
+    dtAtualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Sincronização do catálogo"
+        verbose_name_plural = "Sincronizações do catálogo"
+
+    def __str__(self):
+        return f"{self.totalEspecies} espécies ({self.dtAtualizado:%Y-%m-%d %H:%M})"
+
+
+class PokemonDetalheCache(models.Model):
+    """Cache do detalhe completo (/pokemon/<id>/full/) já montado, por código e idioma."""
+    codigo = models.IntegerField()
+    idioma = models.CharField(max_length=10)
+    payload = models.JSONField(default=dict)
+    # textos que saíram sem tradução (tradutor fora/sem cota): a entrada expira antes
+    textosPendentes = models.IntegerField(default=0)
+    dtAtualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Cache de detalhe completo"
+        verbose_name_plural = "Cache de detalhes completos"
+        unique_together = ("codigo", "idioma")
+
+    def __str__(self):
+        return f"#{self.codigo} [{self.idioma}]"
+
+
+class TraducaoCache(models.Model):
+    """Traduções já obtidas (MyMemory/LibreTranslate), compartilhadas entre processos.
+    ``chave`` é o sha256 do texto original.
+    """
+    chave = models.CharField(max_length=64)
+    origem = models.CharField(max_length=10)
+    destino = models.CharField(max_length=10)
+    textoOriginal = models.TextField()
+    textoTraduzido = models.TextField()
+    dtAtualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Tradução em cache"
+        verbose_name_plural = "Traduções em cache"
+        unique_together = ("chave", "origem", "destino")
+
+    def __str__(self):
+        return f"[{self.origem}->{self.destino}] {self.textoOriginal[:40]}"
+
+
+class CadeiaEvolutiva(models.Model):
+    """Cadeia evolutiva já montada (``evolucoes`` e ``evolutionEdges``), compartilhada
+    por todas as espécies da família."""
+    idCadeia = models.IntegerField(primary_key=True)
+    payload = models.JSONField(default=dict)
+    dtAtualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Cadeia evolutiva"
+        verbose_name_plural = "Cadeias evolutivas"
+
+    def __str__(self):
+        return f"Cadeia #{self.idCadeia}"
+
+
+class RecursoPokeAPI(models.Model):
+    """Documento da PokéAPI importado do dump oficial (api-data), servido pela fonte local.
+    ``caminho`` é o caminho após ``/api/v2/`` (``pokemon/25``; ``pokemon`` para a listagem).
+    """
+    caminho = models.CharField(max_length=200, primary_key=True)
+    recurso = models.CharField(max_length=50)
+    nome = models.CharField(max_length=100, blank=True, default="")
+    payload = models.JSONField(default=dict)
+    dtAtualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Recurso da PokéAPI"
+        verbose_name_plural = "Recursos da PokéAPI"
+        indexes = [models.Index(fields=["recurso", "nome"])]
+
+    def __str__(self):
+        return self.caminho
+
+
+class Tarefa(models.Model):
+    """Job da fila em banco (ver jobs.py): enriquecimentos lentos tirados do caminho da requisição.
+    ``chave`` deduplica: só um job ativo (pendente ou executando) por chave.
+    """
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDA = "concluida"
+    FALHOU = "falhou"
+    STATUS_CHOICES = [
+        (PENDENTE, "Pendente"),
+        (EXECUTANDO, "Executando"),
+        (CONCLUIDA, "Concluída"),
+        (FALHOU, "Falhou"),
+    ]
+
+    idTarefa = models.AutoField(primary_key=True)
+    tipo = models.CharField(max_length=50)
+    parametros = models.JSONField(default=dict, blank=True)
+    chave = models.CharField(max_length=200, blank=True, default="")
+    prioridade = models.IntegerField(default=0)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=PENDENTE)
+    tentativas = models.IntegerField(default=0)
+    maxTentativas = models.IntegerField(default=5)
+    dtDisponivel = models.DateTimeField(default=timezone.now)
+    dtInicio = models.DateTimeField(null=True, blank=True)
+    trabalhador = models.CharField(max_length=100, blank=True, default="")
+    erro = models.TextField(blank=True, default="")
+    dtCriacao = models.DateTimeField(auto_now_add=True)
+    dtAtualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        indexes = [models.Index(fields=["status", "prioridade", "dtDisponivel"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chave"],
+                condition=Q(status__in=["pendente", "executando"]) & ~Q(chave=""),
+                name="tarefa_chave_ativa_unica",
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.idTarefa} {self.tipo} [{self.status}]"
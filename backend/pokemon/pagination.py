@@ -0,0 +1,49 @@
+"""Cursores opacos da listagem (paginação por chave/keyset).
+
+O token é um JSON em base64 (url-safe) com a direção, a chave de ordenação do último (ou
+primeiro) item entregue e um hash dos filtros: um cursor só vale para a mesma consulta.
+"""
+import base64
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def filters_hash(generation: Optional[int], name: Optional[str], filters: Optional[Dict]) -> str:
+    from .search import fold
+
+    f = filters or {}
+    ident = {
+        "g": generation or 0,
+        "n": fold(name or ""),
+        "t": sorted(f.get("types") or []),
+        "a": bool(f.get("types_all")),
+        "r": sorted((k, list(v)) for k, v in (f.get("ranges") or {}).items()),
+        "o": f.get("order_by") or "codigo",
+    }
+    raw = json.dumps(ident, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(direction: str, key: Tuple[int, ...], fhash: str) -> str:
+    raw = json.dumps({"d": direction, "k": list(key), "f": fhash}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, fhash: str) -> Tuple[str, Tuple[int, ...]]:
+    """``(direção, chave)``; ``InvalidCursor`` se o token for ilegível ou de outra consulta."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction, key, token_hash = data["d"], tuple(int(v) for v in data["k"]), data["f"]
+    except Exception:
+        raise InvalidCursor("cursor inválido")
+    if direction not in ("n", "p") or not key:
+        raise InvalidCursor("cursor inválido")
+    if token_hash != fhash:
+        raise InvalidCursor("cursor não corresponde aos filtros informados")
+    return direction, key
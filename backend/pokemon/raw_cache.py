@@ -0,0 +1,240 @@
+"""Cache em disco das respostas cruas da PokéAPI, abaixo do cliente HTTP compartilhado.
+
+Cada GET bem-sucedido é gravado comprimido (gzip) num arquivo cujo nome é o sha256 da URL:
+uma linha JSON de metadados (status, cabeçalhos úteis, instante da gravação) seguida do corpo.
+Como o gancho fica no adapter da sessão e no transporte do httpx, todas as funções de
+services.py que buscam o mesmo documento (``/pokemon/{id}``, ``/pokemon-species/{id}``,
+``/ability/{name}``, ``/type/{name}``...) passam a reaproveitá-lo, inclusive entre workers e
+reinícios.
+
+- TTL por modelo de endpoint (``POKEAPI_RAW_CACHE_TTLS``, ver ``metrics.endpoint_template``);
+  expirada, a entrada é revalidada com If-None-Match/If-Modified-Since e um 304 renova o prazo;
+- limite de tamanho (POKEAPI_RAW_CACHE_MAX_MB): passando dele, os arquivos menos usados
+  (mtime, renovado a cada acerto) são removidos até 90% do limite;
+- só hosts de POKEAPI_RAW_CACHE_HOSTS (default: o host de POKEAPI_BASE); tradutores têm o
+  próprio cache.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from .metrics import Counter, endpoint_template, register
+
+_DEFAULT_TTLS = {
+    "/pokemon/{id}": 7 * 86400,
+    "/pokemon/{name}": 7 * 86400,
+    "/pokemon-species/{id}": 7 * 86400,
+    "/pokemon-species/{name}": 7 * 86400,
+    "/evolution-chain/{id}": 7 * 86400,
+    "/ability/{name}": 30 * 86400,
+    "/ability/{id}": 30 * 86400,
+    "/type/{name}": 30 * 86400,
+    "/type/{id}": 30 * 86400,
+    "/type": 30 * 86400,
+    "/generation/{id}": 86400,
+    "/generation": 86400,
+    "/pokemon": 86400,
+}
+
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+RAW_CACHE_REQUESTS = register(Counter(
+    "pokemon_raw_cache_requests_total", "Consultas ao cache em disco da PokéAPI por endpoint e resultado.",
+    ("endpoint", "result"),
+))
+
+
+@dataclass
+class RawEntry:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    fresh: bool
+
+    def validators(self) -> Dict[str, str]:
+        """Cabeçalhos condicionais para revalidar a entrada expirada."""
+        out = {}
+        if self.headers.get("etag"):
+            out["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            out["If-Modified-Since"] = self.headers["last-modified"]
+        return out
+
+
+class RawCache:
+    def __init__(self, directory: str, max_bytes: int, ttls: Dict[str, float], default_ttl: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self._size: Optional[int] = None  # estimativa do processo; recalculada ao despejar
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest[2:] + ".gz")
+
+    def _ttl(self, url: str) -> float:
+        return float(self.ttls.get(endpoint_template(url)[1], self.default_ttl))
+
+    def lookup(self, url: str) -> Optional[RawEntry]:
+        endpoint = endpoint_template(url)[1]
+        path = self._path(url)
+        try:
+            with gzip.open(path, "rb") as fh:
+                meta = json.loads(fh.readline())
+                body = fh.read()
+        except (OSError, ValueError, EOFError):
+            RAW_CACHE_REQUESTS.inc((endpoint, "miss"))
+            return None
+        fresh = time.time() - meta["stored_at"] < self._ttl(url)
+        RAW_CACHE_REQUESTS.inc((endpoint, "hit" if fresh else "expired"))
+        if fresh:
+            self._touch(path)
+        return RawEntry(meta["status"], meta["headers"], body, meta["stored_at"], fresh)
+
+    def store(self, url: str, status: int, headers, body: bytes) -> None:
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {k: headers[k] for k in _KEPT_HEADERS if headers.get(k)},
+            "stored_at": time.time(),
+        }
+        path = self._path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                previous = os.path.getsize(path)
+            except OSError:
+                previous = 0
+            with gzip.open(tmp, "wb", compresslevel=6) as fh:
+                fh.write(json.dumps(meta).encode("utf-8") + b"\n")
+                fh.write(body)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)  # escrita atômica: leitores nunca veem arquivo pela metade
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self._grow(size - previous)
+
+    def revalidated(self, url: str, entry: RawEntry) -> RawEntry:
+        """304 do upstream: regrava a entrada com novo instante e devolve-a como válida."""
+        self.store(url, entry.status, entry.headers, entry.body)
+        RAW_CACHE_REQUESTS.inc((endpoint_template(url)[1], "revalidated"))
+        return RawEntry(entry.status, entry.headers, entry.body, time.time(), True)
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path)  # mtime = último uso, base do despejo LRU
+        except OSError:
+            pass
+
+    def _files(self):
+        for root, _dirs, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".gz"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield st.st_mtime, st.st_size, path
+
+    def _grow(self, delta: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _m, size, _p in self._files())
+            else:
+                self._size += delta
+            if self._size <= self.max_bytes:
+                return
+            # outros workers também gravam: o despejo parte de uma varredura real do diretório
+            files = sorted(self._files())
+            total = sum(size for _m, size, _p in files)
+            target = int(self.max_bytes * 0.9)
+            for _mtime, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+            self._size = total
+
+    def stats(self) -> Dict:
+        with self._lock:
+            size = self._size
+        return {"directory": self.directory, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            for _m, _s, path in list(self._files()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+
+_CACHE: Optional[RawCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _hosts():
+    hosts = getattr(settings, "POKEAPI_RAW_CACHE_HOSTS", None)
+    if hosts:
+        return set(hosts)
+    return {urlsplit(getattr(settings, "POKEAPI_BASE", "https://pokeapi.co/api/v2")).hostname}
+
+
+def raw_cache() -> Optional[RawCache]:
+    """Cache do processo, ou None com POKEAPI_RAW_CACHE=0."""
+    global _CACHE
+    if not getattr(settings, "POKEAPI_RAW_CACHE", True):
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = RawCache(
+                    directory=getattr(settings, "POKEAPI_RAW_CACHE_DIR", os.path.join(".cache", "pokeapi")),
+                    max_bytes=int(float(getattr(settings, "POKEAPI_RAW_CACHE_MAX_MB", 512)) * 1024 * 1024),
+                    ttls={**_DEFAULT_TTLS, **(getattr(settings, "POKEAPI_RAW_CACHE_TTLS", None) or {})},
+                    default_ttl=float(getattr(settings, "POKEAPI_RAW_CACHE_TTL_SECONDS", 86400)),
+                )
+    return _CACHE
+
+
+def cacheable(method: str, url: str) -> Optional[RawCache]:
+    """Cache a usar para esta chamada (só GET em host da PokéAPI), ou None."""
+    if method != "GET":
+        return None
+    cache = raw_cache()
+    if cache is None or urlsplit(url).hostname not in _hosts():
+        return None
+    return cache
+
+
+def reset_raw_cache() -> None:
+    """Esquece a instância (ex.: após mudar settings); os arquivos ficam."""
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
+
+
+def raw_cache_stats() -> Optional[Dict]:
+    cache = raw_cache()
+    return cache.stats() if cache is not None else None
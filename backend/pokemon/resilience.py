@@ -0,0 +1,248 @@
+"""Proteções por host upstream (PokéAPI, MyMemory, LibreTranslate).
+
+Cada host tem, no processo:
+
+- um limitador token bucket (POKEMON_UPSTREAM_RATE req/s ou o valor do host em
+  POKEMON_UPSTREAM_HOST_RATES, com rajada de POKEMON_UPSTREAM_BURST_SECONDS segundos de taxa):
+  se a espera por uma ficha passar de POKEMON_UPSTREAM_MAX_WAIT_SECONDS a chamada é recusada;
+- um disjuntor: com taxa de erro (5xx, 429, timeout, falha de conexão) acima de
+  POKEMON_BREAKER_ERROR_RATE nas últimas POKEMON_BREAKER_WINDOW chamadas, o host fica "aberto"
+  por POKEMON_BREAKER_COOLDOWN_SECONDS e as chamadas falham na hora, sem ir à rede; depois
+  uma única chamada de teste decide se fecha de novo;
+- um timeout adaptativo (estimativa de RTT como no TCP: média + 4 desvios, limitada entre
+  POKEMON_UPSTREAM_TIMEOUT_MIN_SECONDS e o timeout pedido pelo chamador).
+
+As recusas levantam ``UpstreamUnavailable`` (subclasse de ``requests.ConnectionError``), então os
+caminhos que já tratam falha de rede (fallbacks de nome, tradução, itens de página) degradam
+normalmente. Os ganchos ficam no adapter da sessão compartilhada e no transporte do httpx.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+
+class UpstreamUnavailable(requests.ConnectionError):
+    """Chamada recusada localmente (disjuntor aberto ou limite de taxa), sem tocar a rede."""
+
+
+def is_failure_status(code: int) -> bool:
+    return code == 429 or code >= 500
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = max(float(rate), 0.001)
+        self.burst = max(float(burst), 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Reserva uma ficha: segundos a esperar antes da chamada, ou None se passar de ``max_wait``."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            wait = (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self._tokens -= 1  # fichas negativas = fila de quem já reservou
+            return wait
+
+    def available(self) -> float:
+        with self._lock:
+            return round(min(self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate), 2)
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, window: int, min_calls: int, error_rate: float, cooldown: float):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.opened = 0
+        self._outcomes: deque = deque(maxlen=max(window, 1))
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True  # uma única chamada de teste por vez
+                return True
+            return False
+
+    def cancel(self) -> None:
+        """Libera a vaga de teste de uma chamada autorizada que não chegou a sair."""
+        with self._lock:
+            self._probing = False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            if self.state == self.OPEN:
+                return
+            self._outcomes.append(ok)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened += 1
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": self.state,
+                "opened": self.opened,
+                "window_error_rate": round(self._outcomes.count(False) / calls, 3) if calls else 0.0,
+            }
+
+
+class AdaptiveTimeout:
+    """Timeout de leitura a partir da latência observada (RFC 6298: SRTT + 4·RTTVAR)."""
+
+    MIN_SAMPLES = 5
+
+    def __init__(self, minimum: float):
+        self.minimum = minimum
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.samples += 1
+            if self.srtt is None:
+                self.srtt, self.rttvar = seconds, seconds / 2
+            else:
+                self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - seconds)
+                self.srtt = 0.875 * self.srtt + 0.125 * seconds
+
+    def timeout(self, requested: Optional[float]) -> Optional[float]:
+        if not isinstance(requested, (int, float)):
+            return requested  # tupla (connect, read) ou None: respeita o chamador
+        with self._lock:
+            if self.srtt is None or self.samples < self.MIN_SAMPLES:
+                return requested
+            return min(float(requested), max(self.minimum, self.srtt + 4 * self.rttvar))
+
+
+class HostGuard:
+    def __init__(self, host: str):
+        rates = getattr(settings, "POKEMON_UPSTREAM_HOST_RATES", {}) or {}
+        rate = rates.get(host, getattr(settings, "POKEMON_UPSTREAM_RATE", 20.0))
+        self.host = host
+        self.max_wait = float(getattr(settings, "POKEMON_UPSTREAM_MAX_WAIT_SECONDS", 2.0))
+        self.bucket = TokenBucket(rate, rate * float(getattr(settings, "POKEMON_UPSTREAM_BURST_SECONDS", 2.0)))
+        self.breaker = CircuitBreaker(
+            window=int(getattr(settings, "POKEMON_BREAKER_WINDOW", 20)),
+            min_calls=int(getattr(settings, "POKEMON_BREAKER_MIN_CALLS", 10)),
+            error_rate=float(getattr(settings, "POKEMON_BREAKER_ERROR_RATE", 0.5)),
+            cooldown=float(getattr(settings, "POKEMON_BREAKER_COOLDOWN_SECONDS", 30)),
+        )
+        self.latency = AdaptiveTimeout(float(getattr(settings, "POKEMON_UPSTREAM_TIMEOUT_MIN_SECONDS", 2.0)))
+        self._lock = threading.Lock()
+        self.counts = {"calls": 0, "failures": 0, "timeouts": 0, "rejected_open": 0, "rejected_rate": 0}
+
+    def _incr(self, field: str) -> None:
+        with self._lock:
+            self.counts[field] += 1
+
+    def _admit(self) -> float:
+        if not self.breaker.allow():
+            self._incr("rejected_open")
+            raise UpstreamUnavailable(f"{self.host}: circuito aberto")
+        wait = self.bucket.reserve(self.max_wait)
+        if wait is None:
+            self.breaker.cancel()
+            self._incr("rejected_rate")
+            raise UpstreamUnavailable(f"{self.host}: limite de taxa excedido")
+        return wait
+
+    def before(self) -> None:
+        wait = self._admit()
+        if wait:
+            time.sleep(wait)
+
+    async def abefore(self) -> None:
+        wait = self._admit()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def timeout_for(self, requested):
+        return self.latency.timeout(requested)
+
+    def after(self, elapsed: float, ok: bool, timed_out: bool = False) -> None:
+        self._incr("calls")
+        if not ok:
+            self._incr("failures")
+        if timed_out:
+            self._incr("timeouts")
+        else:
+            self.latency.observe(elapsed)  # um timeout só diz que passou do limite, não a latência
+        self.breaker.record(ok)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            data = dict(self.counts)
+        data["breaker"] = self.breaker.snapshot()
+        data["tokens"] = self.bucket.available()
+        data["latency_ms"] = round(self.latency.srtt * 1000, 1) if self.latency.srtt is not None else None
+        timeout = self.latency.timeout(20.0)
+        data["read_timeout_s"] = round(timeout, 2)
+        return data
+
+
+_GUARDS: Dict[str, HostGuard] = {}
+_GUARDS_LOCK = threading.Lock()
+
+
+def guard_for(url: str) -> Optional[HostGuard]:
+    """Guarda do host da URL (criada na primeira chamada); None com POKEMON_UPSTREAM_GUARD=0."""
+    if not getattr(settings, "POKEMON_UPSTREAM_GUARD", True):
+        return None
+    host = urlsplit(str(url)).hostname or ""
+    guard = _GUARDS.get(host)
+    if guard is None:
+        with _GUARDS_LOCK:
+            guard = _GUARDS.setdefault(host, HostGuard(host))
+    return guard
+
+
+def upstream_stats() -> Dict[str, Dict]:
+    """Estado por host: chamadas, falhas, recusas, disjuntor, fichas, latência e timeout atual."""
+    return {host: guard.snapshot() for host, guard in sorted(_GUARDS.items())}
+
+
+def reset_upstream_guards() -> None:
+    with _GUARDS_LOCK:
+        _GUARDS.clear()
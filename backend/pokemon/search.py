@@ -0,0 +1,155 @@
+"""Índice de busca em memória sobre os nomes do catálogo (inglês e pt-BR).
+
+Os nomes são normalizados (minúsculas, sem acentos e sem pontuação) e indexados de duas formas:
+
+- lista ordenada de termos (nome completo e cada palavra) para prefixo com ``bisect`` —
+  autocomplete em microssegundos;
+- trigramas (como no pg_trgm) para busca aproximada, tolerante a erros de digitação,
+  ordenada pela similaridade de Jaccard entre os conjuntos de trigramas.
+
+O índice é montado a partir de PokemonCatalogo na primeira busca do processo e remontado
+quando o catálogo muda (ver ``catalog_index``).
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .catalog_index import catalog_derived
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """``"Mr. Mime"`` → ``"mr mime"``; ``"Pokémon"`` → ``"pokemon"``."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped.lower()).strip()
+
+
+def trigrams(folded: str) -> Set[str]:
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Índice imutável; ``entries`` são ``(codigo, [nomes], geracao, item)``."""
+
+    def __init__(self, entries: Iterable[Tuple[int, List[str], Optional[int], Dict]]):
+        self.items: Dict[int, Dict] = {}
+        self.generation: Dict[int, Optional[int]] = {}
+        self._names: List[Tuple[str, int]] = []  # (nome normalizado, codigo)
+        self._raw_names: List[Tuple[str, int]] = []  # (nome em minúsculas, codigo)
+        terms: List[Tuple[str, int, int]] = []  # (termo, codigo, id do nome)
+        self._postings: Dict[str, List[int]] = {}
+        self._name_grams: List[int] = []
+
+        for codigo, names, geracao, item in entries:
+            self.items[codigo] = item
+            self.generation[codigo] = geracao
+            self._raw_names.extend((n.lower(), codigo) for n in dict.fromkeys(names) if n)
+            for folded in dict.fromkeys(fold(n) for n in names if n):
+                if not folded:
+                    continue
+                name_id = len(self._names)
+                self._names.append((folded, codigo))
+                terms.append((folded, codigo, name_id))
+                for word in folded.split()[1:]:
+                    terms.append((word, codigo, name_id))
+                grams = trigrams(folded)
+                self._name_grams.append(len(grams))
+                for g in grams:
+                    self._postings.setdefault(g, []).append(name_id)
+        terms.sort()
+        self._terms = terms
+        self._keys = [t[0] for t in terms]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def prefix(self, folded: str) -> Dict[int, Tuple[float, int]]:
+        """``{codigo: (score, id do nome)}`` dos nomes com alguma palavra começando por ``folded``."""
+        out: Dict[int, Tuple[float, int]] = {}
+        i = bisect_left(self._keys, folded)
+        while i < len(self._keys) and self._keys[i].startswith(folded):
+            term, codigo, name_id = self._terms[i]
+            full = self._names[name_id][0]
+            if full == folded:
+                score = 1.0
+            elif term == full:
+                score = 0.9 + 0.1 * len(folded) / len(full)  # prefixo do nome
+            else:
+                score = 0.8 + 0.1 * len(folded) / len(term)  # prefixo de outra palavra
+            if score > out.get(codigo, (0.0, 0))[0]:
+                out[codigo] = (score, name_id)
+            i += 1
+        return out
+
+    def fuzzy(self, folded: str, threshold: float) -> Dict[int, Tuple[float, int]]:
+        """Similaridade de trigramas (Jaccard) de cada nome com ``folded``, acima do limiar."""
+        grams = trigrams(folded)
+        common: Dict[int, int] = {}
+        for g in grams:
+            for name_id in self._postings.get(g, ()):
+                common[name_id] = common.get(name_id, 0) + 1
+        out: Dict[int, Tuple[float, int]] = {}
+        for name_id, shared in common.items():
+            score = shared / (len(grams) + self._name_grams[name_id] - shared)
+            if score < threshold:
+                continue
+            codigo = self._names[name_id][1]
+            score *= 0.85  # prefixos exatos vêm antes de aproximações equivalentes
+            if score > out.get(codigo, (0.0, 0))[0]:
+                out[codigo] = (score, name_id)
+        return out
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        fuzzy: bool = True,
+        generation: Optional[int] = None,
+        threshold: float = 0.3,
+    ) -> List[Dict]:
+        """Resultados ordenados por relevância: itens do catálogo com ``score`` e ``match``."""
+        folded = fold(query)
+        if not folded:
+            return []
+        hits = self.prefix(folded)
+        if fuzzy and len(folded) >= 3:
+            for codigo, hit in self.fuzzy(folded, threshold).items():
+                if hit[0] > hits.get(codigo, (0.0, 0))[0]:
+                    hits[codigo] = hit
+        if generation:
+            hits = {c: h for c, h in hits.items() if self.generation.get(c) == generation}
+        ranked = sorted(hits.items(), key=lambda kv: (-kv[1][0], kv[0]))[:limit]
+        return [
+            dict(self.items[codigo], score=round(score, 4), match=self._names[name_id][0])
+            for codigo, (score, name_id) in ranked
+        ]
+
+    def matching(self, query: str) -> List[int]:
+        """Códigos cujo nome (inglês ou pt-BR) contém ``query``, ignorando acentos e pontuação.
+
+        Consulta só de pontuação (``"-"``, ``"."``) compara o texto cru: casa ``mr-mime``,
+        ``ho-oh``, mas não todo o catálogo; vazia não casa nada.
+        """
+        folded = fold(query)
+        if not folded:
+            raw = (query or "").strip().lower()
+            return sorted({codigo for name, codigo in self._raw_names if raw in name}) if raw else []
+        return sorted({codigo for name, codigo in self._names if folded in name})
+
+
+def _build_index(rows) -> SearchIndex:
+    from .services import _catalog_item
+
+    return SearchIndex((row.codigo, [row.nome, row.nomeLocalizado], row.geracao, _catalog_item(row)) for row in rows)
+
+
+_INDEX = catalog_derived(_build_index)
+
+
+def search_index() -> Optional[SearchIndex]:
+    """Índice do processo (None sem catálogo); ver ``catalog_index.CatalogDerived``."""
+    return _INDEX.get()
@@ -1,12 +1,27 @@
 from typing import Dict, Optional, List, Tuple
 import os
+import threading
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from django.db import transaction
+from django.db import transaction, connection
+from django.db.models import Q
 from django.utils import timezone
 from datetime import timedelta
-from .models import TipoPokemon, PokemonCache
+from .models import (
+    TipoPokemon, EfetividadeTipo, PokemonCache, PokemonCatalogo, PokemonDetalheCache, CadeiaEvolutiva,
+)
+from .cache import tiered_cache
+from .http_client import get_session
+from .fanout import fan_out
+from .jobs import enqueue, jobs_enabled
+from .catalog_index import catalog_complete, invalidate_catalog_indexes, record_catalog_total
+from .datasource import data_source
+from .pagination import decode_cursor, encode_cursor, filters_hash
+from .search import search_index
+from .stats_index import stats_index
+from .singleflight import group
+from .staleness import mark_stale, stale_if_error
+from .translation import translate_many, translate_to_pt, untranslated_scope
+from .type_chart import ALL_TYPES, chart_from_relations, invalidate_type_chart, load_type_chart
 from django.conf import settings
 
 POKEAPI_BASE = getattr(settings, 'POKEAPI_BASE', 'https://pokeapi.co/api/v2')
@@ -15,17 +30,21 @@ POKE_IMG_BASE = os.getenv(
     "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork",
 )
 
-# Cache simples para traduções (sessão do processo)
-_TRANSLATE_CACHE: Dict[Tuple[str, str], str] = {}
+def _http_session() -> requests.Session:
+    # sessão compartilhada do processo (pool + keep-alive), ver http_client.py
+    return get_session()
 
 
-def _http_session() -> requests.Session:
-    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
-    s = requests.Session()
-    s.mount("https://", adapter)
-    s.mount("http://", adapter)
-    return s
+# grupos de coalescência: chamadas idênticas em andamento compartilham uma única busca
+_DETAIL_FLIGHT = group("detail")
+_FULL_FLIGHT = group("full")
+_LIST_FLIGHT = group("list")
+
+
+def _get_json(s: requests.Session, url: str, verify: bool, timeout: float = 20) -> Dict:
+    """Documento da PokéAPI pela fonte configurada (POKEMON_DATA_SOURCE, ver datasource.py);
+    ``s`` é a sessão usada pela fonte HTTP."""
+    return data_source().get_json(url, verify=verify, timeout=timeout, session=s)
 
 
 def _cache_ttl_seconds() -> int:
@@ -36,7 +55,7 @@ def _cache_ttl_seconds() -> int:
 
 
 def sync_types_from_pokeapi(verify_override: Optional[bool] = None) -> Dict[str, int]:
-    """Fetch types from PokéAPI and upsert into TipoPokemon. Idempotent.
+    """Fetch types from PokéAPI and upsert into TipoPokemon, plus the 18×18 EfetividadeTipo chart. Idempotent.
 
     Parameters:
     - verify_override: if provided, force SSL verification on/off; else uses env POKEAPI_VERIFY_SSL.
@@ -48,11 +67,15 @@ def sync_types_from_pokeapi(verify_override: Optional[bool] = None) -> Dict[str,
 
     url = f"{POKEAPI_BASE}/type"
     session = _http_session()
-    resp = session.get(url, timeout=20, verify=verify_ssl)
-    resp.raise_for_status()
-    data = resp.json()
+    data = _get_json(session, url, verify_ssl)
     tipos = [item["name"] for item in data.get("results", [])]
 
+    # damage_relations dos 18 tipos de batalha, para a tabela de efetividade
+    def _relations(nome: str) -> Dict:
+        return _get_json(session, f"{POKEAPI_BASE}/type/{nome}", verify_ssl).get("damage_relations", {})
+    relations = dict(zip(ALL_TYPES, fan_out(_relations, ALL_TYPES, fallback=lambda _t: None)))
+    chart = None if any(r is None for r in relations.values()) else chart_from_relations(relations)
+
     created, existing = 0, 0
     with transaction.atomic():
         for nome in tipos:
@@ -61,7 +84,25 @@ def sync_types_from_pokeapi(verify_override: Optional[bool] = None) -> Dict[str,
                 created += 1
             else:
                 existing += 1
-    return {"created": created, "existing": existing, "count": len(tipos)}
+        matrix = 0
+        if chart is not None:
+            by_name = {t.descricao: t for t in TipoPokemon.objects.filter(descricao__in=ALL_TYPES)}
+            for t in ALL_TYPES:
+                if t not in by_name:
+                    by_name[t] = TipoPokemon.objects.create(descricao=t)
+            cells = [
+                EfetividadeTipo(atacante=by_name[a], defensor=by_name[d], multiplicador=chart.factor(a, d))
+                for a in ALL_TYPES for d in ALL_TYPES
+            ]
+            EfetividadeTipo.objects.bulk_create(
+                cells,
+                update_conflicts=True,
+                unique_fields=["atacante", "defensor"],
+                update_fields=["multiplicador"],
+            )
+            matrix = len(cells)
+    invalidate_type_chart()
+    return {"created": created, "existing": existing, "count": len(tipos), "matrix": matrix}
 
 
 def _verify_flag(override: Optional[bool] = None) -> bool:
@@ -115,36 +156,16 @@ def image_url_for(codigo: int) -> str:
     return f"{POKE_IMG_BASE}/{codigo}.png"
 
 
-def get_pokemon_detail(codigo: int, verify_override: Optional[bool] = None) -> Dict:
-    # cache first with TTL
-    cached = PokemonCache.objects.filter(codigo=codigo).first()
-    if cached:
-        ttl = _cache_ttl_seconds()
-        if cached.dtAtualizado and timezone.now() - cached.dtAtualizado < timedelta(seconds=ttl):
-            payload = {"codigo": cached.codigo, "nome": cached.nome, "tipos": cached.tipos, "imagemUrl": cached.imagemUrl}
-            # stats podem não existir em versões antigas do cache; nesse caso, siga sem stats
-            try:
-                extra = getattr(cached, "extra", None)
-                if isinstance(extra, dict) and "stats" in extra:
-                    payload["stats"] = extra["stats"]
-            except Exception:
-                pass
-            # Se ainda não há stats, busque do endpoint uma vez (não persiste stats no cache para evitar migração)
-            if "stats" not in payload:
-                verify = _verify_flag(verify_override)
-                s = _http_session()
-                r = s.get(f"{POKEAPI_BASE}/pokemon/{codigo}", timeout=20, verify=verify)
-                r.raise_for_status()
-                raw = r.json()
-                norm = normalize_pokemon_detail(raw)
-                payload["stats"] = norm.get("stats", {})
-            return payload
+# Versão do formato gravado em PokemonCache.payload; linhas anteriores são regravadas na leitura
+CACHE_SCHEMA_VERSION = 1
 
-    verify = _verify_flag(verify_override)
-    s = _http_session()
-    resp = s.get(f"{POKEAPI_BASE}/pokemon/{codigo}", timeout=20, verify=verify)
-    resp.raise_for_status()
-    norm = normalize_pokemon_detail(resp.json())
+
+def _cache_is_fresh(dt) -> bool:
+    return bool(dt) and timezone.now() - dt < timedelta(seconds=_cache_ttl_seconds())
+
+
+def _fetch_detail_remote(s: requests.Session, codigo: int, verify: bool) -> Dict:
+    norm = normalize_pokemon_detail(_get_json(s, f"{POKEAPI_BASE}/pokemon/{codigo}", verify))
     # Nome localizado (melhorar UX em PT)
     try:
         loc_name = _localized_species_name(s, codigo, verify, fallback=norm.get("nome"))
@@ -152,17 +173,190 @@ def get_pokemon_detail(codigo: int, verify_override: Optional[bool] = None) -> D
             norm["nome"] = loc_name
     except Exception:
         pass
+    return norm
+
 
+# camadas memória → cache do Django na frente das tabelas (ver cache.TieredCache)
+_DETAIL_CACHE = tiered_cache("detalhe")
+_FULL_CACHE = tiered_cache("completo")
+_CHAIN_CACHE = tiered_cache("cadeia")
+# últimas páginas da listagem sem catálogo, só para stale-if-error (sem TTL na memória)
+_LIST_CACHE = tiered_cache(
+    "listagem", memory_ttl=0, shared_ttl=getattr(settings, "POKEMON_STALE_LIST_SECONDS", 7 * 86400)
+)
+
+
+def _store_detail(norm: Dict) -> None:
+    _DETAIL_CACHE.set(norm["codigo"], norm)
     PokemonCache.objects.update_or_create(
         codigo=norm["codigo"],
         defaults={
             "nome": norm["nome"],
             "tipos": norm["tipos"],
             "imagemUrl": norm["imagemUrl"],
-            # guarde stats num campo extra JSON se existir no model
+            "payload": norm,
+            "versao": CACHE_SCHEMA_VERSION,
         },
     )
-    return norm
+
+
+def _details_from_table(codigos: List[int]) -> Dict[int, Dict]:
+    # só linhas válidas: formato atual e dentro do TTL
+    return {
+        row.codigo: row.payload
+        for row in PokemonCache.objects.filter(codigo__in=codigos)
+        if row.versao >= CACHE_SCHEMA_VERSION and _cache_is_fresh(row.dtAtualizado)
+    }
+
+
+def _cached_detail(codigo: int) -> Optional[Dict]:
+    cached = _DETAIL_CACHE.get(codigo, loader=lambda c: _details_from_table([c]).get(c))
+    return dict(cached) if cached is not None else None
+
+
+def get_pokemon_detail(codigo: int, verify_override: Optional[bool] = None) -> Dict:
+    # cache first with TTL; um acerto com o payload atual não faz nenhuma chamada de rede
+    cached = _cached_detail(codigo)
+    if cached is not None:
+        return cached
+
+    # ausente, expirado ou gravado num formato antigo (sem stats): busca e atualiza a linha
+    verify = _verify_flag(verify_override)
+
+    def _load() -> Dict:
+        norm = _fetch_detail_remote(_http_session(), codigo, verify)
+        _store_detail(norm)
+        return norm
+    try:
+        return _DETAIL_FLIGHT.do(codigo, _load, recheck=lambda: _cached_detail(codigo))
+    except Exception:
+        stale = _stale_details([codigo]).get(codigo)
+        if stale is None:
+            raise
+        return stale
+
+
+def get_pokemon_details(codigos: List[int], verify_override: Optional[bool] = None) -> Dict[int, Dict]:
+    """Detalhe de vários pokémon de uma vez: uma consulta ao PokemonCache (``codigo__in``),
+    busca paralela dos ausentes/expirados e uma única gravação em lote.
+
+    Devolve ``{codigo: detalhe}``; se a busca falhar, vale a linha expirada (``stale``), e
+    códigos sem nenhuma linha ficam de fora.
+    """
+    unique = list(dict.fromkeys(codigos))
+    found = {c: dict(p) for c, p in _DETAIL_CACHE.get_many(unique, loader=_details_from_table).items()}
+
+    misses = [c for c in unique if c not in found]
+    if misses:
+        verify = _verify_flag(verify_override)
+        s = _http_session()
+        fetched = fan_out(lambda c: _fetch_detail_remote(s, c, verify), misses, fallback=lambda _c: None)
+        rows = []
+        for codigo, norm in zip(misses, fetched):
+            if not norm:
+                continue
+            found[codigo] = norm
+            rows.append(PokemonCache(
+                codigo=norm["codigo"], nome=norm["nome"], tipos=norm["tipos"], imagemUrl=norm["imagemUrl"],
+                payload=norm, versao=CACHE_SCHEMA_VERSION,
+            ))
+        if rows:
+            _DETAIL_CACHE.set_many({row.codigo: row.payload for row in rows})
+            PokemonCache.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["codigo"],
+                update_fields=["nome", "tipos", "imagemUrl", "payload", "versao", "dtAtualizado"],
+            )
+        failed = [c for c in misses if c not in found]
+        if failed:
+            found.update(_stale_details(failed))
+    return found
+
+
+# -------- Stale-if-error: linhas expiradas quando a PokéAPI falha (ver staleness.py) --------
+
+def _stale_details(codigos: List[int]) -> Dict[int, Dict]:
+    """Detalhes do PokemonCache de qualquer idade ou versão, marcados como ``stale``."""
+    if not stale_if_error() or not codigos:
+        return {}
+    out = {}
+    for row in PokemonCache.objects.filter(codigo__in=codigos):
+        payload = row.payload or {"codigo": row.codigo, "nome": row.nome, "tipos": row.tipos, "imagemUrl": row.imagemUrl}
+        out[row.codigo] = mark_stale(payload)
+    return out
+
+
+def _stale_chain(chain_id: int) -> Optional[Dict[str, List[Dict]]]:
+    if not stale_if_error():
+        return None
+    row = CadeiaEvolutiva.objects.filter(idCadeia=chain_id).first()
+    return row.payload if row else None
+
+
+def _degraded_full(codigo: int) -> Optional[Dict]:
+    """Detalhe completo mínimo a partir do detalhe em cache (mesmo expirado) e da tabela de
+    tipos local, para quando o completo nunca foi montado e a PokéAPI está fora."""
+    if not stale_if_error():
+        return None
+    detail = _cached_detail(codigo) or _stale_details([codigo]).get(codigo)
+    if detail is None:
+        return None
+    chart = load_type_chart()
+    mult = chart.multipliers(detail.get("tipos") or []) if chart is not None else {"from": {}, "to": {}}
+    return mark_stale({
+        **detail,
+        "descricao": "",
+        "descricaoFonte": None,
+        "descricaoIdioma": None,
+        "categoria": "",
+        "altura_m": None,
+        "peso_kg": None,
+        "habilidades": [],
+        "genero": None,
+        "efetividades": {"defesa": mult.get("from", {}), "ataque": mult.get("to", {})},
+        "multiplicadores": mult,
+        "evolucoes": [],
+        "evolutionEdges": [],
+    })
+
+
+def _stale_page_items(items: List[Dict]) -> List[Dict]:
+    """Troca os itens de página que falharam (sem ``stats``) pelo detalhe expirado, se houver."""
+    failed = [item["codigo"] for item in items if "stats" not in item]
+    stale = _stale_details(failed) if failed else {}
+    if not stale:
+        return items
+    return [
+        mark_stale(dict(item, **{k: stale[item["codigo"]][k] for k in ("tipos", "imagemUrl", "stats") if k in stale[item["codigo"]]}))
+        if item["codigo"] in stale else item
+        for item in items
+    ]
+
+
+def _stale_list(key: Tuple, generation: Optional[int], name: Optional[str], limit: int, offset: int) -> Optional[Tuple[int, List[Dict]]]:
+    """Última página boa da mesma consulta; sem ela (e sem geração, que o PokemonCache não
+    guarda), as linhas do PokemonCache filtradas por nome."""
+    if not stale_if_error():
+        return None
+    page = _LIST_CACHE.get(key)
+    if page is not None:
+        total, items = page
+        return total, [mark_stale(item) for item in items]
+    if generation:
+        return None
+    qs = PokemonCache.objects.all()
+    if name:
+        qs = qs.filter(nome__icontains=name)
+    total = qs.count()
+    if not total:
+        return None
+    rows = qs.order_by("codigo")[offset: offset + limit]
+    return total, [
+        mark_stale({"codigo": r.codigo, "nome": r.nome, "tipos": r.tipos, "imagemUrl": r.imagemUrl,
+                    **({"stats": r.payload["stats"]} if "stats" in (r.payload or {}) else {})})
+        for r in rows
+    ]
 
 
 # -------- Composite detail (species, abilities, evolution, multipliers) --------
@@ -194,77 +388,67 @@ def _pick_lang(entries: List[Dict], key_lang: str = "language", key_text: str =
 
 
 def _translate_to_pt(text: str, src_lang: Optional[str] = None) -> str:
-    """Traduz texto dinamicamente para pt-BR usando MyMemory (sem chave).
+    """Traduz texto para pt-BR (cache em memória + TraducaoCache; ver translation.py).
 
     Controlado por env ENABLE_AUTO_TRANSLATE_PT (default=1). Em caso de falha, devolve o original.
     """
-    if not text:
-        return text
-    if os.getenv("ENABLE_AUTO_TRANSLATE_PT", "1") != "1":
-        return text
-    # cache
-    try:
-        key = (text, (src_lang or "").lower())
-        if key in _TRANSLATE_CACHE:
-            return _TRANSLATE_CACHE[key]
-    except Exception:
-        pass
+    return translate_to_pt(text, src_lang)
 
-    try:
-        s = _http_session()
-        # MyMemory exige langpair SRC|DEST com códigos de 2 letras (ou RFC3066)
-        src = (src_lang or "en").split("-")[0]  # ex: pt-BR -> pt
-        if src.lower() not in {"en","es","pt","fr","de","it","ja","zh","ko"}:
-            src = "en"
-        r = s.get(
-            "https://api.mymemory.translated.net/get",
-            params={"q": text, "langpair": f"{src}|pt-BR"},
-            timeout=10,
-            verify=True,
-        )
-        r.raise_for_status()
-        data = r.json() or {}
-        t = (data.get("responseData") or {}).get("translatedText")
-        if isinstance(t, str) and t.strip() and not t.strip().upper().startswith("'AUTO' IS AN INVALID"):
-            out = t.strip()
-            _TRANSLATE_CACHE[key] = out
-            return out
-    except Exception:
-        pass
-    # Fallback: LibreTranslate (instância pública)
-    try:
-        s = _http_session()
-        src = (src_lang or "en").split("-")[0]
-        payload = {"q": text, "source": src, "target": "pt"}
-        r = s.post("https://libretranslate.de/translate", json=payload, timeout=10, verify=True)
-        r.raise_for_status()
-        data = r.json() or {}
-        t = data.get("translatedText") or data.get("translated_text")
-        if isinstance(t, str) and t.strip():
-            out = t.strip()
-            _TRANSLATE_CACHE[key] = out
-            return out
-    except Exception:
-        pass
-    return text
+
+def _species_texts(species: Dict) -> Tuple[str, Optional[str], Optional[str], str]:
+    """(descrição, versão da descrição, idioma da descrição, categoria) sem tradução."""
+    flavor_entry = _pick_lang_entry(species.get("flavor_text_entries", []), key_lang="language") or {}
+    flavor = (flavor_entry.get("flavor_text") or "").replace("\n"," ").replace("\f"," ").strip()
+    flavor_version = (flavor_entry.get("version") or {}).get("name")
+    flavor_lang = (flavor_entry.get("language") or {}).get("name")
+    genus = _pick_lang(species.get("genera", []), key_lang="language", key_text="genus", default="")
+    return flavor, flavor_version, flavor_lang, genus
+
+
+def _species_translation_items(flavor: str, flavor_lang: Optional[str], genus: str) -> List[Tuple[str, Optional[str]]]:
+    items: List[Tuple[str, Optional[str]]] = []
+    if flavor and flavor_lang not in ("pt-BR", "pt"):
+        items.append((flavor, flavor_lang))
+    if genus:
+        # genus costuma vir localizado, mas garantimos
+        items.append((genus, flavor_lang or "en"))
+    return items
+
+
+def _ability_texts(ad: Dict, fallback_name: str) -> Tuple[str, str]:
+    """(nome localizado, efeito curto sem tradução) de um documento /ability/{nome}."""
+    local_name = fallback_name
+    for pref in ("pt-BR", "pt", "es", "en"):
+        for nm in ad.get("names", []) or []:
+            if (nm.get("language") or {}).get("name") == pref:
+                val = (nm.get("name") or "").strip()
+                if val:
+                    local_name = val
+                    break
+        else:
+            continue
+        break
+    desc = _pick_lang(ad.get("effect_entries", []), key_lang="language", key_text="short_effect", default="")
+    return local_name, desc
+
+
+def _localized_name_from_species(sp: Dict, fallback: Optional[str] = None) -> str:
+    # Tenta entrada em pt-BR/pt
+    for pref in ("pt-BR", "pt", "es", "en"):
+        for nm in sp.get("names", []) or []:
+            if (nm.get("language") or {}).get("name") == pref:
+                val = (nm.get("name") or "").strip()
+                if val:
+                    return val
+    # fallback ao campo padrão
+    return fallback or sp.get("name") or ""
 
 
 def _localized_species_name(session: requests.Session, codigo: int, verify: bool, fallback: Optional[str] = None) -> str:
     """Obtém o nome da espécie em pt-BR/pt se disponível; senão devolve fallback/en."""
     try:
-        rs = session.get(f"{POKEAPI_BASE}/pokemon-species/{codigo}", timeout=20, verify=verify)
-        rs.raise_for_status()
-        sp = rs.json()
-        # Tenta entrada em pt-BR/pt
-        for pref in ("pt-BR", "pt", "es", "en"):
-            for nm in sp.get("names", []) or []:
-                if (nm.get("language") or {}).get("name") == pref:
-                    val = (nm.get("name") or "").strip()
-                    if val:
-                        return val
-        # fallback ao campo padrão
-        fb = fallback or sp.get("name") or ""
-        return fb
+        sp = _get_json(session, f"{POKEAPI_BASE}/pokemon-species/{codigo}", verify)
+        return _localized_name_from_species(sp, fallback)
     except Exception:
         return fallback or ""
 
@@ -277,69 +461,98 @@ def _species_id_from_url(url: str) -> Optional[int]:
 
 
 def _compute_type_multipliers(session: requests.Session, types: List[str], verify: bool) -> Dict[str, Dict[str, float]]:
-    """Compute offensive (to) and defensive (from) multipliers for all 18 types."""
-    all_types = [
-        "normal","fire","water","electric","grass","ice","fighting","poison","ground","flying",
-        "psychic","bug","rock","ghost","dragon","dark","steel","fairy"
-    ]
-    # init 1.0
-    def_mult = {t: 1.0 for t in all_types}
-    off_mult = {t: 1.0 for t in all_types}
-    # defensive: for each pokemon type, multiply by relations ..._from
+    """Compute offensive (to) and defensive (from) multipliers for all 18 types.
+
+    Usa a tabela local (EfetividadeTipo) quando sincronizada; senão consulta /type/{t}.
+    """
+    chart = load_type_chart()
+    if chart is not None:
+        return chart.multipliers(types)
+    relations: List[Dict] = []
     for t in types or []:
         try:
-            r = session.get(f"{POKEAPI_BASE}/type/{t}", timeout=20, verify=verify)
-            r.raise_for_status()
-            rel = r.json().get("damage_relations", {})
-            for it in rel.get("double_damage_from", []):
-                n = it.get("name");
-                if n in def_mult: def_mult[n] *= 2.0
-            for it in rel.get("half_damage_from", []):
-                n = it.get("name");
-                if n in def_mult: def_mult[n] *= 0.5
-            for it in rel.get("no_damage_from", []):
-                n = it.get("name");
-                if n in def_mult: def_mult[n] *= 0.0
-            # offensive baseline: how this type hits others; later we combine if two types exist we can pick max
-            for it in rel.get("double_damage_to", []):
-                n = it.get("name");
-                if n in off_mult: off_mult[n] = max(off_mult[n], 2.0)
-            for it in rel.get("half_damage_to", []):
-                n = it.get("name");
-                if n in off_mult: off_mult[n] = min(off_mult[n], 0.5)
-            for it in rel.get("no_damage_to", []):
-                n = it.get("name");
-                if n in off_mult: off_mult[n] = 0.0
+            relations.append(_get_json(session, f"{POKEAPI_BASE}/type/{t}", verify).get("damage_relations", {}))
         except Exception:
             continue
+    return _fold_type_relations(relations)
+
+
+def _fold_type_relations(relations: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """Combina os damage_relations de /type/{t} dos tipos do pokémon em multiplicadores."""
+    # init 1.0
+    def_mult = {t: 1.0 for t in ALL_TYPES}
+    off_mult = {t: 1.0 for t in ALL_TYPES}
+    # defensive: for each pokemon type, multiply by relations ..._from
+    for rel in relations:
+        for it in rel.get("double_damage_from", []):
+            n = it.get("name");
+            if n in def_mult: def_mult[n] *= 2.0
+        for it in rel.get("half_damage_from", []):
+            n = it.get("name");
+            if n in def_mult: def_mult[n] *= 0.5
+        for it in rel.get("no_damage_from", []):
+            n = it.get("name");
+            if n in def_mult: def_mult[n] *= 0.0
+        # offensive baseline: how this type hits others; later we combine if two types exist we can pick max
+        for it in rel.get("double_damage_to", []):
+            n = it.get("name");
+            if n in off_mult: off_mult[n] = max(off_mult[n], 2.0)
+        for it in rel.get("half_damage_to", []):
+            n = it.get("name");
+            if n in off_mult: off_mult[n] = min(off_mult[n], 0.5)
+        for it in rel.get("no_damage_to", []):
+            n = it.get("name");
+            if n in off_mult: off_mult[n] = 0.0
     return {"from": def_mult, "to": off_mult}
 
 
-def get_pokemon_full(codigo: int, verify_override: Optional[bool] = None) -> Dict:
-    verify = _verify_flag(verify_override)
-    s = _http_session()
+def _full_abilities(raw: Dict, ability_docs: Dict[str, Optional[Dict]]) -> List[Dict]:
+    """Habilidades (nome local, oculta, efeito ainda sem tradução) a partir dos documentos /ability."""
+    abilities: List[Dict] = []
+    for ab in raw.get("abilities", []):
+        ab_name = ab.get("ability", {}).get("name")
+        if not ab_name:
+            continue
+        local_name, desc = ab_name, ""
+        ad = ability_docs.get(ab_name)
+        if ad:
+            local_name, desc = _ability_texts(ad, ab_name)
+        abilities.append({
+            "nome": local_name,
+            "isHidden": bool(ab.get("is_hidden")),
+            "efeito": desc,
+        })
+    return abilities
 
-    # base pokemon
-    rp = s.get(f"{POKEAPI_BASE}/pokemon/{codigo}", timeout=20, verify=verify)
-    rp.raise_for_status()
-    raw = rp.json()
-    norm = normalize_pokemon_detail(raw)
 
-    # species for flavor text, category, gender ratio, evolution chain
-    rs = s.get(f"{POKEAPI_BASE}/pokemon-species/{codigo}", timeout=20, verify=verify)
-    rs.raise_for_status()
-    species = rs.json()
-    flavor_entry = _pick_lang_entry(species.get("flavor_text_entries", []), key_lang="language") or {}
-    flavor = (flavor_entry.get("flavor_text") or "").replace("\n"," ").replace("\f"," ").strip()
-    flavor_version = (flavor_entry.get("version") or {}).get("name")
-    flavor_lang = (flavor_entry.get("language") or {}).get("name")
-    genus = _pick_lang(species.get("genera", []), key_lang="language", key_text="genus", default="")
+def _full_translation_items(species: Dict, abilities: List[Dict]) -> List[Tuple[str, Optional[str]]]:
+    # descrição, categoria e efeitos das habilidades numa única passada
+    # (os effect_entries geralmente vêm em en; se vierem em outro, deixe a API decidir)
+    flavor, _version, flavor_lang, genus = _species_texts(species)
+    species_items = _species_translation_items(flavor, flavor_lang, genus)
+    return species_items + [(ab["efeito"], None) for ab in abilities if ab["efeito"]]
+
+
+def _assemble_full(
+    raw: Dict,
+    species: Dict,
+    abilities: List[Dict],
+    translated: List[str],
+    mult: Dict[str, Dict[str, float]],
+    evo: Dict[str, List[Dict]],
+) -> Dict:
+    """Monta o detalhe completo a partir dos documentos já obtidos (sem E/S).
+    ``translated`` segue a ordem de ``_full_translation_items``."""
+    norm = normalize_pokemon_detail(raw)
+    flavor, flavor_version, flavor_lang, genus = _species_texts(species)
+    out = iter(translated)
     # Traduções para pt-BR
     if flavor and flavor_lang not in ("pt-BR", "pt"):
-        flavor = _translate_to_pt(flavor, src_lang=flavor_lang)
+        flavor = next(out)
     if genus:
-        # genus costuma vir localizado, mas garantimos
-        genus = _translate_to_pt(genus, src_lang=flavor_lang or "en")
+        genus = next(out)
+    abilities = [dict(ab, efeito=next(out)) if ab["efeito"] else ab for ab in abilities]
+
     gender_rate = species.get("gender_rate", -1)
     if gender_rate == -1:
         genders = {"male": False, "female": False, "genderless": True}
@@ -349,119 +562,10 @@ def get_pokemon_full(codigo: int, verify_override: Optional[bool] = None) -> Dic
         genders = {"male": male_chance > 0, "female": female_chance > 0, "genderless": False,
                    "maleRate": round(male_chance, 3), "femaleRate": round(female_chance, 3)}
 
-    # abilities with descriptions
-    abilities: List[Dict] = []
-    for ab in raw.get("abilities", []):
-        ab_name = ab.get("ability", {}).get("name")
-        if not ab_name:
-            continue
-        try:
-            ra = s.get(f"{POKEAPI_BASE}/ability/{ab_name}", timeout=20, verify=verify)
-            ra.raise_for_status()
-            ad = ra.json()
-            # nome local
-            local_name = ab_name
-            for pref in ("pt-BR", "pt", "es", "en"):
-                for nm in ad.get("names", []) or []:
-                    if (nm.get("language") or {}).get("name") == pref:
-                        val = (nm.get("name") or "").strip()
-                        if val:
-                            local_name = val
-                            break
-                else:
-                    continue
-                break
-            desc = _pick_lang(ad.get("effect_entries", []), key_lang="language", key_text="short_effect", default="")
-            if desc:
-                # os effect_entries geralmente vêm em en; se vierem em outro, deixe a API decidir
-                desc = _translate_to_pt(desc, src_lang=None)
-        except Exception:
-            desc = ""
-        abilities.append({
-            "nome": local_name,
-            "isHidden": bool(ab.get("is_hidden")),
-            "efeito": desc,
-        })
-
     # height/weight conversions
     height_m = (raw.get("height") or 0) / 10.0
     weight_kg = (raw.get("weight") or 0) / 10.0
 
-    # type multipliers
-    mult = _compute_type_multipliers(s, norm.get("tipos", []), verify)
-
-    # evolution chain
-    evo_list: List[Dict] = []
-    evo_edges: List[Dict] = []
-    try:
-        evo_url = species.get("evolution_chain", {}).get("url")
-        if evo_url:
-            re = s.get(evo_url, timeout=20, verify=verify)
-            re.raise_for_status()
-            chain = re.json().get("chain", {})
-            def walk(node, prev_id=None):
-                sp = node.get("species", {})
-                name = sp.get("name")
-                sid = _species_id_from_url(sp.get("url"))
-                if sid:
-                    evo_detail = (node.get("evolution_details") or [{}])[0]
-                    # extract rich conditions
-                    cond = {
-                        "minLevel": evo_detail.get("min_level"),
-                        "trigger": (evo_detail.get("trigger") or {}).get("name"),
-                        "item": (evo_detail.get("item") or {}).get("name"),
-                        "heldItem": (evo_detail.get("held_item") or {}).get("name"),
-                        "timeOfDay": evo_detail.get("time_of_day"),
-                        "knownMoveType": (evo_detail.get("known_move_type") or {}).get("name"),
-                        "knownMove": (evo_detail.get("known_move") or {}).get("name"),
-                        "location": (evo_detail.get("location") or {}).get("name"),
-                        "minHappiness": evo_detail.get("min_happiness"),
-                        "minAffection": evo_detail.get("min_affection"),
-                        "minBeauty": evo_detail.get("min_beauty"),
-                        "needsRain": bool(evo_detail.get("needs_overworld_rain")),
-                        "relativeStats": evo_detail.get("relative_physical_stats"),
-                        "gender": evo_detail.get("gender"),
-                        "tradeSpecies": (evo_detail.get("trade_species") or {}).get("name"),
-                        "turnUpsideDown": bool(evo_detail.get("turn_upside_down")),
-                    }
-                    local_name = _localized_species_name(s, sid, verify, fallback=name)
-                    # try to fetch types for child species to compose badges
-                    child_types: List[str] = []
-                    try:
-                        rd_child = s.get(f"{POKEAPI_BASE}/pokemon/{sid}", timeout=10, verify=verify)
-                        rd_child.raise_for_status()
-                        child_types = [t.get("type", {}).get("name") for t in (rd_child.json().get("types", []) or [])]
-                    except Exception:
-                        child_types = []
-                    evo_list.append({
-                        "codigo": sid,
-                        "nome": local_name or name,
-                        "minLevel": cond["minLevel"],
-                        "trigger": cond["trigger"],
-                        "imagemUrl": image_url_for(sid),
-                        "detalhes": cond,
-                    })
-                    # Build edge from previous node to this node (skip for root)
-                    if prev_id is not None:
-                        evo_edges.append({
-                            "from": int(prev_id),
-                            "to": int(sid),
-                            **cond,
-                            "trigger": cond.get("trigger"),
-                            "detalhes": cond,
-                            "toData": {
-                                "codigo": int(sid),
-                                "nome": local_name or name,
-                                "imagemUrl": image_url_for(sid),
-                                "tipos": child_types,
-                            },
-                        })
-                for nxt in node.get("evolves_to", []) or []:
-                    walk(nxt, sid)
-            walk(chain)
-    except Exception:
-        pass
-
     result = {
         **norm,
         "descricao": flavor,
@@ -475,61 +579,677 @@ def get_pokemon_full(codigo: int, verify_override: Optional[bool] = None) -> Dic
         # Compatibilidade com frontend: fornecer efetividades com mesmo conteúdo
         "efetividades": {"defesa": mult.get("from", {}), "ataque": mult.get("to", {})},
         "multiplicadores": mult,  # { from: {type:factor}, to: {type:factor} }
-        "evolucoes": evo_list,
-        "evolutionEdges": evo_edges,
+        "evolucoes": evo.get("evolucoes", []),
+        "evolutionEdges": evo.get("evolutionEdges", []),
     }
     return result
 
 
+def _build_pokemon_full(codigo: int, verify: bool) -> Dict:
+    """Monta o detalhe completo consultando a PokéAPI (sem cache)."""
+    s = _http_session()
+
+    # base pokemon
+    raw = _get_json(s, f"{POKEAPI_BASE}/pokemon/{codigo}", verify)
+
+    # species for flavor text, category, gender ratio, evolution chain
+    species = _get_json(s, f"{POKEAPI_BASE}/pokemon-species/{codigo}", verify)
+
+    # abilities with descriptions
+    def _ability_doc(ab_name: str) -> Dict:
+        return _get_json(s, f"{POKEAPI_BASE}/ability/{ab_name}", verify)
+    ab_names = [n for n in (ab.get("ability", {}).get("name") for ab in raw.get("abilities", [])) if n]
+    ability_docs = dict(zip(ab_names, fan_out(_ability_doc, ab_names, fallback=lambda _n: None)))
+    abilities = _full_abilities(raw, ability_docs)
+    # textos sem tradução ainda: o job ``traduzir`` reconstrói este detalhe quando terminar
+    translated = translate_many(
+        _full_translation_items(species, abilities), followup=_full_refresh_job(codigo, _full_cache_lang())
+    )
+
+    # type multipliers
+    mult = _compute_type_multipliers(s, [t["type"]["name"] for t in raw.get("types", [])], verify)
+
+    # evolution chain (cache por cadeia, compartilhado pela família)
+    evo: Dict[str, List[Dict]] = {}
+    try:
+        evo_url = species.get("evolution_chain", {}).get("url")
+        if evo_url:
+            evo = get_evolution_chain(evo_url, verify)
+    except Exception:
+        pass
+
+    return _assemble_full(raw, species, abilities, translated, mult, evo)
+
+
+# -------- Cadeias evolutivas (por id da cadeia, nós buscados em paralelo) --------
+
+def _evolution_conditions(evo_detail: Dict) -> Dict:
+    # extract rich conditions
+    return {
+        "minLevel": evo_detail.get("min_level"),
+        "trigger": (evo_detail.get("trigger") or {}).get("name"),
+        "item": (evo_detail.get("item") or {}).get("name"),
+        "heldItem": (evo_detail.get("held_item") or {}).get("name"),
+        "timeOfDay": evo_detail.get("time_of_day"),
+        "knownMoveType": (evo_detail.get("known_move_type") or {}).get("name"),
+        "knownMove": (evo_detail.get("known_move") or {}).get("name"),
+        "location": (evo_detail.get("location") or {}).get("name"),
+        "minHappiness": evo_detail.get("min_happiness"),
+        "minAffection": evo_detail.get("min_affection"),
+        "minBeauty": evo_detail.get("min_beauty"),
+        "needsRain": bool(evo_detail.get("needs_overworld_rain")),
+        "relativeStats": evo_detail.get("relative_physical_stats"),
+        "gender": evo_detail.get("gender"),
+        "tradeSpecies": (evo_detail.get("trade_species") or {}).get("name"),
+        "turnUpsideDown": bool(evo_detail.get("turn_upside_down")),
+    }
+
+
+def _chain_nodes(chain: Dict) -> List[Tuple[int, str, Optional[int], Dict]]:
+    """Percorre a árvore (pré-ordem) devolvendo (id, nome, id do anterior, condições)."""
+    nodes: List[Tuple[int, str, Optional[int], Dict]] = []
+
+    def walk(node, prev_id=None):
+        sp = node.get("species", {})
+        sid = _species_id_from_url(sp.get("url"))
+        if sid:
+            evo_detail = (node.get("evolution_details") or [{}])[0]
+            nodes.append((sid, sp.get("name"), prev_id, _evolution_conditions(evo_detail)))
+        for nxt in node.get("evolves_to", []) or []:
+            walk(nxt, sid)
+
+    walk(chain)
+    return nodes
+
+
+def _catalog_node_info(sids: List[int]) -> Dict[int, Tuple[str, List[str]]]:
+    return {
+        row.codigo: (row.nomeLocalizado or row.nome, list(row.tipos or []))
+        for row in PokemonCatalogo.objects.filter(codigo__in=sids)
+    }
+
+
+def _evolution_node_info(s: requests.Session, nodes: List[Tuple], verify: bool) -> Dict[int, Tuple[str, List[str]]]:
+    """Nome localizado e tipos de cada espécie da cadeia: do catálogo local quando possível,
+    senão da PokéAPI com buscas paralelas (uma vez por espécie)."""
+    names = {sid: name for sid, name, _prev, _cond in nodes}
+    info = _catalog_node_info(list(names))
+
+    def _fetch(sid: int) -> Tuple[str, List[str]]:
+        local_name = _localized_species_name(s, sid, verify, fallback=names[sid])
+        # try to fetch types for child species to compose badges
+        child_types: List[str] = []
+        try:
+            child = _get_json(s, f"{POKEAPI_BASE}/pokemon/{sid}", verify, timeout=10)
+            child_types = [t.get("type", {}).get("name") for t in (child.get("types", []) or [])]
+        except Exception:
+            child_types = []
+        return local_name, child_types
+
+    missing = [sid for sid in names if sid not in info]
+    fetched = fan_out(_fetch, missing, fallback=lambda sid: (names[sid], []))
+    info.update(zip(missing, fetched))
+    return info
+
+
+def _assemble_evolution(nodes: List[Tuple], info: Dict[int, Tuple[str, List[str]]]) -> Dict[str, List[Dict]]:
+    evo_list: List[Dict] = []
+    evo_edges: List[Dict] = []
+    for sid, name, prev_id, cond in nodes:
+        local_name, child_types = info.get(sid, (name, []))
+        evo_list.append({
+            "codigo": sid,
+            "nome": local_name or name,
+            "minLevel": cond["minLevel"],
+            "trigger": cond["trigger"],
+            "imagemUrl": image_url_for(sid),
+            "detalhes": cond,
+        })
+        # Build edge from previous node to this node (skip for root)
+        if prev_id is not None:
+            evo_edges.append({
+                "from": int(prev_id),
+                "to": int(sid),
+                **cond,
+                "trigger": cond.get("trigger"),
+                "detalhes": cond,
+                "toData": {
+                    "codigo": int(sid),
+                    "nome": local_name or name,
+                    "imagemUrl": image_url_for(sid),
+                    "tipos": child_types,
+                },
+            })
+    return {"evolucoes": evo_list, "evolutionEdges": evo_edges}
+
+
+def _chain_from_table(chain_id: int) -> Optional[Dict[str, List[Dict]]]:
+    row = CadeiaEvolutiva.objects.filter(idCadeia=chain_id).first()
+    if row and _cache_is_fresh(row.dtAtualizado):
+        return row.payload
+    return None
+
+
+def _cached_chain(chain_id: int) -> Optional[Dict[str, List[Dict]]]:
+    return _CHAIN_CACHE.get(chain_id, loader=_chain_from_table)
+
+
+def _store_chain(chain_id: int, payload: Dict[str, List[Dict]]) -> None:
+    _CHAIN_CACHE.set(chain_id, payload)
+    CadeiaEvolutiva.objects.update_or_create(idCadeia=chain_id, defaults={"payload": payload})
+
+
+def get_evolution_chain(evo_url: str, verify: bool) -> Dict[str, List[Dict]]:
+    """``{"evolucoes", "evolutionEdges"}`` de uma cadeia, com cache em CadeiaEvolutiva (TTL do cache)."""
+    chain_id = _species_id_from_url(evo_url)
+    if chain_id is None:
+        raise ValueError(f"URL de cadeia evolutiva inválida: {evo_url}")
+
+    cached = _cached_chain(chain_id)
+    if cached is not None:
+        return cached
+
+    with _key_lock(("chain", chain_id)):
+        cached = _cached_chain(chain_id)
+        if cached is not None:
+            return cached
+        s = _http_session()
+        try:
+            nodes = _chain_nodes(_get_json(s, evo_url, verify).get("chain", {}))
+        except Exception:
+            stale = _stale_chain(chain_id)
+            if stale is None:
+                raise
+            return stale
+        payload = _assemble_evolution(nodes, _evolution_node_info(s, nodes, verify))
+        _store_chain(chain_id, payload)
+        return payload
+
+
+# -------- Cache do detalhe completo (TTL + stale-while-revalidate) --------
+
+# Locks por chave: evitam que requisições simultâneas para o mesmo pokémon montem o detalhe em paralelo
+_KEY_LOCKS: Dict[Tuple, threading.Lock] = {}
+_KEY_LOCKS_GUARD = threading.Lock()
+
+
+def _key_lock(key: Tuple) -> threading.Lock:
+    with _KEY_LOCKS_GUARD:
+        lock = _KEY_LOCKS.get(key)
+        if lock is None:
+            lock = _KEY_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _full_cache_ttl_seconds() -> int:
+    return int(getattr(settings, "POKEMON_FULL_CACHE_TTL_SECONDS", 86400))
+
+
+def _full_untranslated_ttl_seconds() -> int:
+    return int(getattr(settings, "POKEMON_FULL_UNTRANSLATED_TTL_SECONDS", 600))
+
+
+def _full_cache_lang() -> str:
+    # o conteúdo muda conforme a tradução automática está ligada ou não
+    return "pt-BR" if os.getenv("ENABLE_AUTO_TRANSLATE_PT", "1") == "1" else "orig"
+
+
+def _run_in_background(fn) -> None:
+    def _target():
+        try:
+            fn()
+        finally:
+            connection.close()
+    threading.Thread(target=_target, daemon=True, name="pokemon-full-refresh").start()
+
+
+def _store_full(codigo: int, lang: str, result: Dict, pendentes: int = 0) -> None:
+    # nas camadas rápidas vai junto o instante da gravação, para o TTL/refresh continuar valendo
+    _FULL_CACHE.set((codigo, lang), (result, timezone.now().timestamp(), pendentes))
+    PokemonDetalheCache.objects.update_or_create(
+        codigo=codigo, idioma=lang, defaults={"payload": result, "textosPendentes": pendentes}
+    )
+
+
+def _build_and_store_full(codigo: int, lang: str, verify: bool) -> Dict:
+    with untranslated_scope() as untranslated:
+        result = _build_pokemon_full(codigo, verify)
+    _store_full(codigo, lang, result, untranslated[0])
+    return result
+
+
+def _full_from_table(key: Tuple[int, str]) -> Optional[Tuple[Dict, float, int]]:
+    row = PokemonDetalheCache.objects.filter(codigo=key[0], idioma=key[1]).first()
+    return (row.payload, row.dtAtualizado.timestamp(), row.textosPendentes) if row else None
+
+
+def full_expired(stored_at: float, pendentes: int = 0) -> bool:
+    """Entrada montada com textos sem tradução vale só POKEMON_FULL_UNTRANSLATED_TTL_SECONDS."""
+    ttl = _full_cache_ttl_seconds()
+    if pendentes:
+        ttl = min(ttl, _full_untranslated_ttl_seconds())
+    return timezone.now().timestamp() - stored_at >= ttl
+
+
+def _full_cache_lookup(codigo: int, lang: str) -> Optional[Tuple[Dict, bool]]:
+    """``(payload, expirado)`` da entrada em cache, ou None se não existir."""
+    entry = _FULL_CACHE.get((codigo, lang), loader=_full_from_table)
+    if entry is None:
+        return None
+    # entradas gravadas antes de ``pendentes`` existir (cache compartilhado) têm só 2 campos
+    payload, stored_at, *rest = entry
+    return payload, full_expired(stored_at, rest[0] if rest else 0)
+
+
+def expire_full(codigos: List[int], lang: Optional[str] = None) -> int:
+    """Marca como expirado o detalhe completo de ``codigos``: a próxima leitura ainda serve a
+    versão atual, mas já dispara a reconstrução (ex.: depois de ``pretranslate_catalog``)."""
+    lang = lang or _full_cache_lang()
+    old = timezone.now() - timedelta(seconds=_full_cache_ttl_seconds() + 1)
+    # update() não passa pelo auto_now de dtAtualizado
+    expired = PokemonDetalheCache.objects.filter(codigo__in=codigos, idioma=lang).update(dtAtualizado=old)
+    for codigo in codigos:
+        _FULL_CACHE.delete((codigo, lang))
+    return expired
+
+
+def _refresh_full(codigo: int, lang: str, verify: bool, lock: threading.Lock) -> None:
+    try:
+        _build_and_store_full(codigo, lang, verify)
+    except Exception:
+        pass  # mantém a versão expirada; a próxima leitura tenta de novo
+    finally:
+        lock.release()
+
+
+def _full_refresh_job(codigo: int, lang: str) -> Dict:
+    # mesma chave por (codigo, idioma): vários pedidos de refresh viram um job só
+    return {"tipo": "atualizar_completo", "parametros": {"codigo": codigo}, "chave": f"completo:{codigo}:{lang}"}
+
+
+def refresh_pokemon_full(codigo: int, verify_override: Optional[bool] = None) -> Dict:
+    """Reconstrói e grava o detalhe completo, ignorando o cache (job ``atualizar_completo``)."""
+    return _build_and_store_full(codigo, _full_cache_lang(), _verify_flag(verify_override))
+
+
+def _schedule_full_refresh(codigo: int, lang: str, verify: bool) -> None:
+    if jobs_enabled():
+        enqueue(**_full_refresh_job(codigo, lang))
+        return
+    # só agenda se ninguém já estiver reconstruindo esta chave
+    lock = _key_lock(("full", codigo, lang))
+    if lock.acquire(blocking=False):
+        _run_in_background(lambda: _refresh_full(codigo, lang, verify, lock))
+
+
+def get_pokemon_full(codigo: int, verify_override: Optional[bool] = None) -> Dict:
+    """Detalhe completo com cache persistente por (codigo, idioma).
+
+    - Entrada válida (POKEMON_FULL_CACHE_TTL_SECONDS; POKEMON_FULL_UNTRANSLATED_TTL_SECONDS se
+      saiu com textos sem tradução): devolvida direto.
+    - Entrada expirada: devolvida imediatamente e reconstruída em segundo plano.
+    - Ausente: montada uma única vez por chave (single-flight); requisições simultâneas
+      esperam e recebem o mesmo resultado. Se a PokéAPI falhar, sai a versão mínima a partir
+      do detalhe em cache (``_degraded_full``), marcada como ``stale``.
+    """
+    verify = _verify_flag(verify_override)
+    lang = _full_cache_lang()
+
+    hit = _full_cache_lookup(codigo, lang)
+    if hit:
+        payload, expired = hit
+        if expired:
+            _schedule_full_refresh(codigo, lang, verify)
+        return payload
+
+    def _recheck() -> Optional[Dict]:
+        hit = _full_cache_lookup(codigo, lang)
+        return hit[0] if hit else None
+
+    def _load() -> Dict:
+        # não reconstrói junto com um refresh em segundo plano da mesma chave
+        with _key_lock(("full", codigo, lang)):
+            found = _recheck()
+            if found is not None:
+                return found
+            return _build_and_store_full(codigo, lang, verify)
+    try:
+        return _FULL_FLIGHT.do((codigo, lang), _load, recheck=_recheck)
+    except Exception:
+        degraded = _degraded_full(codigo)
+        if degraded is None:
+            raise
+        return degraded
+
+
+def _page_item(s: requests.Session, codigo: int, fallback_name: str, verify: bool) -> Dict:
+    """Monta o item de listagem (tipos, imagem, stats e nome localizado) de um pokémon."""
+    try:
+        norm = normalize_pokemon_detail(_get_json(s, f"{POKEAPI_BASE}/pokemon/{codigo}", verify))
+        return {
+            "codigo": codigo,
+            "nome": _localized_species_name(s, codigo, verify, fallback=fallback_name),
+            "tipos": norm.get("tipos", []),
+            "imagemUrl": norm.get("imagemUrl") or image_url_for(codigo),
+            "stats": norm.get("stats", {}),
+        }
+    except Exception:
+        return {
+            "codigo": codigo,
+            "nome": _localized_species_name(s, codigo, verify, fallback=fallback_name),
+            "tipos": [],
+            "imagemUrl": image_url_for(codigo),
+        }
+
+
+def _fallback_page_item(entry: Tuple[int, str]) -> Dict:
+    codigo, nome = entry
+    return {"codigo": codigo, "nome": nome, "tipos": [], "imagemUrl": image_url_for(codigo)}
+
+
+def _fetch_page_items(s: requests.Session, page_slice: List[Tuple[int, str]], verify: bool) -> List[Dict]:
+    """Busca os detalhes dos itens da página em paralelo (limite POKEAPI_FETCH_CONCURRENCY,
+    prazo POKEAPI_FETCH_DEADLINE_SECONDS), mantendo a ordem de ``page_slice``."""
+    return fan_out(
+        lambda entry: _page_item(s, entry[0], entry[1], verify),
+        page_slice,
+        fallback=_fallback_page_item,
+    )
+
+
+# -------- Catálogo local de espécies (listagem sem chamadas à PokéAPI) --------
+
+def _catalog_entry(s: requests.Session, codigo: int, nome: str, geracao: int, verify: bool) -> Dict:
+    norm = normalize_pokemon_detail(_get_json(s, f"{POKEAPI_BASE}/pokemon/{codigo}", verify))
+    return {
+        "codigo": codigo,
+        "nome": nome,
+        "nomeLocalizado": _localized_species_name(s, codigo, verify, fallback=nome),
+        "geracao": geracao,
+        "tipos": norm.get("tipos", []),
+        "imagemUrl": norm.get("imagemUrl") or image_url_for(codigo),
+        "stats": norm.get("stats", {}),
+    }
+
+
+def sync_catalog_from_pokeapi(
+    refresh: bool = False,
+    verify_override: Optional[bool] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, int]:
+    """Constrói/atualiza PokemonCatalogo a partir de /generation (todas as gerações).
+
+    Sem ``refresh`` busca detalhes apenas das espécies ausentes no catálogo; com ``refresh``
+    rebusca todas. Espécies cuja busca falha são ignoradas e entram numa próxima execução.
+    """
+    verify = _verify_flag(verify_override)
+    s = _http_session()
+
+    data = _get_json(s, f"{POKEAPI_BASE}/generation?limit=100", verify)
+    gen_ids = [g for g in (_species_id_from_url(it.get("url")) for it in data.get("results", [])) if g]
+
+    species: List[Tuple[int, str, int]] = []  # (codigo, nome, geracao)
+    for gen in sorted(gen_ids):
+        for sp in _get_json(s, f"{POKEAPI_BASE}/generation/{gen}", verify).get("pokemon_species", []):
+            codigo = _species_id_from_url(sp.get("url"))
+            if codigo:
+                species.append((codigo, sp.get("name") or "", gen))
+
+    existing = set(PokemonCatalogo.objects.values_list("codigo", flat=True))
+    todo = species if refresh else [sp for sp in species if sp[0] not in existing]
+    entries = fan_out(
+        lambda sp: _catalog_entry(s, sp[0], sp[1], sp[2], verify),
+        todo,
+        fallback=lambda _sp: None,
+        max_workers=concurrency,
+        deadline=max(60.0, len(todo) * 2.0),
+    )
+    rows = [PokemonCatalogo(**e) for e in entries if e]
+    with transaction.atomic():
+        PokemonCatalogo.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["codigo"],
+            update_fields=["nome", "nomeLocalizado", "geracao", "tipos", "imagemUrl", "stats", "dtAtualizado"],
+        )
+        record_catalog_total(len(species))
+    invalidate_catalog_indexes()
+    return {
+        "species": len(species),
+        "updated": len(rows),
+        "failed": len(todo) - len(rows),
+        "count": PokemonCatalogo.objects.count(),
+    }
+
+
+def pretranslate_catalog(
+    codigos: Optional[List[int]] = None,
+    verify_override: Optional[bool] = None,
+    concurrency: Optional[int] = None,
+    chunk_size: int = 100,
+) -> Dict[str, int]:
+    """Traduz offline descrições, categorias e efeitos de habilidades (grava em TraducaoCache).
+
+    Usa os códigos do catálogo local quando ``codigos`` não é informado. Processa em blocos,
+    de modo que uma interrupção preserva o que já foi traduzido. O detalhe completo dos
+    Pokémon processados é expirado (``expire_full``) para ser remontado já traduzido.
+    """
+    verify = _verify_flag(verify_override)
+    s = _http_session()
+    if codigos is None:
+        codigos = list(PokemonCatalogo.objects.order_by("codigo").values_list("codigo", flat=True))
+
+    def _collect(codigo: int) -> Tuple[List[Tuple[str, Optional[str]]], List[str]]:
+        flavor, _version, flavor_lang, genus = _species_texts(_get_json(s, f"{POKEAPI_BASE}/pokemon-species/{codigo}", verify))
+        raw = _get_json(s, f"{POKEAPI_BASE}/pokemon/{codigo}", verify)
+        names = [ab.get("ability", {}).get("name") for ab in raw.get("abilities", [])]
+        return _species_translation_items(flavor, flavor_lang, genus), [n for n in names if n]
+
+    def _ability_desc(ab_name: str) -> str:
+        return _ability_texts(_get_json(s, f"{POKEAPI_BASE}/ability/{ab_name}", verify), ab_name)[1]
+
+    seen_abilities = set()
+    stats = {"pokemon": 0, "abilities": 0, "texts": 0, "failed": 0, "expired": 0}
+    for start in range(0, len(codigos), chunk_size):
+        chunk = codigos[start:start + chunk_size]
+        collected = fan_out(_collect, chunk, fallback=lambda _c: None, max_workers=concurrency, deadline=600)
+        items: List[Tuple[str, Optional[str]]] = []
+        new_abilities: List[str] = []
+        done: List[int] = []
+        for codigo, entry in zip(chunk, collected):
+            if entry is None:
+                stats["failed"] += 1
+                continue
+            texts, names = entry
+            stats["pokemon"] += 1
+            done.append(codigo)
+            items.extend(texts)
+            for n in names:
+                if n not in seen_abilities:
+                    seen_abilities.add(n)
+                    new_abilities.append(n)
+        descs = fan_out(_ability_desc, new_abilities, fallback=lambda _n: "", max_workers=concurrency, deadline=600)
+        items.extend((d, None) for d in descs if d)
+        stats["abilities"] += len(new_abilities)
+        stats["texts"] += len(items)
+        translate_many(items, allow_remote=True)
+        stats["expired"] += expire_full(done)
+    return stats
+
+
+def all_species_ids(verify_override: Optional[bool] = None) -> List[int]:
+    """Códigos de todas as espécies: do catálogo local ou, se vazio, de /pokemon-species."""
+    codigos = list(PokemonCatalogo.objects.order_by("codigo").values_list("codigo", flat=True))
+    if codigos:
+        return codigos
+    verify = _verify_flag(verify_override)
+    data = _get_json(_http_session(), f"{POKEAPI_BASE}/pokemon-species?limit=100000&offset=0", verify)
+    ids = (_species_id_from_url(it.get("url")) for it in data.get("results", []))
+    return sorted(i for i in ids if i)
+
+
+def warm_pokemon(codigo: int, verify_override: Optional[bool] = None) -> None:
+    """Preenche os caches de um pokémon: detalhe (PokemonCache) e detalhe completo, que por sua
+    vez grava nome da espécie, textos traduzidos e a cadeia evolutiva."""
+    get_pokemon_detail(codigo, verify_override=verify_override)
+    get_pokemon_full(codigo, verify_override=verify_override)
+
+
+def _catalog_item(row: PokemonCatalogo) -> Dict:
+    return {
+        "codigo": row.codigo,
+        "nome": row.nomeLocalizado or row.nome,
+        "tipos": row.tipos or [],
+        "imagemUrl": row.imagemUrl or image_url_for(row.codigo),
+        "stats": row.stats or {},
+    }
+
+
+class CatalogUnavailable(Exception):
+    """Filtro/ordenação que só o catálogo local responde, sem catálogo sincronizado."""
+
+
+def has_advanced_filters(filters: Optional[Dict]) -> bool:
+    f = filters or {}
+    return bool(f.get("types") or f.get("ranges") or f.get("order_by", "codigo") != "codigo")
+
+
+def _list_from_catalog(
+    generation: Optional[int], name: Optional[str], limit: int, offset: int, filters: Optional[Dict] = None
+) -> Tuple[int, List[Dict]]:
+    """Listagem resolvida em memória pela tabela colunar do catálogo (ver stats_index).
+
+    ``filters``: ``types`` (lista), ``types_all`` (todos em vez de qualquer um),
+    ``ranges`` (``{stat: (min, max)}``) e ``order_by`` (stat ou codigo, ``-`` = decrescente).
+    """
+    index = stats_index()
+    if index is None:
+        return _list_from_catalog_table(generation, name, limit, offset)
+    f = filters or {}
+    mask = _catalog_mask(index, generation, name, f)
+    return index.page(mask, order_by=f.get("order_by") or "codigo", limit=limit, offset=offset)
+
+
+def _catalog_mask(index, generation: Optional[int], name: Optional[str], f: Dict) -> int:
+    return index.filter(
+        generation=generation,
+        types=f.get("types"),
+        types_all=bool(f.get("types_all")),
+        ranges=f.get("ranges"),
+        codigos=_name_matches(name) if name else None,
+    )
+
+
+def list_by_cursor(
+    generation: Optional[int], name: Optional[str], limit: int, cursor: str, filters: Optional[Dict] = None
+) -> Dict:
+    """Página por cursor (keyset) sobre o catálogo: ``{count, results, next, previous}``.
+
+    ``cursor`` vazio devolve a primeira página; ``next``/``previous`` são tokens opacos
+    (ver pagination.py) ou None. Cada página custa o mesmo, independentemente da profundidade.
+    Levanta ``CatalogUnavailable`` sem catálogo completo e ``InvalidCursor`` para tokens inválidos.
+    """
+    index = stats_index() if catalog_complete() else None
+    if index is None:
+        raise CatalogUnavailable("paginação por cursor exige o catálogo local completo (rode sync_pokemon_catalog)")
+    f = filters or {}
+    order_by = f.get("order_by") or "codigo"
+    fhash = filters_hash(generation, name, f)
+    after = before = None
+    if cursor:
+        direction, key = decode_cursor(cursor, fhash)
+        after, before = (key, None) if direction == "n" else (None, key)
+
+    mask = _catalog_mask(index, generation, name, f)
+    positions, has_prev, has_next = index.seek(mask, order_by, limit, after=after, before=before)
+    return {
+        "count": bin(mask).count("1"),
+        "results": [index.items[i] for i in positions],
+        "next": encode_cursor("n", index.sort_key(positions[-1], order_by), fhash) if positions and has_next else None,
+        "previous": encode_cursor("p", index.sort_key(positions[0], order_by), fhash) if positions and has_prev else None,
+    }
+
+
+def _name_matches(name: str) -> List[int]:
+    index = search_index()
+    if index is not None:
+        return index.matching(name)
+    return list(PokemonCatalogo.objects.filter(
+        Q(nome__icontains=name) | Q(nomeLocalizado__icontains=name)
+    ).values_list("codigo", flat=True))
+
+
+def _list_from_catalog_table(generation: Optional[int], name: Optional[str], limit: int, offset: int) -> Tuple[int, List[Dict]]:
+    qs = PokemonCatalogo.objects.all()
+    if generation:
+        qs = qs.filter(geracao=generation)
+    if name:
+        # índice em memória: ignora acentos/pontuação nos nomes em inglês e pt-BR
+        qs = qs.filter(codigo__in=_name_matches(name))
+    total = qs.count()
+    return total, [_catalog_item(row) for row in qs.order_by("codigo")[offset: offset + limit]]
+
+
 def list_by_generation_and_name(
     generation: Optional[int],
     name: Optional[str],
     limit: int,
     offset: int,
     verify_override: Optional[bool] = None,
+    filters: Optional[Dict] = None,
 ) -> Tuple[int, List[Dict]]:
     """Lista pokémon filtrando por geração e nome (contains), paginado de forma eficiente.
 
     Mudanças importantes:
     - Evita baixar detalhes de todos os pokémon para só depois paginar (o que é muito lento).
     - Coleta apenas a lista base de códigos e nomes (rápido) e aplica filtro/paginação nessa lista.
-    - Busca detalhes APENAS dos itens da página corrente.
+    - Busca detalhes APENAS dos itens da página corrente, em paralelo (ver ``fan_out``).
+    - Com o catálogo local completo (sync_pokemon_catalog sem falhas, ver ``catalog_complete``),
+      tudo é resolvido em memória, inclusive ``filters`` de tipos/stats e ordenação; sem ele,
+      esses filtros levantam ``CatalogUnavailable``.
     """
+    if catalog_complete():
+        return _list_from_catalog(generation, name, limit, offset, filters)
+    if has_advanced_filters(filters):
+        raise CatalogUnavailable("filtros por tipo/stats exigem o catálogo local completo (rode sync_pokemon_catalog)")
+
     verify = _verify_flag(verify_override)
+    key = (generation, (name or "").lower(), limit, offset)
+    try:
+        page = _LIST_FLIGHT.do(key + (verify,), lambda: _list_from_pokeapi(generation, name, limit, offset, verify))
+    except Exception:
+        stale = _stale_list(key, generation, name, limit, offset)
+        if stale is None:
+            raise
+        return stale
+    return _remember_list_page(key, page)
+
+
+def _remember_list_page(key: Tuple, page: Tuple[int, List[Dict]]) -> Tuple[int, List[Dict]]:
+    """Guarda a página vinda da PokéAPI para o stale-if-error e troca itens que falharam."""
+    total, items = page
+    items = _stale_page_items(items)
+    if stale_if_error():
+        _LIST_CACHE.set(key, (total, items))
+    return total, items
+
+
+def _list_from_pokeapi(generation: Optional[int], name: Optional[str], limit: int, offset: int, verify: bool) -> Tuple[int, List[Dict]]:
     s = _http_session()
 
     # Caso mais comum e barato: sem geração e sem filtro de nome -> proxy da paginação do próprio endpoint /pokemon
     if not generation and not name:
-        r = s.get(f"{POKEAPI_BASE}/pokemon?limit={limit}&offset={offset}", timeout=20, verify=verify)
-        r.raise_for_status()
-        data = r.json()
+        data = _get_json(s, f"{POKEAPI_BASE}/pokemon?limit={limit}&offset={offset}", verify)
         results = data.get("results", [])
-        page_items: List[Dict] = []
+        page_slice: List[Tuple[int, str]] = []
         for item in results:
             url = (item.get("url") or "").rstrip("/")
             try:
                 codigo = int(url.split("/")[-1])
             except Exception:
                 continue
-            # buscar detalhe para preencher tipos e stats
-            try:
-                rd = s.get(f"{POKEAPI_BASE}/pokemon/{codigo}", timeout=20, verify=verify)
-                rd.raise_for_status()
-                norm = normalize_pokemon_detail(rd.json())
-                page_items.append({
-                    "codigo": codigo,
-                    "nome": _localized_species_name(s, codigo, verify, fallback=item.get("name") or ""),
-                    "tipos": norm.get("tipos", []),
-                    "imagemUrl": norm.get("imagemUrl") or image_url_for(codigo),
-                    "stats": norm.get("stats", {}),
-                })
-            except Exception:
-                page_items.append({
-                    "codigo": codigo,
-                    "nome": _localized_species_name(s, codigo, verify, fallback=item.get("name") or ""),
-                    "tipos": [],
-                    "imagemUrl": image_url_for(codigo),
-                })
+            page_slice.append((codigo, item.get("name") or ""))
+        page_items = _fetch_page_items(s, page_slice, verify)
         page_items.sort(key=lambda x: x.get("codigo") or 0)
         total = int(data.get("count", len(page_items)))
         return total, page_items
@@ -539,51 +1259,23 @@ def list_by_generation_and_name(
 
     if generation:
         # Resolve species da geração e trabalhe com a lista de nomes primeiro
-        r = s.get(f"{POKEAPI_BASE}/generation/{generation}", timeout=20, verify=verify)
-        r.raise_for_status()
-        species_names = [sp["name"] for sp in r.json().get("pokemon_species", [])]
+        data = _get_json(s, f"{POKEAPI_BASE}/generation/{generation}", verify)
+        species_with_id: List[Tuple[int, str]] = []
+        for sp in data.get("pokemon_species", []):
+            # o id da espécie já vem na URL; não é preciso buscar /pokemon-species/{nome}
+            codigo = _species_id_from_url(sp.get("url"))
+            if codigo:
+                species_with_id.append((codigo, sp.get("name") or ""))
         if name:
             low = name.lower()
-            species_names = [n for n in species_names if low in n.lower()]
-        # Obtenha ID de todas as species para ordenar por código
-        species_with_id: List[Tuple[int, str]] = []
-        for sp_name in species_names:
-            try:
-                rs = s.get(f"{POKEAPI_BASE}/pokemon-species/{sp_name}", timeout=20, verify=verify)
-                rs.raise_for_status()
-                codigo = int(rs.json().get("id"))
-                species_with_id.append((codigo, sp_name))
-            except Exception:
-                continue
+            species_with_id = [(c, n) for (c, n) in species_with_id if low in n.lower()]
         species_with_id.sort(key=lambda x: x[0])
         total = len(species_with_id)
         page_slice = species_with_id[offset: offset + limit]
-        page_items: List[Dict] = []
-        for codigo, sp_name in page_slice:
-            try:
-                rd = s.get(f"{POKEAPI_BASE}/pokemon/{codigo}", timeout=20, verify=verify)
-                rd.raise_for_status()
-                norm = normalize_pokemon_detail(rd.json())
-                page_items.append({
-                    "codigo": codigo,
-                    "nome": _localized_species_name(s, codigo, verify, fallback=sp_name),
-                    "tipos": norm.get("tipos", []),
-                    "imagemUrl": norm.get("imagemUrl") or image_url_for(codigo),
-                    "stats": norm.get("stats", {}),
-                })
-            except Exception:
-                page_items.append({
-                    "codigo": codigo,
-                    "nome": _localized_species_name(s, codigo, verify, fallback=sp_name),
-                    "tipos": [],
-                    "imagemUrl": image_url_for(codigo),
-                })
-        return total, page_items
+        return total, _fetch_page_items(s, page_slice, verify)
     else:
         # Sem geração, mas com filtro de nome: carregue um catálogo razoável e filtre
-        r = s.get(f"{POKEAPI_BASE}/pokemon?limit=1000&offset=0", timeout=20, verify=verify)
-        r.raise_for_status()
-        results = r.json().get("results", [])
+        results = _get_json(s, f"{POKEAPI_BASE}/pokemon?limit=1000&offset=0", verify).get("results", [])
         for item in results:
             url = (item.get("url") or "").rstrip("/")
             try:
@@ -597,24 +1289,4 @@ def list_by_generation_and_name(
         base_list.sort(key=lambda x: x[0])
         total = len(base_list)
         page_slice = base_list[offset: offset + limit]
-        page_items: List[Dict] = []
-        for pk, nm in page_slice:
-            try:
-                rd = s.get(f"{POKEAPI_BASE}/pokemon/{pk}", timeout=20, verify=verify)
-                rd.raise_for_status()
-                norm = normalize_pokemon_detail(rd.json())
-                page_items.append({
-                    "codigo": pk,
-                    "nome": _localized_species_name(s, pk, verify, fallback=nm),
-                    "tipos": norm.get("tipos", []),
-                    "imagemUrl": norm.get("imagemUrl") or image_url_for(pk),
-                    "stats": norm.get("stats", {}),
-                })
-            except Exception:
-                page_items.append({
-                    "codigo": pk,
-                    "nome": _localized_species_name(s, pk, verify, fallback=nm),
-                    "tipos": [],
-                    "imagemUrl": image_url_for(pk),
-                })
-        return total, page_items
+        return total, _fetch_page_items(s, page_slice, verify)
@@ -0,0 +1,174 @@
+"""Coalescência de buscas idênticas em andamento ("single-flight").
+
+Quando várias requisições pedem a mesma coisa ao mesmo tempo (a mesma URL da PokéAPI, o
+mesmo detalhe completo, a mesma página de listagem), só a primeira — a líder — executa a
+busca; as demais esperam e recebem o mesmo resultado (ou a mesma exceção).
+
+Dentro do processo a coordenação é feita com ``threading.Event`` (ou ``asyncio.Future`` no
+caminho assíncrono). Com POKEMON_SINGLEFLIGHT_DISTRIBUTED=1, operações que têm onde reler o
+resultado (``recheck``, ex.: a tabela de cache) também usam um lock entre workers via
+``cache.add`` do Django — o backend de cache precisa ser compartilhado (banco, Redis...).
+"""
+import asyncio
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+def _distributed_enabled() -> bool:
+    return bool(getattr(settings, "POKEMON_SINGLEFLIGHT_DISTRIBUTED", False))
+
+
+def _lock_timeout() -> float:
+    return float(getattr(settings, "POKEMON_SINGLEFLIGHT_LOCK_SECONDS", 30))
+
+
+class SingleFlight:
+    """Grupo de chamadas coalescidas por chave; ``name`` identifica o grupo nas métricas."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, "asyncio.Future"] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.remote_waits = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]] = None) -> Any:
+        """Executa ``fn`` uma única vez por chave entre os chamadores concorrentes.
+
+        ``recheck`` (opcional) relê o resultado gravado por outro worker; só com ele o lock
+        distribuído é usado, pois é a única forma de um worker aproveitar a busca de outro.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_leader(key, fn, recheck)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _run_leader(self, key: Hashable, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]]) -> Any:
+        if recheck is None or not _distributed_enabled():
+            return fn()
+        lock_key = f"pokemon:sf:{self.name}:{key!r}"
+        ttl = _lock_timeout()
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, timeout=ttl):
+            try:
+                return fn()
+            finally:
+                # se a busca passou do TTL, o lock pode já ser de outro worker: só apaga o próprio
+                # (get + delete não é atômico na API de cache; resta a janela entre as duas chamadas)
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+        # outro worker já está buscando: espera o lock sumir e relê o resultado gravado
+        with self._lock:
+            self.remote_waits += 1
+        end = time.monotonic() + ttl
+        delay = 0.05
+        while time.monotonic() < end and cache.get(lock_key) is not None:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        found = recheck()
+        return found if found is not None else fn()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Versão assíncrona (coalescência dentro do event loop corrente)."""
+        loop = asyncio.get_running_loop()
+        akey = (id(loop), key)
+        fut = self._async_calls.get(akey)
+        if fut is not None:
+            with self._lock:
+                self.coalesced += 1
+            return await asyncio.shield(fut)
+        fut = loop.create_future()
+        self._async_calls[akey] = fut
+        with self._lock:
+            self.leaders += 1
+        try:
+            result = await fn()
+            fut.set_result(result)
+            return result
+        except BaseException as exc:
+            fut.set_exception(exc)
+            fut.exception()  # evita aviso de exceção não consumida quando ninguém esperava
+            raise
+        finally:
+            self._async_calls.pop(akey, None)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.leaders + self.coalesced
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "remote_waits": self.remote_waits,
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.leaders = 0
+            self.coalesced = 0
+            self.remote_waits = 0
+
+
+_GROUPS: Dict[str, SingleFlight] = {}
+_GROUPS_LOCK = threading.Lock()
+
+
+def group(name: str) -> SingleFlight:
+    """Devolve (criando se preciso) o grupo de coalescência ``name``."""
+    with _GROUPS_LOCK:
+        sf = _GROUPS.get(name)
+        if sf is None:
+            sf = _GROUPS[name] = SingleFlight(name)
+        return sf
+
+
+def singleflight_stats() -> Dict[str, Dict[str, float]]:
+    with _GROUPS_LOCK:
+        groups = list(_GROUPS.values())
+    return {sf.name: sf.stats() for sf in groups}
+
+
+def reset_singleflight_stats() -> None:
+    with _GROUPS_LOCK:
+        groups = list(_GROUPS.values())
+    for sf in groups:
+        sf.reset_stats()
@@ -0,0 +1,39 @@
+"""Stale-if-error: marcação de dados servidos de cache expirado porque a PokéAPI falhou.
+
+Os serviços devolvem a cópia marcada com ``"stale": true`` (``mark_stale``) e sinalizam a
+requisição atual; ``http_cache.conditional_get`` abre o escopo (``stale_scope``) e, se algo
+foi marcado, troca o Cache-Control e acrescenta ``Warning: 110`` e ``X-Data-Stale: 1``.
+
+O sinal é uma lista mutável guardada num ContextVar: contextos copiados (``sync_to_async``,
+threads que copiam o contexto) enxergam e alteram o mesmo objeto da requisição.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+
+_STALE: ContextVar[Optional[List[bool]]] = ContextVar("pokemon_stale", default=None)
+
+
+def stale_if_error() -> bool:
+    return bool(getattr(settings, "POKEMON_STALE_IF_ERROR", True))
+
+
+def mark_stale(payload: Dict) -> Dict:
+    """Cópia de ``payload`` com ``stale: true``; marca a resposta em andamento (se houver escopo)."""
+    flag = _STALE.get()
+    if flag is not None:
+        flag[0] = True
+    return dict(payload, stale=True)
+
+
+@contextmanager
+def stale_scope() -> Iterator[List[bool]]:
+    """Escopo de uma requisição; ``flag[0]`` fica True se algum dado expirado foi servido."""
+    flag = [False]
+    token = _STALE.set(flag)
+    try:
+        yield flag
+    finally:
+        _STALE.reset(token)
@@ -0,0 +1,189 @@
+"""Tabela colunar de stats/tipos do catálogo para filtros e ordenação da listagem.
+
+Cada linha do catálogo ocupa uma posição fixa (em ordem de código). Os filtros viram máscaras
+de bits (inteiros do Python, uma operação por filtro para as ~1000 linhas):
+
+- tipo: uma máscara por tipo; "qualquer" é OR, "todos" é AND;
+- geração: uma máscara por geração;
+- faixa de stat: para cada stat as posições ficam ordenadas pelo valor, com máscaras
+  acumuladas; ``min <= valor <= max`` vira dois ``bisect`` e um XOR.
+
+A ordenação usa a permutação pré-calculada de cada stat; nada disso consulta a PokéAPI.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .catalog_index import catalog_derived
+from .type_chart import ALL_TYPES
+
+STAT_FIELDS = ["hp", "attack", "defense", "spAttack", "spDefense", "speed", "total"]
+ORDER_FIELDS = ["codigo"] + STAT_FIELDS
+
+
+class StatsIndex:
+    def __init__(self, rows: Sequence[Tuple[int, Optional[int], List[str], Dict[str, int], Dict]]):
+        """``rows``: ``(codigo, geracao, tipos, stats, item)`` em ordem de código."""
+        self.codigos = array("i", (r[0] for r in rows))
+        self.items = [r[4] for r in rows]
+        self.position = {codigo: i for i, codigo in enumerate(self.codigos)}
+        self.all_mask = (1 << len(rows)) - 1
+        self.columns: Dict[str, array] = {
+            f: array("i", (int((r[3] or {}).get(f) or 0) for r in rows)) for f in STAT_FIELDS
+        }
+
+        self.type_masks: Dict[str, int] = {t: 0 for t in ALL_TYPES}
+        self.generation_masks: Dict[int, int] = {}
+        for i, (_codigo, geracao, tipos, _stats, _item) in enumerate(rows):
+            bit = 1 << i
+            for t in tipos or []:
+                self.type_masks[t] = self.type_masks.get(t, 0) | bit
+            if geracao:
+                self.generation_masks[geracao] = self.generation_masks.get(geracao, 0) | bit
+
+        # por stat: posições ordenadas por (valor, código), valores ordenados e máscaras acumuladas
+        self._order: Dict[str, List[int]] = {"codigo": list(range(len(rows)))}
+        self._order_desc: Dict[str, List[int]] = {"codigo": list(range(len(rows) - 1, -1, -1))}
+        self._sorted_values: Dict[str, List[int]] = {}
+        self._cumulative: Dict[str, List[int]] = {}
+        for f, col in self.columns.items():
+            order = sorted(range(len(rows)), key=lambda i: (col[i], i))
+            cumulative = [0]
+            for i in order:
+                cumulative.append(cumulative[-1] | (1 << i))
+            self._order[f] = order
+            # decrescente: empates continuam em ordem crescente de código
+            self._order_desc[f] = sorted(range(len(rows)), key=lambda i: (-col[i], i))
+            self._sorted_values[f] = [col[i] for i in order]
+            self._cumulative[f] = cumulative
+        self._sort_keys: Dict[str, List[Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    def range_mask(self, stat: str, low: Optional[int] = None, high: Optional[int] = None) -> int:
+        values = self._sorted_values[stat]
+        start = bisect_left(values, low) if low is not None else 0
+        end = bisect_right(values, high) if high is not None else len(values)
+        if end <= start:
+            return 0
+        cumulative = self._cumulative[stat]
+        return cumulative[end] ^ cumulative[start]
+
+    def codes_mask(self, codigos: Iterable[int]) -> int:
+        mask = 0
+        for codigo in codigos:
+            i = self.position.get(codigo)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def filter(
+        self,
+        generation: Optional[int] = None,
+        types: Optional[List[str]] = None,
+        types_all: bool = False,
+        ranges: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+        codigos: Optional[Iterable[int]] = None,
+    ) -> int:
+        """Máscara das linhas que atendem a todos os filtros."""
+        mask = self.all_mask
+        if generation:
+            mask &= self.generation_masks.get(generation, 0)
+        if types:
+            type_masks = [self.type_masks.get(t, 0) for t in types]
+            if types_all:
+                for m in type_masks:
+                    mask &= m
+            else:
+                any_mask = 0
+                for m in type_masks:
+                    any_mask |= m
+                mask &= any_mask
+        for stat, (low, high) in (ranges or {}).items():
+            mask &= self.range_mask(stat, low, high)
+        if codigos is not None:
+            mask &= self.codes_mask(codigos)
+        return mask
+
+    def page(self, mask: int, order_by: str = "codigo", limit: int = 20, offset: int = 0) -> Tuple[int, List[Dict]]:
+        """``(total, itens)`` da página, na ordem ``order_by`` (prefixo ``-`` = decrescente)."""
+        descending = order_by.startswith("-")
+        field = order_by.lstrip("-")
+        total = bin(mask).count("1")
+        if not mask or offset >= total:
+            return total, []
+        order = (self._order_desc if descending else self._order)[field]
+        out: List[Dict] = []
+        skipped = 0
+        for i in order:
+            if not (mask >> i) & 1:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            out.append(self.items[i])
+            if len(out) >= limit:
+                break
+        return total, out
+
+    def sort_key(self, i: int, order_by: str) -> Tuple[int, ...]:
+        """Chave de ordenação da posição ``i`` (usa o código, estável entre recargas do índice)."""
+        field = order_by.lstrip("-")
+        sign = -1 if order_by.startswith("-") else 1
+        if field == "codigo":
+            return (sign * self.codigos[i],)
+        return (sign * self.columns[field][i], self.codigos[i])
+
+    def _keys_for(self, order_by: str) -> List[Tuple[int, ...]]:
+        keys = self._sort_keys.get(order_by)
+        if keys is None:
+            order = (self._order_desc if order_by.startswith("-") else self._order)[order_by.lstrip("-")]
+            keys = self._sort_keys[order_by] = [self.sort_key(i, order_by) for i in order]
+        return keys
+
+    def seek(
+        self,
+        mask: int,
+        order_by: str,
+        limit: int,
+        after: Optional[Tuple[int, ...]] = None,
+        before: Optional[Tuple[int, ...]] = None,
+    ) -> Tuple[List[int], bool, bool]:
+        """Paginação por chave (keyset): ``limit`` posições logo após ``after`` (ou antes de
+        ``before``), sem percorrer as páginas anteriores. Devolve ``(posições, há_anteriores,
+        há_seguintes)``; o custo não depende da profundidade da página."""
+        order = (self._order_desc if order_by.startswith("-") else self._order)[order_by.lstrip("-")]
+        keys = self._keys_for(order_by)
+
+        def hits(indices):
+            return (order[j] for j in indices if (mask >> order[j]) & 1)
+
+        if before is not None:
+            end = bisect_left(keys, before)
+            page = list(islice(hits(range(end - 1, -1, -1)), limit + 1))
+            has_prev = len(page) > limit
+            page = page[:limit][::-1]
+            has_next = next(hits(range(end, len(order))), None) is not None
+            return page, has_prev, has_next
+
+        start = bisect_right(keys, after) if after is not None else 0
+        page = list(islice(hits(range(start, len(order))), limit + 1))
+        has_next = len(page) > limit
+        has_prev = next(hits(range(start - 1, -1, -1)), None) is not None
+        return page[:limit], has_prev, has_next
+
+
+def _build_index(rows) -> StatsIndex:
+    from .services import _catalog_item
+
+    return StatsIndex([(row.codigo, row.geracao, row.tipos, row.stats, _catalog_item(row)) for row in rows])
+
+
+_INDEX = catalog_derived(_build_index)
+
+
+def stats_index() -> Optional[StatsIndex]:
+    """Tabela do processo (None sem catálogo); ver ``catalog_index.CatalogDerived``."""
+    return _INDEX.get()
@@ -0,0 +1,39 @@
+"""Tipos de job executados pelo comando ``run_worker`` (ver jobs.py).
+
+Os parâmetros chegam do JSON de ``Tarefa.parametros``; uma exceção faz o job voltar para a
+fila com backoff até esgotar as tentativas.
+"""
+from typing import Dict, List, Optional
+
+from . import services, translation
+from .jobs import enqueue, job
+
+
+@job("traduzir")
+def traduzir(itens: List[List[str]], depois: Optional[Dict] = None) -> None:
+    missing = translation.translate_pending([(text, src) for text, src in itens])
+    if missing:
+        # tradutores fora do ar ou limitando: tenta de novo mais tarde (o que já saiu fica no cache)
+        raise RuntimeError(f"{missing} de {len(itens)} textos continuam sem tradução")
+    if depois:
+        enqueue(depois["tipo"], depois.get("parametros"), chave=depois.get("chave", ""))
+
+
+@job("atualizar_completo")
+def atualizar_completo(codigo: int) -> None:
+    services.refresh_pokemon_full(codigo)
+
+
+@job("aquecer")
+def aquecer(codigo: int) -> None:
+    services.warm_pokemon(codigo)
+
+
+@job("sincronizar_tipos")
+def sincronizar_tipos(verify: Optional[bool] = None) -> None:
+    services.sync_types_from_pokeapi(verify_override=verify)
+
+
+@job("sincronizar_catalogo")
+def sincronizar_catalogo(refresh: bool = False) -> None:
+    services.sync_catalog_from_pokeapi(refresh=refresh)
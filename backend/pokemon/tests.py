@@ -1,10 +1,53 @@
-from django.test import TestCase
+import json
+
+from django.test import TestCase, SimpleTestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from unittest.mock import patch
 
 
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Sessão falsa: responde pelo caminho após /api/v2 e registra as chamadas."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        path = url.split("/api/v2", 1)[-1].rstrip("/")
+        if path in self.routes:
+            return FakeResponse(self.routes[path])
+        return FakeResponse({}, status_code=404)
+
+    post = get
+
+
+def fake_pokemon(codigo, name, tipos, base=50):
+    return {
+        "id": codigo,
+        "name": name,
+        "types": [{"type": {"name": t}} for t in tipos],
+        "sprites": {"front_default": f"img/{codigo}.png"},
+        "stats": [{"stat": {"name": n}, "base_stat": base} for n in
+                  ("hp", "attack", "defense", "special-attack", "special-defense", "speed")],
+    }
+
+
 class PokemonApiTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -41,8 +84,10 @@ class PokemonApiTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.json().get("codigo"), 1)
 
+    @patch("pokemon.views.get_pokemon_details")
     @patch("pokemon.views.get_pokemon_detail")
-    def test_favorites_flow(self, mock_detail):
+    def test_favorites_flow(self, mock_detail, mock_details):
+        mock_details.side_effect = lambda codigos, **kwargs: {c: {"codigo": c, "nome": f"poke{c}", "tipos": ["electric"], "imagemUrl": "img"} for c in codigos}
         mock_detail.side_effect = lambda codigo, **kwargs: {"codigo": int(codigo), "nome": f"poke{codigo}", "tipos": ["electric"], "imagemUrl": "img"}
         # autentica
         self.client.force_authenticate(user=self.user)
@@ -59,8 +104,10 @@ class PokemonApiTests(TestCase):
         g2 = self.client.get("/pokemon/favorites/")
         self.assertEqual(g2.json().get("count"), 0)
 
+    @patch("pokemon.views.get_pokemon_details")
     @patch("pokemon.views.get_pokemon_detail")
-    def test_team_flow_with_limit(self, mock_detail):
+    def test_team_flow_with_limit(self, mock_detail, mock_details):
+        mock_details.side_effect = lambda codigos, **kwargs: {c: {"codigo": c, "nome": f"poke{c}", "tipos": ["normal"], "imagemUrl": "img"} for c in codigos}
         mock_detail.side_effect = lambda codigo, **kwargs: {"codigo": int(codigo), "nome": f"poke{codigo}", "tipos": ["normal"], "imagemUrl": "img"}
         self.client.force_authenticate(user=self.user)
         # adiciona 6
@@ -78,4 +125,1215 @@ class PokemonApiTests(TestCase):
         d = self.client.delete("/pokemon/team/3/")
         self.assertEqual(d.status_code, 204)
         g2 = self.client.get("/pokemon/team/")
-        self.assertEqual(g2.json().get("count"), 5)
\ No newline at end of file
+        self.assertEqual(g2.json().get("count"), 5)
+
+class HttpClientTests(SimpleTestCase):
+    def test_session_is_shared_and_reuses_connections(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import threading
+        from pokemon import services
+        from pokemon.http_client import client_stats, reset_client_stats
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = b'{"ok": true}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            self.assertIs(services._http_session(), services._http_session())
+            reset_client_stats()
+            url = f"http://127.0.0.1:{server.server_address[1]}/x"
+            for _ in range(3):
+                services._http_session().get(url, timeout=5).raise_for_status()
+            stats = client_stats()
+            self.assertEqual(stats["requests"], 3)
+            self.assertEqual(stats["new_connections"], 1)
+            self.assertEqual(stats["pool_hits"], 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class FanOutTests(SimpleTestCase):
+    def test_preserves_order_and_falls_back_per_item(self):
+        import time
+        from pokemon.fanout import fan_out
+
+        def fetch(n):
+            if n == 3:
+                raise ValueError("boom")
+            if n == 5:
+                time.sleep(1.0)
+            time.sleep(0.01 * (6 - n))
+            return {"codigo": n, "tipos": ["x"]}
+
+        out = fan_out(fetch, [1, 2, 3, 4, 5], fallback=lambda n: {"codigo": n, "tipos": []}, max_workers=5, deadline=0.5)
+        self.assertEqual([o["codigo"] for o in out], [1, 2, 3, 4, 5])
+        self.assertEqual(out[0]["tipos"], ["x"])
+        self.assertEqual(out[2]["tipos"], [])  # erro
+        self.assertEqual(out[4]["tipos"], [])  # estourou o prazo
+
+    def test_worker_threads_close_their_db_connection(self):
+        from pokemon.fanout import fan_out
+
+        with patch("pokemon.fanout.connection") as conn:
+            self.assertEqual(fan_out(lambda n: n * 2, [1, 2, 3], fallback=lambda n: None, max_workers=3), [2, 4, 6])
+            self.assertEqual(conn.close.call_count, 3)
+            # o caminho serial roda na thread da requisição: a conexão dela fica aberta
+            self.assertEqual(fan_out(lambda n: n * 2, [1], fallback=lambda n: None, max_workers=1), [2])
+            self.assertEqual(conn.close.call_count, 3)
+
+
+class CatalogTests(TestCase):
+    def test_sync_catalog_and_list_without_upstream(self):
+        from pokemon import services
+        from pokemon.models import PokemonCatalogo
+
+        routes = {
+            "/generation?limit=100": {"results": [{"url": "https://pokeapi.co/api/v2/generation/1/"}]},
+            "/generation/1": {"pokemon_species": [
+                {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon-species/1/"},
+                {"name": "ivysaur", "url": "https://pokeapi.co/api/v2/pokemon-species/2/"},
+            ]},
+            "/pokemon/1": fake_pokemon(1, "bulbasaur", ["grass", "poison"]),
+            "/pokemon/2": fake_pokemon(2, "ivysaur", ["grass", "poison"], base=60),
+            "/pokemon-species/1": {"name": "bulbasaur", "names": [{"language": {"name": "pt-BR"}, "name": "Bulbassauro"}]},
+            "/pokemon-species/2": {"name": "ivysaur", "names": []},
+        }
+        fake = FakeSession(routes)
+        with patch("pokemon.services._http_session", return_value=fake):
+            result = services.sync_catalog_from_pokeapi()
+        self.assertEqual(result["updated"], 2)
+        self.assertEqual(PokemonCatalogo.objects.count(), 2)
+
+        fake.calls.clear()
+        with patch("pokemon.services._http_session", return_value=fake):
+            total, items = services.list_by_generation_and_name(1, "bulbass", limit=10, offset=0)
+        self.assertEqual(fake.calls, [])
+        self.assertEqual(total, 1)
+        self.assertEqual(items[0]["nome"], "Bulbassauro")
+        self.assertEqual(items[0]["tipos"], ["grass", "poison"])
+        self.assertEqual(items[0]["stats"]["total"], 300)
+
+    def test_partial_sync_keeps_listing_from_upstream(self):
+        from pokemon import services
+        from pokemon.catalog_index import catalog_complete
+
+        routes = {
+            "/generation?limit=100": {"results": [{"url": "https://pokeapi.co/api/v2/generation/1/"}]},
+            "/generation/1": {"pokemon_species": [
+                {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon-species/1/"},
+                {"name": "ivysaur", "url": "https://pokeapi.co/api/v2/pokemon-species/2/"},
+            ]},
+            "/pokemon/1": fake_pokemon(1, "bulbasaur", ["grass", "poison"]),
+            "/pokemon-species/1": {"name": "bulbasaur", "names": []},
+        }
+        fake = FakeSession(routes)
+        with patch("pokemon.services._http_session", return_value=fake):
+            result = services.sync_catalog_from_pokeapi()
+        self.assertEqual((result["species"], result["failed"]), (2, 1))
+        self.assertFalse(catalog_complete())
+
+        # ivysaur ficou fora do catálogo: a listagem segue pela PokéAPI, com as duas espécies
+        fake.calls.clear()
+        with patch("pokemon.services._http_session", return_value=fake):
+            total, _items = services.list_by_generation_and_name(1, None, limit=10, offset=0)
+        self.assertTrue(fake.calls)
+        self.assertEqual(total, 2)
+
+        routes["/pokemon/2"] = fake_pokemon(2, "ivysaur", ["grass", "poison"])
+        routes["/pokemon-species/2"] = {"name": "ivysaur", "names": []}
+        with patch("pokemon.services._http_session", return_value=fake):
+            services.sync_catalog_from_pokeapi()
+        self.assertTrue(catalog_complete())
+
+
+class PokemonCacheTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+
+    def test_legacy_row_is_upgraded_then_served_without_network(self):
+        from pokemon import services
+        from pokemon.models import PokemonCache
+
+        PokemonCache.objects.create(codigo=25, nome="pikachu", tipos=["electric"], imagemUrl="http://x/25.png")
+        fake = FakeSession({
+            "/pokemon/25": fake_pokemon(25, "pikachu", ["electric"]),
+            "/pokemon-species/25": {"name": "pikachu", "names": []},
+        })
+        with patch("pokemon.services._http_session", return_value=fake):
+            first = services.get_pokemon_detail(25)
+            self.assertEqual(first["stats"]["total"], 300)
+            self.assertEqual(PokemonCache.objects.get(codigo=25).versao, services.CACHE_SCHEMA_VERSION)
+            fake.calls.clear()
+            second = services.get_pokemon_detail(25)
+        self.assertEqual(fake.calls, [])
+        self.assertEqual(second, first)
+
+
+class PokemonFullCacheTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+
+    def test_miss_builds_once_and_expired_entry_is_served_while_refreshing(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from pokemon import services
+        from pokemon.cache import clear_tiered_caches
+        from pokemon.models import PokemonDetalheCache
+
+        with patch("pokemon.services._build_pokemon_full", return_value={"codigo": 6, "nome": "v1"}) as build:
+            self.assertEqual(services.get_pokemon_full(6)["nome"], "v1")
+            self.assertEqual(services.get_pokemon_full(6)["nome"], "v1")
+        self.assertEqual(build.call_count, 1)
+
+        PokemonDetalheCache.objects.filter(codigo=6).update(dtAtualizado=timezone.now() - timedelta(days=30))
+        clear_tiered_caches()  # a atualização direta na tabela não passa pelas camadas em memória
+        with patch("pokemon.services._build_pokemon_full", return_value={"codigo": 6, "nome": "v2"}), \
+                patch("pokemon.services._run_in_background", side_effect=lambda fn: fn()):
+            # devolve o valor expirado e reconstrói em seguida
+            self.assertEqual(services.get_pokemon_full(6)["nome"], "v1")
+        self.assertEqual(PokemonDetalheCache.objects.get(codigo=6).payload["nome"], "v2")
+
+    def test_untranslated_build_expires_early_and_pretranslate_expires_rows(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from pokemon import services, translation
+        from pokemon.cache import clear_tiered_caches
+        from pokemon.models import PokemonDetalheCache
+
+        def _build(codigo, verify):
+            # tradutor fora: o texto sai no original
+            desc = translation.translate_many([("It breathes fire.", "en")], allow_remote=False)[0]
+            return {"codigo": codigo, "descricao": desc}
+
+        with patch("pokemon.services._build_pokemon_full", side_effect=_build):
+            self.assertEqual(services.get_pokemon_full(6)["descricao"], "It breathes fire.")
+        row = PokemonDetalheCache.objects.get(codigo=6)
+        self.assertEqual(row.textosPendentes, 1)
+        self.assertFalse(services._full_cache_lookup(6, row.idioma)[1])
+
+        PokemonDetalheCache.objects.filter(codigo=6).update(dtAtualizado=timezone.now() - timedelta(minutes=11))
+        clear_tiered_caches()
+        self.assertTrue(services._full_cache_lookup(6, row.idioma)[1])
+
+        # entrada traduzida vale o TTL cheio, até o pretranslate_catalog expirá-la
+        services._store_full(7, row.idioma, {"codigo": 7})
+        self.assertFalse(services._full_cache_lookup(7, row.idioma)[1])
+        with patch("pokemon.services._http_session", return_value=FakeSession({})), \
+                patch("pokemon.services._get_json", return_value={}), \
+                patch("pokemon.services.translate_many"):
+            stats = services.pretranslate_catalog([7])
+        self.assertEqual(stats["expired"], 1)
+        self.assertTrue(services._full_cache_lookup(7, row.idioma)[1])
+
+
+class TypeChartTests(TestCase):
+    def tearDown(self):
+        from pokemon.type_chart import invalidate_type_chart
+        invalidate_type_chart()
+
+    def test_sync_builds_matrix_matching_remote_computation(self):
+        from pokemon import services
+        from pokemon.type_chart import ALL_TYPES, load_type_chart, team_type_multipliers
+
+        rel = {t: {} for t in ALL_TYPES}
+        rel["water"] = {"double_damage_to": [{"name": "fire"}, {"name": "ground"}], "half_damage_to": [{"name": "grass"}]}
+        rel["electric"] = {"double_damage_to": [{"name": "water"}, {"name": "flying"}], "no_damage_to": [{"name": "ground"}]}
+        rel["grass"] = {"double_damage_to": [{"name": "water"}, {"name": "ground"}], "half_damage_to": [{"name": "flying"}]}
+        # relações "from" coerentes com as "to" acima, usadas pelo cálculo remoto
+        for atk, r in list(rel.items()):
+            for key_to, key_from in (("double_damage_to", "double_damage_from"), ("half_damage_to", "half_damage_from"),
+                                     ("no_damage_to", "no_damage_from")):
+                for it in r.get(key_to, []):
+                    rel[it["name"]].setdefault(key_from, []).append({"name": atk})
+        routes = {"/type": {"results": [{"name": t} for t in ALL_TYPES]}}
+        routes.update({f"/type/{t}": {"damage_relations": rel[t]} for t in ALL_TYPES})
+        fake = FakeSession(routes)
+
+        with patch("pokemon.services._http_session", return_value=fake):
+            result = services.sync_types_from_pokeapi()
+        self.assertEqual(result["matrix"], 324)
+
+        chart = load_type_chart()
+        self.assertIsNotNone(chart)
+        self.assertEqual(chart.factor("electric", "ground"), 0.0)
+        local = chart.multipliers(["water", "ground"])
+        self.assertEqual(local["from"]["grass"], 4.0)
+        self.assertEqual(local["from"]["electric"], 0.0)
+
+        with patch("pokemon.services.load_type_chart", return_value=None):
+            remote = services._compute_type_multipliers(fake, ["water", "ground"], True)
+        self.assertEqual(local, remote)
+        self.assertEqual(len(team_type_multipliers([["water"], ["grass"], ["electric"]])), 3)
+
+
+class TranslationCacheTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+
+    def test_batch_translation_uses_lru_then_table_then_remote(self):
+        from pokemon import translation
+        from pokemon.cache import clear_tiered_caches
+        from pokemon.models import TraducaoCache
+
+        with patch("pokemon.translation._remote_translate", side_effect=lambda text, src: f"pt:{text}") as remote:
+            out = translation.translate_many([("Fire", "en"), ("", None), ("Water", None), ("Fire", "en")])
+        self.assertEqual(out, ["pt:Fire", "", "pt:Water", "pt:Fire"])
+        self.assertEqual(remote.call_count, 2)
+        self.assertEqual(TraducaoCache.objects.count(), 2)
+
+        # outro processo (camadas de cache vazias) lê da tabela, sem tradutor
+        clear_tiered_caches()
+        with patch("pokemon.translation._remote_translate") as remote:
+            self.assertEqual(translation.translate_to_pt("Water"), "pt:Water")
+            self.assertEqual(translation.translate_to_pt("Grass", allow_remote=False), "Grass")
+        remote.assert_not_called()
+
+
+class EvolutionChainTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+
+    def test_chain_is_built_once_and_shared_by_the_family(self):
+        from pokemon import services
+
+        sp = lambda i, n: {"name": n, "url": f"https://pokeapi.co/api/v2/pokemon-species/{i}/"}
+        routes = {
+            "/evolution-chain/67": {"chain": {"species": sp(133, "eevee"), "evolution_details": [], "evolves_to": [
+                {"species": sp(134, "vaporeon"), "evolution_details": [{"item": {"name": "water-stone"}, "trigger": {"name": "use-item"}}], "evolves_to": []},
+                {"species": sp(135, "jolteon"), "evolution_details": [{"item": {"name": "thunder-stone"}, "trigger": {"name": "use-item"}}], "evolves_to": []},
+            ]}},
+        }
+        for i, n, t in ((133, "eevee", "normal"), (134, "vaporeon", "water"), (135, "jolteon", "electric")):
+            routes[f"/pokemon/{i}"] = fake_pokemon(i, n, [t])
+            routes[f"/pokemon-species/{i}"] = {"name": n, "names": []}
+        fake = FakeSession(routes)
+        url = "https://pokeapi.co/api/v2/evolution-chain/67/"
+        with patch("pokemon.services._http_session", return_value=fake):
+            evo = services.get_evolution_chain(url, True)
+            self.assertEqual([e["codigo"] for e in evo["evolucoes"]], [133, 134, 135])
+            self.assertEqual([(e["from"], e["to"]) for e in evo["evolutionEdges"]], [(133, 134), (133, 135)])
+            self.assertEqual(evo["evolutionEdges"][1]["toData"]["tipos"], ["electric"])
+            self.assertEqual(evo["evolutionEdges"][0]["item"], "water-stone")
+            fake.calls.clear()
+            self.assertEqual(services.get_evolution_chain(url, True), evo)
+        self.assertEqual(fake.calls, [])
+
+
+class WarmCacheCommandTests(SimpleTestCase):
+    def test_warm_cache_checkpoints_and_resumes(self):
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ck = os.path.join(tmp, "warm.json")
+            warmed = []
+
+            def fake_warm(codigo, verify_override=None):
+                warmed.append(codigo)
+                if codigo == 3:
+                    raise RuntimeError("upstream down")
+
+            with patch("pokemon.management.commands.warm_cache.warm_pokemon", side_effect=fake_warm):
+                out = StringIO()
+                call_command("warm_cache", ids="1,2,3", checkpoint=ck, concurrency=2, stdout=out, stderr=StringIO())
+                self.assertIn("ok=2 errors=1", out.getvalue())
+                warmed.clear()
+                call_command("warm_cache", ids="1,2,3", checkpoint=ck, resume=True, stdout=StringIO(), stderr=StringIO())
+            # só o que falhou é refeito
+            self.assertEqual(warmed, [3])
+
+
+class BatchDetailTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+        self.client = APIClient()
+        User = get_user_model()
+        self.user = User.objects.create_user(login="ash", email="ash@example.com", password="Test@123", name="Ash")
+
+    @override_settings(POKEMON_SHARED_CACHE=False)  # conta só as consultas às tabelas
+    def test_favorites_hydrate_in_constant_queries(self):
+        from pokemon import services
+        from pokemon.models import PokemonCache, PokemonUsuario
+
+        for c in range(1, 11):
+            norm = {"codigo": c, "nome": f"poke{c}", "tipos": ["grass"], "imagemUrl": "img", "stats": {"total": c}}
+            PokemonCache.objects.create(codigo=c, nome=norm["nome"], tipos=norm["tipos"], imagemUrl="http://x/img.png",
+                                        payload=norm, versao=services.CACHE_SCHEMA_VERSION)
+            PokemonUsuario.objects.create(usuario=self.user, codigo=c, nome=f"poke{c}", imagemUrl="http://x/img.png", favorito=True)
+        fake = FakeSession({
+            "/pokemon/11": fake_pokemon(11, "metapod", ["bug"]),
+            "/pokemon-species/11": {"name": "metapod", "names": []},
+        })
+        PokemonUsuario.objects.create(usuario=self.user, codigo=11, nome="metapod", imagemUrl="http://x/img.png", favorito=True)
+
+        self.client.force_authenticate(user=self.user)
+        with patch("pokemon.services._http_session", return_value=fake):
+            # favoritos + cache + gravação em lote do ausente
+            with self.assertNumQueries(3):
+                r = self.client.get("/pokemon/favorites/")
+        body = r.json()
+        self.assertEqual(body["count"], 11)
+        self.assertEqual([x["codigo"] for x in body["results"]], list(range(1, 12)))
+        self.assertEqual(body["results"][10]["tipos"], ["bug"])
+        self.assertEqual(fake.calls.count("https://pokeapi.co/api/v2/pokemon/11"), 1)
+
+
+class AsyncServicesTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+
+    def _fake_aget(self, routes, calls):
+        async def aget(url, verify, timeout=20.0, **kwargs):
+            calls.append(url)
+            path = url.split("/api/v2", 1)[-1].rstrip("/")
+            if path not in routes:
+                raise RuntimeError("HTTP 404")
+            return routes[path]
+        return aget
+
+    def test_async_detail_uses_same_cache_as_sync_path(self):
+        from asgiref.sync import async_to_sync
+        from pokemon import async_services, services
+
+        calls = []
+        routes = {
+            "/pokemon/4": fake_pokemon(4, "charmander", ["fire"]),
+            "/pokemon-species/4": {"name": "charmander", "names": [{"language": {"name": "pt-BR"}, "name": "Charmander"}]},
+        }
+        with patch("pokemon.async_services._aget_json", side_effect=self._fake_aget(routes, calls)):
+            first = async_to_sync(async_services.aget_pokemon_detail)(4)
+            second = async_to_sync(async_services.aget_pokemon_detail)(4)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(first, second)
+        self.assertEqual(first["stats"]["total"], 300)
+        self.assertEqual(services.get_pokemon_detail(4), first)
+
+    def test_async_list_view_matches_sync_view(self):
+        from asgiref.sync import async_to_sync
+        from django.test import RequestFactory
+        from pokemon.catalog_index import record_catalog_total
+        from pokemon.models import PokemonCatalogo
+        from pokemon.views import list_pokemon_async
+
+        PokemonCatalogo.objects.create(codigo=1, nome="bulbasaur", nomeLocalizado="Bulbassauro", geracao=1,
+                                       tipos=["grass"], imagemUrl="img/1.png", stats={"total": 318})
+        record_catalog_total(1)
+        sync_body = APIClient().get("/pokemon/?generation=1").json()
+        resp = async_to_sync(list_pokemon_async)(RequestFactory().get("/pokemon/", {"generation": 1}))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.content), sync_body)
+
+        bad = async_to_sync(list_pokemon_async)(RequestFactory().get("/pokemon/", {"limit": 1000}))
+        self.assertEqual(bad.status_code, 400)
+
+    def test_async_views_apply_drf_throttles(self):
+        from asgiref.sync import async_to_sync
+        from django.core.cache import cache
+        from django.test import RequestFactory
+        from rest_framework.throttling import AnonRateThrottle
+        from pokemon.views import get_pokemon_async
+
+        cache.clear()
+        detail = {"codigo": 1, "nome": "bulbasaur", "tipos": ["grass"], "imagemUrl": "u"}
+
+        async def aget(codigo, verify_override=None):
+            return detail
+
+        with patch.object(AnonRateThrottle, "THROTTLE_RATES", {"anon": "2/min"}), \
+                patch("pokemon.views.aget_pokemon_detail", side_effect=aget):
+            codes = [async_to_sync(get_pokemon_async)(RequestFactory().get("/pokemon/1/"), codigo=1) for _ in range(3)]
+        self.assertEqual([r.status_code for r in codes], [200, 200, 429])
+        self.assertGreater(int(codes[2]["Retry-After"]), 0)
+
+    def test_async_full_miss_waits_for_background_refresh_of_same_key(self):
+        import threading
+        import time
+        from asgiref.sync import async_to_sync
+        from pokemon import async_services, services
+
+        lang = services._full_cache_lang()
+        lock = services._key_lock(("full", 9, lang))
+        lock.acquire()  # refresh síncrono da mesma chave em andamento
+        results = []
+        with patch("pokemon.async_services._abuild_pokemon_full") as abuild:
+            t = threading.Thread(target=lambda: results.append(async_to_sync(async_services.aget_pokemon_full)(9)))
+            t.start()
+            time.sleep(0.1)
+            services._store_full(9, lang, {"codigo": 9, "nome": "refresh"})
+            lock.release()
+            t.join(5)
+        abuild.assert_not_called()
+        self.assertEqual(results, [{"codigo": 9, "nome": "refresh"}])
+
+    def test_asgi_static_files_are_served_before_django(self):
+        import os
+        import tempfile
+        from asgiref.sync import async_to_sync
+
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, "app.js"), "w") as fh:
+                fh.write("console.log(1)")
+            with override_settings(STATIC_ROOT=root, WHITENOISE_ROOT=None):
+                from pokeback.asgi_static import ASGIStaticFiles
+
+                passed = []
+
+                async def django_app(scope, receive, send):
+                    passed.append(scope["path"])
+
+                app = ASGIStaticFiles(django_app)
+                sent = []
+
+                async def send(message):
+                    sent.append(message)
+
+                async def receive():
+                    return {"type": "http.request"}
+
+                def get(path):
+                    scope = {"type": "http", "method": "GET", "path": path, "headers": [(b"accept-encoding", b"identity")]}
+                    async_to_sync(app)(scope, receive, send)
+
+                get("/static/app.js")
+                get("/pokemon/1/")
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertEqual(b"".join(m.get("body", b"") for m in sent[1:]), b"console.log(1)")
+        self.assertEqual(passed, ["/pokemon/1/"])
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_callers_share_one_fetch(self):
+        import threading
+        import time
+        from pokemon.singleflight import SingleFlight
+
+        sf = SingleFlight("test")
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {"ok": True}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(sf.do("k", fetch)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(sf.do("k", fetch))) for _ in range(4)]
+        for t in followers:
+            t.start()
+        while sf.stats()["coalesced"] < 4:
+            time.sleep(0.001)
+        release.set()
+        for t in [leader] + followers:
+            t.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"ok": True}] * 5)
+        self.assertEqual(sf.stats()["leaders"], 1)
+        self.assertEqual(sf.stats()["coalesced"], 4)
+        # terminada a busca, a próxima chamada busca de novo
+        sf.do("k", lambda: calls.append(2))
+        self.assertEqual(calls, [1, 2])
+
+    def test_leader_error_is_raised_and_key_released(self):
+        from pokemon.singleflight import SingleFlight
+
+        sf = SingleFlight("test")
+        with self.assertRaises(RuntimeError):
+            sf.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        self.assertEqual(sf.stats()["in_flight"], 0)
+
+    @override_settings(POKEMON_SINGLEFLIGHT_DISTRIBUTED=True,
+                       CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_distributed_leader_only_releases_its_own_lock(self):
+        from django.core.cache import cache
+        from pokemon.singleflight import SingleFlight
+
+        sf = SingleFlight("test")
+        lock_key = "pokemon:sf:test:'k'"
+
+        def slow_fetch():
+            # a busca passou do TTL e outro worker pegou o lock
+            cache.set(lock_key, "outro-worker")
+            return 1
+
+        self.assertEqual(sf.do("k", slow_fetch, recheck=lambda: None), 1)
+        self.assertEqual(cache.get(lock_key), "outro-worker")
+        cache.delete(lock_key)
+        self.assertEqual(sf.do("k", lambda: 2, recheck=lambda: None), 2)
+        self.assertIsNone(cache.get(lock_key))
+
+
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+
+    def test_lookup_falls_through_tiers_and_fills_faster_ones(self):
+        from django.core.cache import cache
+        from pokemon.cache import TieredCache
+
+        tc = TieredCache("teste")
+        table = {1: "um", 2: "dois"}
+        loads = []
+
+        def loader(keys):
+            loads.append(list(keys))
+            return {k: table[k] for k in keys if k in table}
+
+        self.assertEqual(tc.get_many([1, 2, 3], loader=loader), {1: "um", 2: "dois"})
+        self.assertEqual(loads, [[1, 2, 3]])
+        self.assertEqual(cache.get("pokemon:teste:1"), "um")
+
+        # outro processo: memória vazia, acerta no cache compartilhado sem ir à tabela
+        tc.memory.clear()
+        self.assertEqual(tc.get(1, loader=lambda k: loads.append(k)), "um")
+        self.assertEqual(tc.get(1), "um")
+        self.assertEqual(len(loads), 1)
+
+        stats = tc.stats()
+        self.assertEqual(stats["memory"]["hits"], 1)
+        self.assertEqual(stats["shared"]["hits"], 1)
+        self.assertEqual(stats["table"], {"hits": 2, "misses": 1, "hit_ratio": 0.6667})
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+        self.client = APIClient()
+
+    def test_detail_revalidates_with_etag_and_last_modified(self):
+        from pokemon import services
+        from pokemon.models import PokemonCache
+
+        norm = {"codigo": 7, "nome": "squirtle", "tipos": ["water"], "imagemUrl": "img", "stats": {"total": 314}}
+        PokemonCache.objects.create(codigo=7, nome="squirtle", tipos=["water"], imagemUrl="http://x/7.png",
+                                    payload=norm, versao=services.CACHE_SCHEMA_VERSION)
+        first = self.client.get("/pokemon/7/")
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"].startswith('"d7-v1-'))
+        self.assertIn("max-age=3600", first["Cache-Control"])
+        self.assertIn("stale-while-revalidate", first["Cache-Control"])
+
+        with patch("pokemon.views.get_pokemon_detail") as view_service:
+            again = self.client.get("/pokemon/7/", HTTP_IF_NONE_MATCH=first["ETag"])
+            by_date = self.client.get("/pokemon/7/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        view_service.assert_not_called()
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], first["ETag"])
+        self.assertEqual(again.content, b"")
+        self.assertEqual(by_date.status_code, 304)
+
+    def test_list_without_catalog_uses_body_hash(self):
+        page = (1, [{"codigo": 1, "nome": "bulbasaur", "tipos": [], "imagemUrl": "img"}])
+        with patch("pokemon.views.list_by_generation_and_name", return_value=page):
+            first = self.client.get("/pokemon/?limit=1")
+            again = self.client.get("/pokemon/?limit=1", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(again.status_code, 304)
+        self.assertIn("max-age=300", again["Cache-Control"])
+
+    def test_expired_full_entry_is_not_revalidated_and_refreshes(self):
+        from pokemon import services
+        from pokemon.models import PokemonDetalheCache
+
+        services._store_full(6, services._full_cache_lang(), {"codigo": 6, "nome": "v1"})
+        first = self.client.get("/pokemon/6/full/")
+        self.assertTrue(first["ETag"].startswith('"f6-'))
+
+        # mesma linha (mesmo ETag), agora além do TTL
+        with override_settings(POKEMON_FULL_CACHE_TTL_SECONDS=0), \
+                patch("pokemon.services._build_pokemon_full", return_value={"codigo": 6, "nome": "v2"}), \
+                patch("pokemon.services._run_in_background", side_effect=lambda fn: fn()):
+            again = self.client.get("/pokemon/6/full/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json()["nome"], "v1")  # expirado sai na hora; o refresh roda em seguida
+        self.assertEqual(PokemonDetalheCache.objects.get(codigo=6).payload["nome"], "v2")
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        from pokemon.models import PokemonCatalogo
+        from pokemon.catalog_index import invalidate_catalog_indexes, record_catalog_total
+
+        invalidate_catalog_indexes()
+        for codigo, nome, local in [(1, "bulbasaur", "Bulbassauro"), (122, "mr-mime", "Mr. Mímico"),
+                                    (25, "pikachu", ""), (26, "raichu", "")]:
+            PokemonCatalogo.objects.create(codigo=codigo, nome=nome, nomeLocalizado=local, geracao=1,
+                                           tipos=["normal"], imagemUrl=f"img/{codigo}.png", stats={"total": 300})
+        record_catalog_total(4)
+
+    def tearDown(self):
+        from pokemon.catalog_index import invalidate_catalog_indexes
+        invalidate_catalog_indexes()
+
+    def test_prefix_accents_and_typos(self):
+        from pokemon.search import search_index
+
+        index = search_index()
+        self.assertEqual(index.search("bulba")[0]["codigo"], 1)
+        self.assertEqual(index.search("mimi")[0]["codigo"], 122)  # palavra do meio, sem acento
+        self.assertEqual(index.search("pikachu")[0]["score"], 1.0)
+        self.assertEqual(index.search("pikachi")[0]["codigo"], 25)  # erro de digitação
+        self.assertEqual(index.search("pikachi", fuzzy=False), [])
+        self.assertEqual(index.matching("MÍMICO"), [122])
+        # só pontuação: não vira "tudo casa"; o hífen ainda acha os nomes hifenizados
+        self.assertEqual(index.matching("-"), [122])
+        self.assertEqual(index.matching("?"), [])
+        self.assertEqual(index.matching(" "), [])
+
+    def test_search_endpoint_and_localized_list_filter(self):
+        client = APIClient()
+        body = client.get("/pokemon/search/", {"q": "bulbasaurro"}).json()
+        self.assertEqual(body["results"][0]["nome"], "Bulbassauro")
+        self.assertEqual(client.get("/pokemon/search/").status_code, 400)
+
+        listed = client.get("/pokemon/", {"name": "mimico"}).json()
+        self.assertEqual([x["codigo"] for x in listed["results"]], [122])
+        self.assertEqual(client.get("/pokemon/", {"name": "-"}).json()["count"], 1)
+
+
+class StatsFilterTests(TestCase):
+    def setUp(self):
+        from pokemon.catalog_index import invalidate_catalog_indexes, record_catalog_total
+        from pokemon.models import PokemonCatalogo
+
+        invalidate_catalog_indexes()
+        for codigo, tipos, speed, total in [(1, ["grass", "poison"], 45, 318), (4, ["fire"], 65, 309),
+                                            (6, ["fire", "flying"], 100, 534), (25, ["electric"], 90, 320)]:
+            PokemonCatalogo.objects.create(codigo=codigo, nome=f"p{codigo}", geracao=1, tipos=tipos, imagemUrl="img",
+                                           stats={"speed": speed, "total": total})
+        record_catalog_total(4)
+
+    def tearDown(self):
+        from pokemon.catalog_index import invalidate_catalog_indexes
+        invalidate_catalog_indexes()
+
+    def codes(self, **params):
+        resp = APIClient().get("/pokemon/", params)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return resp.json()["count"], [x["codigo"] for x in resp.json()["results"]]
+
+    def test_type_and_stat_filters_with_ordering(self):
+        self.assertEqual(self.codes(types="fire,electric"), (3, [4, 6, 25]))
+        self.assertEqual(self.codes(types="fire,flying", types_mode="all"), (1, [6]))
+        self.assertEqual(self.codes(min_speed=60, max_speed=95), (2, [4, 25]))
+        self.assertEqual(self.codes(order_by="-total", limit=2), (4, [6, 25]))
+        self.assertEqual(self.codes(order_by="speed", offset=1, min_total=310), (3, [25, 6]))
+
+    def test_invalid_type_and_missing_catalog(self):
+        from pokemon.models import PokemonCatalogo
+
+        self.assertEqual(APIClient().get("/pokemon/", {"types": "shadow"}).status_code, 400)
+        PokemonCatalogo.objects.all().delete()
+        self.assertEqual(APIClient().get("/pokemon/", {"types": "fire"}).status_code, 503)
+
+    def page(self, url, **params):
+        resp = APIClient().get(url, params)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        body = resp.json()
+        return [x["codigo"] for x in body["results"]], body["next"], body["previous"]
+
+    def test_walks_forward_and_back_with_opaque_tokens(self):
+        codes, nxt, prev = self.page("/pokemon/", cursor="", order_by="-speed", limit=2)
+        self.assertEqual((codes, prev), ([6, 25], None))
+        self.assertIn("cursor=", nxt)
+        codes, nxt, prev = self.page(nxt)
+        self.assertEqual((codes, nxt), ([4, 1], None))
+        codes, nxt, prev = self.page(prev)
+        self.assertEqual((codes, prev), ([6, 25], None))
+
+    def test_rejects_cursor_from_other_filters_and_with_offset(self):
+        _codes, nxt, _prev = self.page("/pokemon/", cursor="", limit=1)
+        token = nxt.split("cursor=")[1].split("&")[0]
+        self.assertEqual(APIClient().get("/pokemon/", {"cursor": token, "types": "fire"}).status_code, 400)
+        self.assertEqual(APIClient().get("/pokemon/", {"cursor": "lixo"}).status_code, 400)
+        self.assertEqual(APIClient().get("/pokemon/", {"cursor": "", "offset": 1}).status_code, 400)
+
+
+@override_settings(POKEMON_BREAKER_MIN_CALLS=3, POKEMON_BREAKER_WINDOW=4, POKEMON_BREAKER_COOLDOWN_SECONDS=60,
+                   POKEAPI_RAW_CACHE=False)
+class UpstreamGuardTests(SimpleTestCase):
+    def setUp(self):
+        from pokemon.resilience import reset_upstream_guards
+        reset_upstream_guards()
+
+    tearDown = setUp
+
+    def _send(self, adapter, *statuses):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        responses = []
+        for code in statuses:
+            resp = requests.Response()
+            resp.status_code = code
+            responses.append(resp)
+        request = requests.Request("GET", "https://pokeapi.co/api/v2/pokemon/1").prepare()
+        with patch.object(HTTPAdapter, "send", side_effect=responses) as inner, \
+                patch("pokemon.http_client._BACKOFF_FACTOR", 0):
+            try:
+                return adapter.send(request, timeout=20)
+            finally:
+                self.calls = inner.call_count
+
+    def test_breaker_counts_each_retry_and_fails_fast(self):
+        from pokemon.http_client import PooledHTTPAdapter
+        from pokemon.resilience import UpstreamUnavailable, upstream_stats
+
+        adapter = PooledHTTPAdapter()
+        # cada nova tentativa do 503 passa pela guarda: na terceira falha o circuito abre
+        with self.assertRaises(UpstreamUnavailable):
+            self._send(adapter, 503, 503, 503, 503)
+        self.assertEqual(self.calls, 3)
+        stats = upstream_stats()["pokeapi.co"]
+        self.assertEqual(stats["breaker"]["state"], "open")
+        self.assertEqual((stats["calls"], stats["failures"], stats["rejected_open"]), (3, 3, 1))
+
+    def test_retry_after_server_error(self):
+        from pokemon.http_client import PooledHTTPAdapter
+        from pokemon.resilience import upstream_stats
+
+        self.assertEqual(self._send(PooledHTTPAdapter(), 503, 200).status_code, 200)
+        self.assertEqual(self.calls, 2)
+        stats = upstream_stats()["pokeapi.co"]
+        self.assertEqual((stats["calls"], stats["failures"]), (2, 1))
+
+    @override_settings(POKEMON_UPSTREAM_RATE=1, POKEMON_UPSTREAM_BURST_SECONDS=1, POKEMON_UPSTREAM_MAX_WAIT_SECONDS=0)
+    def test_rate_limit_applies_to_retries(self):
+        from pokemon.http_client import PooledHTTPAdapter
+        from pokemon.resilience import UpstreamUnavailable
+
+        adapter = PooledHTTPAdapter()
+        with self.assertRaises(UpstreamUnavailable):
+            self._send(adapter, 429, 200)  # a nova tentativa precisa de outra ficha
+        self.assertEqual(self.calls, 1)
+
+    def test_adaptive_timeout_tracks_latency(self):
+        from pokemon.resilience import AdaptiveTimeout
+
+        t = AdaptiveTimeout(minimum=0.5)
+        self.assertEqual(t.timeout(20), 20)
+        for _ in range(10):
+            t.observe(0.2)
+        self.assertAlmostEqual(t.timeout(20), 0.5, delta=0.2)
+        self.assertEqual(t.timeout(0.1), 0.1)  # nunca passa do timeout pedido
+
+
+class StaleIfErrorTests(TestCase):
+    def setUp(self):
+        from pokemon.cache import clear_tiered_caches
+        clear_tiered_caches()
+
+    def test_expired_detail_and_degraded_full_when_upstream_fails(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from pokemon import services
+        from pokemon.models import PokemonCache
+
+        payload = {"codigo": 25, "nome": "Pikachu", "tipos": ["electric"], "imagemUrl": "u", "stats": {"total": 320}}
+        PokemonCache.objects.create(codigo=25, nome="Pikachu", tipos=["electric"], imagemUrl="u", payload=payload,
+                                    versao=services.CACHE_SCHEMA_VERSION)
+        PokemonCache.objects.filter(codigo=25).update(dtAtualizado=timezone.now() - timedelta(days=30))
+
+        with patch("pokemon.services._http_session", return_value=FakeSession({})):
+            detail = APIClient().get("/pokemon/25/")
+            full = APIClient().get("/pokemon/25/full/")
+            missing = APIClient().get("/pokemon/26/")
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual((detail.json()["stale"], detail.json()["stats"]), (True, {"total": 320}))
+        self.assertEqual(detail["X-Data-Stale"], "1")
+        self.assertIn("110", detail["Warning"])
+        self.assertEqual(detail["Cache-Control"], "no-cache")
+        self.assertEqual((full.status_code, full.json()["stale"], full.json()["habilidades"]), (200, True, []))
+        self.assertEqual(missing.status_code, 502)
+
+    def test_last_good_list_page_survives_outage(self):
+        from pokemon import services
+
+        fake = FakeSession({
+            "/pokemon?limit=1&offset=0": {"count": 1, "results": [{"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon/1/"}]},
+            "/pokemon/1": fake_pokemon(1, "bulbasaur", ["grass"]),
+        })
+        with patch("pokemon.services._http_session", return_value=fake):
+            services.list_by_generation_and_name(None, None, limit=1, offset=0)
+        with patch("pokemon.services._http_session", return_value=FakeSession({})):
+            total, items = services.list_by_generation_and_name(None, None, limit=1, offset=0)
+        self.assertEqual((total, items[0]["codigo"], items[0]["tipos"], items[0]["stale"]), (1, 1, ["grass"], True))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        from pokemon.metrics import reset_metrics
+        reset_metrics()
+
+    def test_endpoint_templates(self):
+        from pokemon.metrics import endpoint_template
+
+        self.assertEqual(endpoint_template("https://pokeapi.co/api/v2/pokemon/25/"), ("pokeapi.co", "/pokemon/{id}"))
+        self.assertEqual(endpoint_template("https://pokeapi.co/api/v2/ability/overgrow"), ("pokeapi.co", "/ability/{name}"))
+        self.assertEqual(endpoint_template("https://pokeapi.co/api/v2/pokemon?limit=20&offset=0"), ("pokeapi.co", "/pokemon"))
+
+    @override_settings(METRICS_TOKEN="s3cr3t")
+    def test_exposition_and_server_timing(self):
+        from pokemon.metrics import record_upstream
+
+        record_upstream("https://pokeapi.co/api/v2/pokemon-species/1/", 200, 0.12, 2048)
+        with patch("pokemon.views.get_pokemon_detail", return_value={"codigo": 1}):
+            resp = APIClient().get("/pokemon/1/")
+        self.assertRegex(resp["Server-Timing"], r'^upstream;dur=[\d.]+;desc="0 chamadas", db;dur=[\d.]+;desc="\d+ consultas", total;dur=')
+
+        body = APIClient().get("/metrics", HTTP_AUTHORIZATION="Bearer s3cr3t").content.decode()
+        self.assertIn('pokemon_upstream_requests_total{host="pokeapi.co",endpoint="/pokemon-species/{id}",status="200"} 1', body)
+        self.assertIn('pokemon_upstream_response_bytes_total{host="pokeapi.co",endpoint="/pokemon-species/{id}"} 2048', body)
+        self.assertIn('pokemon_http_request_duration_seconds_count{route="pokemon/<int:codigo>/",method="GET",status="200"} 1', body)
+
+    @override_settings(METRICS_TOKEN="s3cr3t")
+    def test_token_required_when_configured(self):
+        self.assertEqual(APIClient().get("/metrics").status_code, 401)
+        self.assertEqual(APIClient().get("/metrics", HTTP_AUTHORIZATION="Bearer s3cr3t").status_code, 200)
+
+    def test_closed_without_token_except_debug_or_staff(self):
+        from django.contrib.auth import get_user_model
+
+        client = APIClient()
+        self.assertEqual(client.get("/metrics").status_code, 401)
+        user = get_user_model().objects.create_user(login="treinador", email="t@example.com", password="Test@123", name="T")
+        client.force_login(user)
+        self.assertEqual(client.get("/metrics").status_code, 403)
+        user.is_staff = True
+        user.save(update_fields=["is_staff"])
+        self.assertEqual(client.get("/metrics").status_code, 200)
+        with override_settings(DEBUG=True):
+            self.assertEqual(APIClient().get("/metrics").status_code, 200)
+
+
+class RawCacheTests(SimpleTestCase):
+    def setUp(self):
+        import tempfile
+        from pokemon.raw_cache import reset_raw_cache
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(POKEAPI_RAW_CACHE_DIR=self.tmp.name, POKEMON_UPSTREAM_GUARD=False)
+        self.settings_override.enable()
+        reset_raw_cache()
+
+    def tearDown(self):
+        from pokemon.raw_cache import reset_raw_cache
+
+        self.settings_override.disable()
+        reset_raw_cache()
+        self.tmp.cleanup()
+
+    def _send(self, url, status_code=200, body=b'{"id": 1}', headers=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from pokemon.http_client import PooledHTTPAdapter
+
+        resp = requests.Response()
+        resp.status_code, resp._content = status_code, body
+        resp.headers.update(headers or {})
+        request = requests.Request("GET", url).prepare()
+        with patch.object(HTTPAdapter, "send", return_value=resp) as inner:
+            out = PooledHTTPAdapter().send(request, timeout=20)
+        return out, inner, request
+
+    def test_second_fetch_is_served_from_disk(self):
+        url = "https://pokeapi.co/api/v2/pokemon/1/"
+        _out, inner, _req = self._send(url, headers={"ETag": '"v1"'})
+        self.assertEqual(inner.call_count, 1)
+        out, inner, _req = self._send(url, body=b"nunca usado")
+        self.assertEqual((inner.call_count, out.json()), (0, {"id": 1}))
+        # tradutores não passam pelo cache em disco
+        _out, inner, _req = self._send("https://api.mymemory.translated.net/get?q=a")
+        _out, inner, _req = self._send("https://api.mymemory.translated.net/get?q=a")
+        self.assertEqual(inner.call_count, 1)
+
+    def test_expired_entry_is_revalidated_and_size_cap_evicts(self):
+        url = "https://pokeapi.co/api/v2/type/fire/"
+        self._send(url, headers={"ETag": '"t1"'})
+        with override_settings(POKEAPI_RAW_CACHE_TTLS={"/type/{name}": 0}):
+            from pokemon.raw_cache import reset_raw_cache
+            reset_raw_cache()
+            out, inner, request = self._send(url, status_code=304, body=b"")
+        self.assertEqual(request.headers["If-None-Match"], '"t1"')
+        self.assertEqual((out.status_code, out.json()), (200, {"id": 1}))
+
+        with override_settings(POKEAPI_RAW_CACHE_MAX_MB=0.0002):  # ~200 bytes: cabe um arquivo
+            reset_raw_cache()
+            for i in range(5):
+                self._send(f"https://pokeapi.co/api/v2/pokemon/{i}/")
+            from pokemon.raw_cache import raw_cache
+            self.assertLessEqual(sum(1 for _ in raw_cache()._files()), 2)
+
+
+class LocalDataSourceTests(TestCase):
+    """Fonte local: dump importado servindo listagem, detalhe e detalhe completo sem rede."""
+
+    def setUp(self):
+        import os
+        import tempfile
+        from pokemon.cache import clear_tiered_caches
+
+        clear_tiered_caches()
+        self.tmp = tempfile.TemporaryDirectory()
+        charmander = dict(fake_pokemon(4, "charmander", ["fire"]), height=6, weight=85,
+                          abilities=[{"ability": {"name": "blaze", "url": "/api/v2/ability/66/"}, "is_hidden": False}],
+                          moves=[{"move": {"name": "scratch"}}])
+        docs = {
+            "pokemon/4": charmander,
+            "pokemon/5": fake_pokemon(5, "charmeleon", ["fire"]),
+            "pokemon/4/encounters": [],
+            "pokemon-species/4": {
+                "id": 4, "name": "charmander", "names": [{"language": {"name": "en"}, "name": "Charmander"}],
+                "genera": [{"language": {"name": "en"}, "genus": "Lizard Pokémon"}],
+                "flavor_text_entries": [{"language": {"name": "en"}, "flavor_text": "Flame on its tail."}],
+                "gender_rate": 1, "evolution_chain": {"url": "/api/v2/evolution-chain/2/"},
+            },
+            "ability/66": {"id": 66, "name": "blaze", "effect_entries": [
+                {"language": {"name": "en"}, "short_effect": "Powers up Fire moves."}]},
+            "type/10": {"id": 10, "name": "fire", "damage_relations": {
+                "double_damage_from": [{"name": "water"}], "half_damage_from": [{"name": "grass"}],
+                "no_damage_from": [], "double_damage_to": [{"name": "grass"}], "half_damage_to": [], "no_damage_to": []}},
+            "evolution-chain/2": {"id": 2, "chain": {"species": {"name": "charmander", "url": "/api/v2/pokemon-species/4/"},
+                                                     "evolves_to": []}},
+        }
+        for path, doc in docs.items():
+            folder = os.path.join(self.tmp.name, "data", "api", "v2", *path.split("/"))
+            os.makedirs(folder)
+            with open(os.path.join(folder, "index.json"), "w") as fh:
+                json.dump(doc, fh)
+
+    def tearDown(self):
+        from pokemon.datasource import reset_data_source
+
+        reset_data_source()
+        self.tmp.cleanup()
+
+    def test_source_without_get_json_fails_on_creation(self):
+        from pokemon.datasource import DataSource
+
+        class Incompleta(DataSource):
+            name = "incompleta"
+
+        with self.assertRaises(TypeError):
+            Incompleta()
+
+    def test_import_command_then_serve_without_network(self):
+        import os
+        from io import StringIO
+        from asgiref.sync import async_to_sync
+        from django.core.management import call_command
+        from pokemon import async_services, services
+        from pokemon.models import RecursoPokeAPI
+
+        out = StringIO()
+        call_command("import_pokeapi_dataset", self.tmp.name, stdout=out)
+        call_command("import_pokeapi_dataset", self.tmp.name, stdout=out)  # idempotente
+        self.assertIn("pokemon=2", out.getvalue())
+        self.assertNotIn("moves", RecursoPokeAPI.objects.get(caminho="pokemon/4").payload)
+        self.assertFalse(RecursoPokeAPI.objects.filter(caminho="pokemon/4/encounters").exists())
+        self.assertEqual(RecursoPokeAPI.objects.get(caminho="pokemon").payload["count"], 2)  # listagem montada
+
+        offline = FakeSession({})
+        with override_settings(POKEMON_DATA_SOURCE="local"), \
+                patch.dict(os.environ, {"ENABLE_AUTO_TRANSLATE_PT": "0"}), \
+                patch("pokemon.services._http_session", return_value=offline):
+            page = APIClient().get("/pokemon/?limit=1&offset=1").json()
+            self.assertEqual((page["count"], [p["nome"] for p in page["results"]]), (2, ["charmeleon"]))
+            self.assertEqual(services.get_pokemon_detail(4)["stats"]["total"], 300)
+            full = services.get_pokemon_full(4)
+            self.assertEqual((full["altura_m"], full["multiplicadores"]["from"]["water"]), (0.6, 2.0))
+            self.assertEqual(len(full["habilidades"]), 1)
+            self.assertEqual([e["nome"] for e in full["evolucoes"]], ["Charmander"])
+            self.assertEqual(async_to_sync(async_services._aget_json)(f"{services.POKEAPI_BASE}/type/fire/", True)["id"], 10)
+            with self.assertRaises(LookupError):
+                services._get_json(offline, f"{services.POKEAPI_BASE}/pokemon/999", True)
+        self.assertEqual(offline.calls, [])
+
+
+class BenchmarkTests(TestCase):
+    def test_fake_pokeapi_cold_then_warm(self):
+        import tempfile
+        from pokemon import bench
+
+        self.assertEqual(bench.percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(bench.percentile(list(range(1, 101)), 99), 99)
+
+        with bench.FakePokeAPI(bench.synthetic_fixtures(9)) as api, tempfile.TemporaryDirectory() as raw_dir, \
+                bench.pointed_at(api, raw_dir):
+            results = bench.run_benchmark(api, [1, 2, 4], scenarios=("detail", "full"), warm_rounds=2)
+        by_key = {(r["scenario"], r["phase"]): r for r in results}
+        self.assertEqual(set(by_key), {("detail", "cold"), ("detail", "warm"), ("full", "cold"), ("full", "warm")})
+        cold, warm = by_key[("full", "cold")], by_key[("full", "warm")]
+        self.assertEqual((cold["errors"], warm["errors"], warm["requests"]), (0, 0, 6))
+        self.assertIn("/ability/{name}", cold["upstream_by_endpoint"])
+        self.assertGreater(cold["upstream_calls"], 0)
+        self.assertEqual(warm["upstream_calls"], 0)
+        self.assertLessEqual(cold["p50_ms"], cold["p99_ms"])
+        json.dumps(results)
+
+
+class TrafficReplayTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = f"{self.tmp.name}/traffic.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("pokemon.views.get_pokemon_detail", return_value={"codigo": 1, "nome": "bulbasaur", "tipos": ["grass"], "imagemUrl": "u"})
+    def test_recorder_is_off_by_default_and_sanitizes(self, _mock_detail):
+        from pokemon.traffic import load_traffic
+
+        APIClient().get("/pokemon/1/")
+        with override_settings(TRAFFIC_RECORD_PATH=self.path):
+            APIClient().get("/pokemon/1/", {"lang": "pt", "access_token": "segredo"})
+        records = load_traffic(self.path)
+        self.assertEqual(len(records), 1)
+        rec = records[0]
+        self.assertEqual((rec["route"], rec["status"], rec["upstream_calls"]), ("pokemon/<int:codigo>/", 200, 0))
+        self.assertEqual(rec["params"], {"access_token": "***", "lang": "pt"})
+        self.assertNotIn("segredo", open(self.path).read())
+
+    def test_replay_against_local_server(self):
+        from pokemon.traffic import local_server, replay
+
+        records = [
+            {"ts": 100.0, "method": "GET", "path": "/health/", "route": "health/", "params": {}},
+            {"ts": 100.5, "method": "GET", "path": "/health/", "route": "health/", "params": {"token": "***"}},
+            {"ts": 101.0, "method": "GET", "path": "/nao-existe.json", "route": "unmatched", "params": {}},
+            {"ts": 101.0, "method": "GET", "path": "/auth/me/", "route": "auth/me/", "params": {}, "auth": True},
+            {"ts": 101.0, "method": "POST", "path": "/pokemon/team/", "route": "pokemon/team/", "params": {}},
+        ]
+        with local_server() as base_url:
+            report = replay(records, base_url, speed=0, concurrency=2)
+        self.assertEqual((report["requests"], report["skipped"], report["errors"]), (3, 2, 0))
+        self.assertEqual(report["client_errors"], 1)
+        self.assertEqual(report["by_route"]["health/"]["requests"], 2)
+        self.assertEqual(report["upstream_per_request"], 0)
+        self.assertEqual(report["histogram"][-1]["count"], 3)
+
+
+class JobQueueTests(TestCase):
+    def test_enqueue_dedupes_active_key_and_claim_respects_priority(self):
+        from pokemon import jobs
+
+        low = jobs.enqueue("aquecer", {"codigo": 1}, chave="aquecer:1", prioridade=jobs.PRIORIDADE_BAIXA)
+        again = jobs.enqueue("aquecer", {"codigo": 1}, chave="aquecer:1", prioridade=jobs.PRIORIDADE_ALTA)
+        self.assertEqual(again.pk, low.pk)
+        self.assertEqual(again.prioridade, jobs.PRIORIDADE_ALTA)
+        normal = jobs.enqueue("aquecer", {"codigo": 2})
+        jobs.enqueue("aquecer", {"codigo": 3}, atraso=3600)  # ainda não disponível
+
+        first = jobs.claim("w1")
+        self.assertEqual((first.pk, first.status, first.tentativas), (low.pk, "executando", 1))
+        self.assertEqual(jobs.claim("w2").pk, normal.pk)
+        self.assertIsNone(jobs.claim("w3"))
+        self.assertEqual(jobs.queue_stats()["pendente"], 1)
+
+    @override_settings(POKEMON_JOBS_MAX_ATTEMPTS=2, POKEMON_JOBS_BACKOFF_SECONDS=0)
+    def test_failures_retry_with_backoff_then_fail(self):
+        from pokemon import jobs
+
+        tarefa = jobs.enqueue("atualizar_completo", {"codigo": 6})
+        with patch("pokemon.services.refresh_pokemon_full", side_effect=RuntimeError("PokéAPI fora")) as refresh:
+            self.assertFalse(jobs.run_tarefa(jobs.claim("w")))
+            tarefa.refresh_from_db()
+            self.assertEqual((tarefa.status, tarefa.tentativas), ("pendente", 1))
+            self.assertIn("PokéAPI fora", tarefa.erro)
+            self.assertFalse(jobs.run_tarefa(jobs.claim("w")))
+        tarefa.refresh_from_db()
+        self.assertEqual((tarefa.status, tarefa.tentativas), ("falhou", 2))
+        self.assertEqual(refresh.call_count, 2)
+        self.assertIsNone(jobs.claim("w"))
+
+    @override_settings(POKEMON_JOBS_MAX_ATTEMPTS=2, POKEMON_JOBS_LEASE_SECONDS=60)
+    def test_expired_lease_on_last_attempt_fails_instead_of_rerunning(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from pokemon import jobs
+        from pokemon.models import Tarefa
+
+        tarefa = jobs.enqueue("aquecer", {"codigo": 1})
+        self.assertEqual(jobs.claim("w1").tentativas, 1)
+        Tarefa.objects.filter(pk=tarefa.pk).update(dtInicio=timezone.now() - timedelta(minutes=5))
+        # trabalhador morreu na 1ª tentativa: o job volta e roda a 2ª (última)
+        self.assertEqual(jobs.claim("w2").tentativas, 2)
+        Tarefa.objects.filter(pk=tarefa.pk).update(dtInicio=timezone.now() - timedelta(minutes=5))
+        self.assertIsNone(jobs.claim("w3"))
+        tarefa.refresh_from_db()
+        self.assertEqual((tarefa.status, tarefa.tentativas, tarefa.erro), ("falhou", 2, "lease expirado"))
+
+    @override_settings(POKEMON_JOBS=True)
+    def test_request_defers_translation_and_expired_full_refresh(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from pokemon import jobs, services, translation
+        from pokemon.cache import clear_tiered_caches
+        from pokemon.models import PokemonDetalheCache, Tarefa
+
+        clear_tiered_caches()
+        with patch("pokemon.translation._remote_translate", side_effect=lambda text, src: f"pt:{text}") as remote:
+            followup = {"tipo": "aquecer", "parametros": {"codigo": 4}, "chave": "aquecer:4"}
+            self.assertEqual(translation.translate_many([("Fire", "en")], followup=followup), ["Fire"])
+            self.assertEqual(translation.translate_many([("Fire", "en")], followup=followup), ["Fire"])
+            remote.assert_not_called()
+            tarefa = Tarefa.objects.get(tipo="traduzir")  # mesmo conjunto de textos: um job só
+            self.assertTrue(jobs.run_tarefa(jobs.claim("w", tipos=["traduzir"])))
+        self.assertEqual(translation.translate_many([("Fire", "en")]), ["pt:Fire"])
+        self.assertEqual(Tarefa.objects.get(pk=tarefa.pk).status, "concluida")
+        self.assertTrue(Tarefa.objects.filter(tipo="aquecer", chave="aquecer:4", status="pendente").exists())
+
+        with patch("pokemon.services._build_pokemon_full", return_value={"codigo": 6, "nome": "v1"}):
+            services.get_pokemon_full(6)
+        PokemonDetalheCache.objects.filter(codigo=6).update(dtAtualizado=timezone.now() - timedelta(days=30))
+        clear_tiered_caches()
+        with patch("pokemon.services._run_in_background") as background:
+            self.assertEqual(services.get_pokemon_full(6)["nome"], "v1")
+            self.assertEqual(services.get_pokemon_full(6)["nome"], "v1")
+        background.assert_not_called()
+        refresh = Tarefa.objects.get(tipo="atualizar_completo")
+        self.assertEqual(refresh.parametros, {"codigo": 6})
+
+
+class JobWorkerTests(TransactionTestCase):
+    # as threads do worker usam conexões próprias: os jobs precisam estar commitados
+    def test_worker_drains_queue(self):
+        from pokemon import jobs
+
+        for codigo in (1, 2, 3):
+            jobs.enqueue("aquecer", {"codigo": codigo})
+        jobs.enqueue("tipo_inexistente")
+        with patch("pokemon.services.warm_pokemon") as warm:
+            counts = jobs.Worker(concurrency=1).run(once=True)
+        self.assertEqual(counts, {"ok": 3, "failed": 1})
+        self.assertEqual(sorted(c.args[0] for c in warm.call_args_list), [1, 2, 3])
+        self.assertEqual(jobs.queue_stats()["falhou"], 1)
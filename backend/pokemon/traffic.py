@@ -0,0 +1,277 @@
+"""Gravação de tráfego real e replay contra um servidor local.
+
+``TrafficRecorderMiddleware`` (desligado por padrão: só entra com TRAFFIC_RECORD_PATH) grava uma
+linha JSON por requisição: instante, método, caminho, padrão da rota, query string sanitizada,
+status, duração e chamadas upstream (lidas do ``RequestTiming`` do MetricsMiddleware). Cabeçalhos
+e corpos nunca são gravados; parâmetros com cara de credencial viram ``***``.
+
+``replay`` reenvia o arquivo respeitando os intervalos originais (acelerados ``speed`` vezes, ou
+sem pausa com ``speed=0``) com concorrência limitada, e devolve vazão, taxa de erro, histograma
+de latência e chamadas upstream por requisição (do cabeçalho Server-Timing da resposta).
+"""
+import bisect
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlencode
+
+import requests
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .bench import percentile
+from .metrics import _LATENCY_BUCKETS, _TIMING, _route
+
+_SENSITIVE = re.compile(r"token|pass|secret|key|auth|session|signature|email", re.I)
+_MAX_VALUE = 200
+_SERVER_TIMING_UPSTREAM = re.compile(r'upstream;dur=[\d.]+;desc="(\d+)')
+
+
+def sanitize_params(query) -> Dict[str, str]:
+    """Query string sem credenciais (valor ``***``) e com valores truncados."""
+    out = {}
+    for key in sorted(query.keys()):
+        value = query.get(key, "")
+        out[key] = "***" if _SENSITIVE.search(key) else str(value)[:_MAX_VALUE]
+    return out
+
+
+class TrafficLog:
+    """Arquivo JSON lines compartilhado pelas threads do processo (uma escrita por linha)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._fh = open(path, "a", encoding="utf-8", buffering=1)
+
+    def write(self, record: Dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._fh.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+class TrafficRecorderMiddleware:
+    """Grava o tráfego em TRAFFIC_RECORD_PATH; sem o setting o Django descarta o middleware."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        path = getattr(settings, "TRAFFIC_RECORD_PATH", "")
+        if not path:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log = TrafficLog(path)
+        self.sample = float(getattr(settings, "TRAFFIC_RECORD_SAMPLE", 1.0))
+        self.prefixes = tuple(getattr(settings, "TRAFFIC_RECORD_PREFIXES", ()) or ())
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _wanted(self, request) -> bool:
+        if self.prefixes and not request.path.startswith(self.prefixes):
+            return False
+        return self.sample >= 1.0 or random.random() < self.sample
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self._wanted(request):
+            return self.get_response(request)
+        started = time.monotonic()
+        response = self.get_response(request)
+        self._record(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        if not self._wanted(request):
+            return await self.get_response(request)
+        started = time.monotonic()
+        response = await self.get_response(request)
+        self._record(request, response, started)
+        return response
+
+    def _record(self, request, response, started: float) -> None:
+        timing = _TIMING.get()
+        try:
+            self.log.write({
+                "ts": round(time.time(), 3),
+                "method": request.method,
+                "path": request.path,
+                "route": _route(request),
+                "params": sanitize_params(request.GET),
+                "status": response.status_code,
+                "duration_ms": round((time.monotonic() - started) * 1000.0, 2),
+                "upstream_calls": timing.upstream_calls if timing is not None else None,
+                "auth": "HTTP_AUTHORIZATION" in request.META,
+            })
+        except (OSError, ValueError):
+            pass  # gravar tráfego nunca derruba a requisição
+
+
+# -------- Replay --------
+
+def load_traffic(path: str, limit: Optional[int] = None) -> List[Dict]:
+    records = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+            if limit and len(records) >= limit:
+                break
+    records.sort(key=lambda r: r.get("ts", 0))
+    return records
+
+
+def _upstream_calls(response) -> Optional[int]:
+    match = _SERVER_TIMING_UPSTREAM.search(response.headers.get("Server-Timing", ""))
+    return int(match.group(1)) if match else None
+
+
+def _summary(latencies: List[float], errors: int, upstream: List[int]) -> Dict:
+    latencies = sorted(latencies)
+    n = len(latencies)
+    return {
+        "requests": n,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "upstream_per_request": round(sum(upstream) / len(upstream), 3) if upstream else None,
+    }
+
+
+def replay(
+    records: Sequence[Dict],
+    base_url: str,
+    speed: float = 1.0,
+    concurrency: int = 8,
+    token: Optional[str] = None,
+    timeout: float = 30.0,
+) -> Dict:
+    """Reenvia ``records`` (GETs) contra ``base_url`` e devolve o relatório.
+
+    ``speed`` acelera os intervalos originais (2 = duas vezes mais rápido; 0 = sem pausa). Com todos
+    os ``concurrency`` workers ocupados as requisições esperam na fila; o atraso em relação ao
+    horário previsto aparece em ``max_lag_ms``. Registros autenticados só são reenviados com ``token``.
+    """
+    base_url = base_url.rstrip("/")
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, concurrency))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    todo, skipped = [], 0
+    for r in records:
+        if r.get("method", "GET") != "GET" or (r.get("auth") and not token):
+            skipped += 1
+            continue
+        params = {k: v for k, v in (r.get("params") or {}).items() if v != "***"}
+        todo.append((r, base_url + r["path"] + (f"?{urlencode(params)}" if params else "")))
+
+    lock = threading.Lock()
+    latencies: List[float] = []
+    upstream: List[int] = []
+    by_route: Dict[str, Dict[str, List]] = {}
+    counts = {"errors": 0, "client_errors": 0, "max_lag_ms": 0.0}
+
+    def _send(item, due: float):
+        record, url = item
+        lag = max(0.0, time.monotonic() - due) * 1000.0
+        t0 = time.monotonic()
+        try:
+            resp = session.get(url, headers=headers, timeout=timeout)
+            status, calls = resp.status_code, _upstream_calls(resp)
+        except requests.RequestException:
+            status, calls = None, None
+        elapsed = (time.monotonic() - t0) * 1000.0
+        route = record.get("route") or "unmatched"
+        with lock:
+            counts["max_lag_ms"] = max(counts["max_lag_ms"], lag)
+            latencies.append(elapsed)
+            stats = by_route.setdefault(route, {"latencies": [], "upstream": [], "errors": 0})
+            stats["latencies"].append(elapsed)
+            if status is None or status >= 500:
+                counts["errors"] += 1
+                stats["errors"] += 1
+            elif status >= 400:
+                counts["client_errors"] += 1
+            if calls is not None:
+                upstream.append(calls)
+                stats["upstream"].append(calls)
+
+    first_ts = todo[0][0].get("ts", 0) if todo else 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="replay") as ex:
+        for item in todo:
+            offset = (item[0].get("ts", first_ts) - first_ts) / speed if speed > 0 else 0.0
+            due = started + offset
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            ex.submit(_send, item, due)
+    duration = time.monotonic() - started
+    session.close()
+
+    ordered = sorted(latencies)
+    # cumulativo, nas mesmas faixas do histograma de /metrics
+    histogram = [
+        {"le_ms": bound * 1000.0, "count": bisect.bisect_right(ordered, bound * 1000.0)} for bound in _LATENCY_BUCKETS
+    ]
+    histogram.append({"le_ms": "+Inf", "count": len(ordered)})
+    total = len(ordered)
+    return {
+        **_summary(ordered, counts["errors"], upstream),
+        "skipped": skipped,
+        "client_errors": counts["client_errors"],
+        "error_rate": round(counts["errors"] / total, 4) if total else 0.0,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(total / duration, 2) if duration else 0.0,
+        "mean_ms": round(sum(ordered) / total, 2) if total else 0.0,
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+        "max_lag_ms": round(counts["max_lag_ms"], 2),
+        "histogram": histogram,
+        "by_route": {
+            route: _summary(s["latencies"], s["errors"], s["upstream"]) for route, s in sorted(by_route.items())
+        },
+    }
+
+
+@contextmanager
+def local_server() -> Iterator[str]:
+    """Sobe a aplicação (WSGI, multithread) numa porta livre de 127.0.0.1; devolve a URL base."""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, name="replay-server", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,242 @@
+"""Tradução automática para pt-BR com cache em camadas (ver ``cache.TieredCache``).
+
+1. LRU limitado em memória (TRANSLATE_LRU_SIZE), por processo;
+2. cache do Django (backend configurado em CACHES);
+3. tabela TraducaoCache, compartilhada entre workers e reinícios.
+
+Só em último caso o texto vai a um tradutor público (MyMemory, depois LibreTranslate), e
+isso pode ser desligado no caminho da requisição com TRANSLATE_ON_REQUEST=0: o texto original
+é devolvido e a tradução fica para o comando pretranslate_catalog. Com a fila de jobs ligada
+(POKEMON_JOBS=1) a requisição também devolve o original e o que faltou vira um job ``traduzir``.
+"""
+import hashlib
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from .cache import tiered_cache
+from .fanout import fan_out
+from .http_client import get_session
+from .jobs import PRIORIDADE_BAIXA, enqueue, in_job, jobs_enabled
+from .models import TraducaoCache
+
+DEST_LANG = "pt-BR"
+_SUPPORTED_SRC = {"en", "es", "pt", "fr", "de", "it", "ja", "zh", "ko"}
+
+Key = Tuple[str, str]  # (sha256 do texto, idioma de origem)
+
+# traduções não mudam: sem TTL na memória e 30 dias no cache compartilhado
+_CACHE = tiered_cache(
+    "traducao", maxsize=getattr(settings, "TRANSLATE_LRU_SIZE", 2048), memory_ttl=0, shared_ttl=30 * 86400
+)
+
+
+# textos devolvidos sem tradução dentro do escopo aberto (ver ``untranslated_scope``)
+_UNTRANSLATED: ContextVar[Optional[List[int]]] = ContextVar("pokemon_untranslated", default=None)
+
+
+@contextmanager
+def untranslated_scope() -> Iterator[List[int]]:
+    """``count[0]``: quantos textos ``translate_many`` devolveu sem tradução dentro do escopo
+    (usado para gravar com TTL curto o que foi montado com texto original)."""
+    count = [0]
+    token = _UNTRANSLATED.set(count)
+    try:
+        yield count
+    finally:
+        _UNTRANSLATED.reset(token)
+
+
+def report_untranslated(keys: Sequence[Key], found: Dict[Key, str]) -> None:
+    count = _UNTRANSLATED.get()
+    if count is not None:
+        count[0] += sum(1 for k in keys if k not in found)
+
+
+def _enabled() -> bool:
+    return os.getenv("ENABLE_AUTO_TRANSLATE_PT", "1") == "1"
+
+
+def _remote_on_request() -> bool:
+    return bool(getattr(settings, "TRANSLATE_ON_REQUEST", True))
+
+
+def _remote_allowed(allow_remote: Optional[bool] = None) -> bool:
+    if allow_remote is not None:
+        return allow_remote
+    if in_job():
+        return True
+    # com a fila ligada a requisição não espera o tradutor: o job ``traduzir`` faz isso
+    return _remote_on_request() and not jobs_enabled()
+
+
+def _src_code(src_lang: Optional[str]) -> str:
+    # MyMemory exige langpair SRC|DEST com códigos de 2 letras (ou RFC3066)
+    src = (src_lang or "en").split("-")[0].lower()  # ex: pt-BR -> pt
+    return src if src in _SUPPORTED_SRC else "en"
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+LIBRETRANSLATE_URL = "https://libretranslate.de/translate"
+
+
+def mymemory_params(text: str, src: str) -> Dict[str, str]:
+    return {"q": text, "langpair": f"{src}|{DEST_LANG}"}
+
+
+def mymemory_text(data: Optional[Dict]) -> Optional[str]:
+    t = ((data or {}).get("responseData") or {}).get("translatedText")
+    if isinstance(t, str) and t.strip() and not t.strip().upper().startswith("'AUTO' IS AN INVALID"):
+        return t.strip()
+    return None
+
+
+def libretranslate_payload(text: str, src: str) -> Dict[str, str]:
+    return {"q": text, "source": src, "target": "pt"}
+
+
+def libretranslate_text(data: Optional[Dict]) -> Optional[str]:
+    t = (data or {}).get("translatedText") or (data or {}).get("translated_text")
+    if isinstance(t, str) and t.strip():
+        return t.strip()
+    return None
+
+
+def _remote_translate(text: str, src: str) -> Optional[str]:
+    s = get_session()
+    try:
+        r = s.get(MYMEMORY_URL, params=mymemory_params(text, src), timeout=10, verify=True)
+        r.raise_for_status()
+        out = mymemory_text(r.json())
+        if out:
+            return out
+    except Exception:
+        pass
+    # Fallback: LibreTranslate (instância pública)
+    try:
+        r = s.post(LIBRETRANSLATE_URL, json=libretranslate_payload(text, src), timeout=10, verify=True)
+        r.raise_for_status()
+        return libretranslate_text(r.json())
+    except Exception:
+        return None
+
+
+def _from_table(keys: List[Key]) -> Dict[Key, str]:
+    wanted = set(keys)
+    rows = TraducaoCache.objects.filter(
+        chave__in={k[0] for k in keys}, destino=DEST_LANG
+    ).values_list("chave", "origem", "textoTraduzido")
+    return {(chave, origem): traduzido for chave, origem, traduzido in rows if (chave, origem) in wanted}
+
+
+def prepare_batch(items: Sequence[Tuple[str, Optional[str]]]):
+    """Resolve o que for possível sem tradutor (camadas de cache, no máximo uma consulta ao banco).
+
+    Devolve ``(keys, texts, found, pending)``: chave de cada item (None para texto vazio),
+    texto por chave, traduções encontradas e chaves ainda sem tradução.
+    """
+    keys: List[Optional[Key]] = []
+    texts: Dict[Key, str] = {}
+    for text, src in items:
+        if not text:
+            keys.append(None)
+            continue
+        key = (_text_hash(text), _src_code(src))
+        keys.append(key)
+        texts.setdefault(key, text)
+
+    found: Dict[Key, str] = _CACHE.get_many(texts, loader=_from_table) if texts else {}
+    pending = [k for k in texts if k not in found]
+    return keys, texts, found, pending
+
+
+def remember_translations(texts: Dict[Key, str], translated: Dict[Key, str]) -> None:
+    """Grava traduções novas nas camadas de cache e na tabela."""
+    _CACHE.set_many(translated)
+    new_rows = []
+    for key, out in translated.items():
+        new_rows.append(TraducaoCache(
+            chave=key[0], origem=key[1], destino=DEST_LANG, textoOriginal=texts[key], textoTraduzido=out,
+        ))
+    if new_rows:
+        TraducaoCache.objects.bulk_create(new_rows, ignore_conflicts=True)
+
+
+def resolve_batch(items: Sequence[Tuple[str, Optional[str]]], keys: List[Optional[Key]], found: Dict[Key, str]) -> List[str]:
+    return [found.get(key, text) if key else text for key, (text, _src) in zip(keys, items)]
+
+
+def _translate_remote(texts: Dict[Key, str], pending: List[Key]) -> Dict[Key, str]:
+    outs = fan_out(
+        lambda k: _remote_translate(texts[k], k[1]),
+        pending,
+        fallback=lambda _k: None,
+        max_workers=getattr(settings, "TRANSLATE_CONCURRENCY", 4),
+    )
+    translated = {key: out for key, out in zip(pending, outs) if out}
+    remember_translations(texts, translated)
+    return translated
+
+
+def defer_translations(texts: Dict[Key, str], pending: List[Key], followup: Optional[Dict] = None):
+    """Enfileira um job ``traduzir`` com os textos pendentes (o mesmo conjunto vira um job só).
+
+    ``followup`` (``{"tipo", "parametros", "chave"}``) é enfileirado quando a tradução termina,
+    por exemplo para reconstruir o detalhe que foi servido sem tradução.
+    """
+    chave = "traduzir:" + _text_hash("|".join(sorted(f"{h}:{src}" for h, src in pending)))
+    parametros = {"itens": [[texts[k], k[1]] for k in pending]}
+    if followup:
+        parametros["depois"] = followup
+    return enqueue("traduzir", parametros, chave=chave, prioridade=PRIORIDADE_BAIXA)
+
+
+def translate_many(
+    items: Sequence[Tuple[str, Optional[str]]],
+    allow_remote: Optional[bool] = None,
+    followup: Optional[Dict] = None,
+) -> List[str]:
+    """Traduz vários ``(texto, idioma_origem)`` de uma vez, na mesma ordem.
+
+    Faz uma passada no LRU, uma única consulta ao banco para o que faltar e, se permitido,
+    chama o tradutor em paralelo só para o restante. Falhas devolvem o texto original (e contam
+    em ``untranslated_scope``); com a fila de jobs ligada, o restante é enfileirado (ver
+    ``defer_translations``).
+    """
+    if not _enabled():
+        return [text for text, _src in items]
+    allow = _remote_allowed(allow_remote)
+
+    keys, texts, found, pending = prepare_batch(items)
+    if pending and allow:
+        found.update(_translate_remote(texts, pending))
+    elif pending and jobs_enabled():
+        defer_translations(texts, pending, followup)
+    report_untranslated(pending, found)
+    return resolve_batch(items, keys, found)
+
+
+def translate_pending(items: Sequence[Tuple[str, Optional[str]]]) -> int:
+    """Traduz agora o que ainda não está em cache; devolve quantos textos continuam sem tradução."""
+    _keys, texts, _found, pending = prepare_batch(items)
+    if not pending:
+        return 0
+    return len(pending) - len(_translate_remote(texts, pending))
+
+
+def translate_to_pt(text: str, src_lang: Optional[str] = None, allow_remote: Optional[bool] = None) -> str:
+    """Traduz um texto para pt-BR (ver ``translate_many``). Em caso de falha, devolve o original."""
+    if not text:
+        return text
+    return translate_many([(text, src_lang)], allow_remote=allow_remote)[0]
+
+
+def translation_cache_stats() -> Dict[str, Dict[str, float]]:
+    return _CACHE.stats()
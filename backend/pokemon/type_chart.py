@@ -0,0 +1,123 @@
+"""Tabela de efetividade de tipos (18×18) carregada em memória.
+
+A tabela fica em EfetividadeTipo (preenchida por sync_pokemon_types) e é lida uma vez por
+processo para um ``array`` compacto. Multiplicadores de qualquer combinação de tipos saem de
+operações sobre linhas/colunas pré-calculadas, sem chamadas à PokéAPI.
+"""
+import threading
+from array import array
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Sequence
+
+ALL_TYPES = [
+    "normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground", "flying",
+    "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy",
+]
+_INDEX = {t: i for i, t in enumerate(ALL_TYPES)}
+_N = len(ALL_TYPES)
+_ONES = (1.0,) * _N
+
+
+class TypeChart:
+    """Matriz atacante × defensor (linha = atacante) em um array('f') de 324 posições."""
+
+    def __init__(self, cells: Sequence[float]):
+        if len(cells) != _N * _N:
+            raise ValueError("a tabela de tipos deve ter 18×18 posições")
+        self.cells = array("f", cells)
+        # linhas (como o tipo ataca) e colunas (como o tipo é atingido) prontas para combinar
+        self._rows = [tuple(self.cells[i * _N:(i + 1) * _N]) for i in range(_N)]
+        self._cols = [tuple(self.cells[i::_N]) for i in range(_N)]
+
+    def factor(self, attacker: str, defender: str) -> float:
+        return float(self.cells[_INDEX[attacker] * _N + _INDEX[defender]])
+
+    def defensive(self, types: Iterable[str]) -> Dict[str, float]:
+        """Dano recebido de cada tipo atacante: produto das colunas dos tipos do pokémon."""
+        acc = _ONES
+        for t in types or []:
+            i = _INDEX.get(t)
+            if i is not None:
+                acc = tuple(map(mul, acc, self._cols[i]))
+        return dict(zip(ALL_TYPES, acc))
+
+    def offensive(self, types: Iterable[str]) -> Dict[str, float]:
+        """Dano causado a cada tipo defensor, com a mesma regra de combinação usada antes
+        sobre damage_relations (2× prevalece sobre 1×, 0,5× reduz, imune zera)."""
+        acc = list(_ONES)
+        for t in types or []:
+            i = _INDEX.get(t)
+            if i is None:
+                continue
+            for d, f in enumerate(self._rows[i]):
+                if f == 2.0:
+                    acc[d] = max(acc[d], 2.0)
+                elif f == 0.5:
+                    acc[d] = min(acc[d], 0.5)
+                elif f == 0.0:
+                    acc[d] = 0.0
+        return dict(zip(ALL_TYPES, acc))
+
+    def multipliers(self, types: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        types = list(types or [])
+        return {"from": self.defensive(types), "to": self.offensive(types)}
+
+    def team(self, team_types: Iterable[Iterable[str]]) -> List[Dict[str, Dict[str, float]]]:
+        """Multiplicadores de uma equipe inteira de uma vez (um item por pokémon)."""
+        return [self.multipliers(types) for types in team_types]
+
+
+_CHART: Optional[TypeChart] = None
+_CHART_LOCK = threading.Lock()
+
+
+def chart_from_relations(relations: Dict[str, Dict]) -> TypeChart:
+    """Monta a tabela a partir de ``damage_relations`` de /type/{t} para cada tipo atacante."""
+    cells = [1.0] * (_N * _N)
+    for attacker, rel in relations.items():
+        a = _INDEX.get(attacker)
+        if a is None:
+            continue
+        for key, factor in (("double_damage_to", 2.0), ("half_damage_to", 0.5), ("no_damage_to", 0.0)):
+            for it in rel.get(key, []) or []:
+                d = _INDEX.get((it or {}).get("name"))
+                if d is not None:
+                    cells[a * _N + d] = factor
+    return TypeChart(cells)
+
+
+def load_type_chart() -> Optional[TypeChart]:
+    """Devolve a tabela em memória, carregando do banco na primeira chamada.
+    ``None`` quando a tabela ainda não foi sincronizada (ou está incompleta)."""
+    global _CHART
+    if _CHART is not None:
+        return _CHART
+    from .models import EfetividadeTipo
+
+    with _CHART_LOCK:
+        if _CHART is None:
+            rows = EfetividadeTipo.objects.values_list("atacante__descricao", "defensor__descricao", "multiplicador")
+            cells = [1.0] * (_N * _N)
+            seen = 0
+            for atk, dfn, mult in rows:
+                a, d = _INDEX.get(atk), _INDEX.get(dfn)
+                if a is not None and d is not None:
+                    cells[a * _N + d] = mult
+                    seen += 1
+            if seen < _N * _N:
+                return None
+            _CHART = TypeChart(cells)
+    return _CHART
+
+
+def invalidate_type_chart() -> None:
+    global _CHART
+    with _CHART_LOCK:
+        _CHART = None
+
+
+def team_type_multipliers(team_types: Iterable[Iterable[str]]) -> Optional[List[Dict[str, Dict[str, float]]]]:
+    chart = load_type_chart()
+    if chart is None:
+        return None
+    return chart.team(team_types)
@@ -1,10 +1,37 @@
-from typing import List
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 from .models import TipoPokemon, PokemonUsuario
-from .services import sync_types_from_pokeapi, list_by_generation_and_name, get_pokemon_detail, get_pokemon_full
+from .services import (
+    sync_types_from_pokeapi,
+    list_by_generation_and_name,
+    get_pokemon_detail,
+    get_pokemon_details,
+    get_pokemon_full,
+    list_by_cursor,
+    CatalogUnavailable,
+)
+from .pagination import InvalidCursor
+from .stats_index import ORDER_FIELDS, STAT_FIELDS
+from .type_chart import ALL_TYPES
+from .cache import tiered_cache_stats
+from .datasource import data_source_stats
+from .search import search_index
+from .http_cache import conditional_get, detail_validators, full_validators, list_validators
+from .http_client import client_stats
+from .jobs import enqueue, jobs_enabled, queue_stats
+from .raw_cache import raw_cache_stats
+from .resilience import upstream_stats
+from .singleflight import singleflight_stats
+from .async_services import alist_by_generation_and_name, aget_pokemon_detail, aget_pokemon_full
 from django.conf import settings
 from rest_framework import serializers
 
@@ -22,6 +49,10 @@ def sync_tipos(request):
         verify = None
         if verify_param in ("0", "1"):
             verify = verify_param == "1"
+        if jobs_enabled():
+            # com a fila ligada a sincronização roda no worker; a resposta só confirma o agendamento
+            tarefa = enqueue("sincronizar_tipos", {"verify": verify}, chave="sincronizar_tipos")
+            return Response({"idTarefa": tarefa.idTarefa, "status": tarefa.status}, status=status.HTTP_202_ACCEPTED)
         result = sync_types_from_pokeapi(verify_override=verify)
         return Response(result)
     except Exception as exc:
@@ -34,64 +65,270 @@ class PokemonListQuery(serializers.Serializer):
     limit = serializers.IntegerField(required=False, min_value=1)
     offset = serializers.IntegerField(required=False, min_value=0)
     verify = serializers.ChoiceField(required=False, choices=["0", "1"])
+    # filtros resolvidos pelo catálogo local: tipos (lista separada por vírgula), faixas de stats e ordenação
+    types = serializers.CharField(required=False, allow_blank=True)
+    types_mode = serializers.ChoiceField(required=False, choices=["any", "all"])
+    order_by = serializers.ChoiceField(required=False, choices=ORDER_FIELDS + [f"-{f}" for f in ORDER_FIELDS])
+    # paginação por cursor (catálogo local): vazio = primeira página; não combina com offset
+    cursor = serializers.CharField(required=False, allow_blank=True, max_length=512)
 
+    def get_fields(self):
+        fields = super().get_fields()
+        for stat in STAT_FIELDS:
+            fields[f"min_{stat}"] = serializers.IntegerField(required=False, min_value=0)
+            fields[f"max_{stat}"] = serializers.IntegerField(required=False, min_value=0)
+        return fields
 
-@api_view(["GET"])  # público para a listagem
-@permission_classes([AllowAny])
-def list_pokemon(request):
-    q = PokemonListQuery(data=request.query_params)
+    def validate_types(self, value):
+        types = [t.strip().lower() for t in value.split(",") if t.strip()]
+        unknown = [t for t in types if t not in ALL_TYPES]
+        if unknown:
+            raise serializers.ValidationError(f"tipos desconhecidos: {', '.join(unknown)}")
+        return types
+
+
+def _verify_from_query(params) -> Optional[bool]:
+    verify_param = params.get("verify")
+    if verify_param in ("0", "1"):
+        return verify_param == "1"
+    return None
+
+
+def _parse_list_query(params) -> Tuple[Optional[Dict], Optional[Tuple[Dict, int]]]:
+    """Valida os parâmetros da listagem (compartilhado entre a view síncrona e a assíncrona).
+    Devolve ``(args, None)`` ou ``(None, (corpo_do_erro, status))``."""
+    q = PokemonListQuery(data=params)
     if not q.is_valid():
-        return Response(q.errors, status=status.HTTP_400_BAD_REQUEST)
+        return None, (q.errors, status.HTTP_400_BAD_REQUEST)
 
     data = q.validated_data
-    generation = data.get("generation")
-    name = data.get("name")
     limit = data.get("limit", getattr(settings, 'DEFAULT_POKEMON_LIMIT', 20))
-    offset = data.get("offset", 0)
     max_limit = getattr(settings, 'MAX_POKEMON_LIMIT', 100)
     if limit > max_limit:
-        return Response({"detail": f"limit máximo é {max_limit}"}, status=status.HTTP_400_BAD_REQUEST)
+        return None, ({"detail": f"limit máximo é {max_limit}"}, status.HTTP_400_BAD_REQUEST)
+    if "cursor" in data and "offset" in data:
+        return None, ({"detail": "use cursor ou offset, não ambos"}, status.HTTP_400_BAD_REQUEST)
 
-    verify_flag = None
-    if data.get("verify") in ("0", "1"):
-        verify_flag = data["verify"] == "1"
+    ranges = {}
+    for stat in STAT_FIELDS:
+        low, high = data.get(f"min_{stat}"), data.get(f"max_{stat}")
+        if low is not None or high is not None:
+            ranges[stat] = (low, high)
+
+    return {
+        "generation": data.get("generation"),
+        "name": data.get("name"),
+        "limit": limit,
+        "offset": data.get("offset", 0),
+        "verify_override": _verify_from_query(data),
+        "cursor": data.get("cursor"),
+        "filters": {
+            "types": data.get("types") or [],
+            "types_all": data.get("types_mode") == "all",
+            "ranges": ranges,
+            "order_by": data.get("order_by", "codigo"),
+        },
+    }, None
+
+
+def _cursor_url(request, token: Optional[str]) -> Optional[str]:
+    if not token:
+        return None
+    params = request.GET.copy()
+    params["cursor"] = token
+    params.pop("offset", None)
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+
+def _cursor_page(request, args: Dict) -> Dict:
+    page = list_by_cursor(args["generation"], args["name"], args["limit"], args["cursor"], args["filters"])
+    page["next"] = _cursor_url(request, page["next"])
+    page["previous"] = _cursor_url(request, page["previous"])
+    return page
+
+
+@conditional_get("list", list_validators)
+@api_view(["GET"])  # público para a listagem
+@permission_classes([AllowAny])
+def list_pokemon(request):
+    args, error = _parse_list_query(request.query_params)
+    if error:
+        return Response(error[0], status=error[1])
 
     try:
-        total, results = list_by_generation_and_name(generation, name, limit, offset, verify_override=verify_flag)
+        if args["cursor"] is not None:
+            return Response(_cursor_page(request, args))
+        del args["cursor"]
+        total, results = list_by_generation_and_name(**args)
         return Response({"count": total, "results": results})
+    except InvalidCursor as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    except CatalogUnavailable as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
     except Exception as exc:
         return Response({"detail": f"Erro ao listar Pokémon: {exc}"}, status=status.HTTP_502_BAD_GATEWAY)
 
 
+@conditional_get("detail", detail_validators)
 @api_view(["GET"])  # público
 @permission_classes([AllowAny])
 def get_pokemon(request, codigo: int):
     try:
-        verify_param = request.query_params.get("verify")
-        verify = None
-        if verify_param in ("0", "1"):
-            verify = verify_param == "1"
-        data = get_pokemon_detail(codigo, verify_override=verify)
+        data = get_pokemon_detail(codigo, verify_override=_verify_from_query(request.query_params))
         return Response(data)
     except Exception as exc:
         return Response({"detail": f"Erro ao consultar PokéAPI: {exc}"}, status=status.HTTP_502_BAD_GATEWAY)
 
 
+@conditional_get("full", full_validators)
 @api_view(["GET"])  # público
 @permission_classes([AllowAny])
 def get_pokemon_completo(request, codigo: int):
     try:
-        verify_param = request.query_params.get("verify")
-        verify = None
-        if verify_param in ("0", "1"):
-            verify = verify_param == "1"
-        data = get_pokemon_full(codigo, verify_override=verify)
+        data = get_pokemon_full(codigo, verify_override=_verify_from_query(request.query_params))
         return Response(data)
     except Exception as exc:
         return Response({"detail": f"Erro ao consultar PokéAPI: {exc}"}, status=status.HTTP_502_BAD_GATEWAY)
 
 
+class PokemonSearchQuery(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=50)
+    generation = serializers.IntegerField(required=False, min_value=1)
+    fuzzy = serializers.ChoiceField(required=False, choices=["0", "1"])
+
+
+@api_view(["GET"])  # público: autocomplete e busca aproximada por nome
+@permission_classes([AllowAny])
+def search_pokemon(request):
+    q = PokemonSearchQuery(data=request.query_params)
+    if not q.is_valid():
+        return Response(q.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = q.validated_data
+
+    index = search_index()
+    if index is None:
+        return Response(
+            {"detail": "Catálogo local não sincronizado (rode sync_pokemon_catalog)"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    results = index.search(
+        data["q"],
+        limit=data.get("limit", 10),
+        fuzzy=data.get("fuzzy", "1") == "1",
+        generation=data.get("generation"),
+    )
+    return Response({"count": len(results), "results": results})
+
+
+@api_view(["GET"])  # métricas internas do processo (apenas staff)
+@permission_classes([IsAdminUser])
+def pokemon_stats(request):
+    return Response({
+        "http_pool": client_stats(),
+        "caches": tiered_cache_stats(),
+        "singleflight": singleflight_stats(),
+        "upstream": upstream_stats(),
+        "raw_cache": raw_cache_stats(),
+        "data_source": data_source_stats(),
+        "jobs": queue_stats(),
+    })
+
+
+# ---- Versões assíncronas (ASGI) ----
+# Views Django puras (sem DRF): mesmas respostas e formatos de erro das versões acima, mas as
+# chamadas à PokéAPI não prendem o worker. Ativadas em urls.py com POKEMON_ASYNC_VIEWS=1.
+
+def _check_throttles(request):
+    """Autenticação e throttles padrão do DRF (os mesmos das views síncronas); devolve a resposta
+    de erro (401/429) ou None se a requisição pode seguir."""
+    drf_request = Request(request, authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        drf_request.user  # autentica: o limite de usuário logado é outro
+        waits = []
+        for throttle in (cls() for cls in api_settings.DEFAULT_THROTTLE_CLASSES):
+            if not throttle.allow_request(drf_request, None):
+                waits.append(throttle.wait())
+        if waits:
+            raise exceptions.Throttled(max((w for w in waits if w is not None), default=None))
+    except exceptions.APIException as exc:
+        response = JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+        if getattr(exc, "wait", None) is not None:
+            response["Retry-After"] = str(int(exc.wait))
+        return response
+    return None
+
+
+def async_throttled(view):
+    """Aplica às views assíncronas o throttle que o ``@api_view`` aplica às síncronas."""
+    @wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        denied = await sync_to_async(_check_throttles)(request)
+        if denied is not None:
+            return denied
+        return await view(request, *args, **kwargs)
+    return wrapped
+
+
+@conditional_get("list", list_validators)
+@async_throttled
+@require_GET
+async def list_pokemon_async(request):
+    args, error = _parse_list_query(request.GET)
+    if error:
+        return JsonResponse(error[0], status=error[1])
+
+    try:
+        if args["cursor"] is not None:
+            # só o índice do catálogo (consulta de versão no banco): sem chamadas à PokéAPI
+            return JsonResponse(await sync_to_async(_cursor_page)(request, args))
+        del args["cursor"]
+        total, results = await alist_by_generation_and_name(**args)
+        return JsonResponse({"count": total, "results": results})
+    except InvalidCursor as exc:
+        return JsonResponse({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    except CatalogUnavailable as exc:
+        return JsonResponse({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    except Exception as exc:
+        return JsonResponse({"detail": f"Erro ao listar Pokémon: {exc}"}, status=status.HTTP_502_BAD_GATEWAY)
+
+
+@conditional_get("detail", detail_validators)
+@async_throttled
+@require_GET
+async def get_pokemon_async(request, codigo: int):
+    try:
+        data = await aget_pokemon_detail(codigo, verify_override=_verify_from_query(request.GET))
+        return JsonResponse(data)
+    except Exception as exc:
+        return JsonResponse({"detail": f"Erro ao consultar PokéAPI: {exc}"}, status=status.HTTP_502_BAD_GATEWAY)
+
+
+@conditional_get("full", full_validators)
+@async_throttled
+@require_GET
+async def get_pokemon_completo_async(request, codigo: int):
+    try:
+        data = await aget_pokemon_full(codigo, verify_override=_verify_from_query(request.GET))
+        return JsonResponse(data)
+    except Exception as exc:
+        return JsonResponse({"detail": f"Erro ao consultar PokéAPI: {exc}"}, status=status.HTTP_502_BAD_GATEWAY)
+
+
 # ---- Favoritos ----
+def _hydrate(qs: List[PokemonUsuario]) -> dict:
+    """Detalhes de todos os registros em lote (nº constante de consultas ao banco)."""
+    try:
+        details = get_pokemon_details([pu.codigo for pu in qs])
+    except Exception:
+        details = {}
+    results: List[dict] = []
+    for pu in qs:
+        det = details.get(pu.codigo) or {"codigo": pu.codigo, "nome": pu.nome, "tipos": [], "imagemUrl": pu.imagemUrl}
+        results.append(det)
+    return {"count": len(results), "results": results}
+
+
 class CodigoBody(serializers.Serializer):
     codigo = serializers.IntegerField(min_value=1)
 
@@ -101,15 +338,8 @@ class CodigoBody(serializers.Serializer):
 def favorites_view(request):
     user = request.user
     if request.method == "GET":
-        qs = PokemonUsuario.objects.filter(usuario=user, favorito=True)
-        results: List[dict] = []
-        for pu in qs:
-            try:
-                det = get_pokemon_detail(pu.codigo)
-            except Exception:
-                det = {"codigo": pu.codigo, "nome": pu.nome, "tipos": [], "imagemUrl": pu.imagemUrl}
-            results.append(det)
-        return Response({"count": len(results), "results": results})
+        qs = list(PokemonUsuario.objects.filter(usuario=user, favorito=True))
+        return Response(_hydrate(qs))
 
     # POST
     ser = CodigoBody(data=request.data)
@@ -165,15 +395,8 @@ MAX_TEAM = 6
 def team_view(request):
     user = request.user
     if request.method == "GET":
-        qs = PokemonUsuario.objects.filter(usuario=user, grupoBatalha=True)
-        results: List[dict] = []
-        for pu in qs:
-            try:
-                det = get_pokemon_detail(pu.codigo)
-            except Exception:
-                det = {"codigo": pu.codigo, "nome": pu.nome, "tipos": [], "imagemUrl": pu.imagemUrl}
-            results.append(det)
-        return Response({"count": len(results), "results": results})
+        qs = list(PokemonUsuario.objects.filter(usuario=user, grupoBatalha=True))
+        return Response(_hydrate(qs))
 
     # POST add
     ser = CodigoBody(data=request.data)